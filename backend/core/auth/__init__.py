@@ -0,0 +1,13 @@
+"""Auth package exports."""
+
+from .tokens import MemoryTokenStore, SQLiteTokenStore, TokenStore, create_token_store
+from .user_cache import AuthUser, UserCache
+
+__all__ = [
+    "AuthUser",
+    "UserCache",
+    "MemoryTokenStore",
+    "SQLiteTokenStore",
+    "TokenStore",
+    "create_token_store",
+]
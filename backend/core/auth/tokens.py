@@ -0,0 +1,204 @@
+"""
+API token stores: token -> user_id with expiry, LRU eviction and a user -> tokens index.
+
+Two backends share one interface:
+- MemoryTokenStore: process-local, for a single worker / development.
+- SQLiteTokenStore: a SQLite file every worker process opens, so a token issued
+  by one worker is accepted (and revoked) by all of them.
+"""
+
+import os
+import secrets
+import sqlite3
+import threading
+import time
+from abc import ABC, abstractmethod
+from collections import OrderedDict
+from contextlib import contextmanager
+from typing import Dict, Iterator, Optional, Set, Tuple
+
+
+DEFAULT_TTL = 7 * 24 * 3600
+DEFAULT_MAX_TOKENS = 100_000
+
+
+class TokenStore(ABC):
+    """Interface shared by every backend."""
+
+    def __init__(self, ttl: float = DEFAULT_TTL, max_tokens: int = DEFAULT_MAX_TOKENS):
+        self.ttl = ttl
+        self.max_tokens = max_tokens
+
+    @staticmethod
+    def new_token() -> str:
+        return secrets.token_hex(16)
+
+    @abstractmethod
+    def issue(self, user_id: int) -> str:
+        ...
+
+    @abstractmethod
+    def get(self, token: str) -> Optional[int]:
+        """Return the user id for a live token, or None if unknown/expired."""
+
+    @abstractmethod
+    def revoke(self, token: str) -> None:
+        ...
+
+    @abstractmethod
+    def revoke_user(self, user_id: int) -> int:
+        """Revoke every token of a user; returns how many were removed."""
+
+    def __contains__(self, token: str) -> bool:
+        return self.get(token) is not None
+
+
+class MemoryTokenStore(TokenStore):
+    def __init__(self, ttl: float = DEFAULT_TTL, max_tokens: int = DEFAULT_MAX_TOKENS):
+        super().__init__(ttl, max_tokens)
+        self._lock = threading.Lock()
+        self._tokens: "OrderedDict[str, Tuple[int, float]]" = OrderedDict()
+        self._by_user: Dict[int, Set[str]] = {}
+
+    def issue(self, user_id: int) -> str:
+        token = self.new_token()
+        with self._lock:
+            self._tokens[token] = (user_id, time.time() + self.ttl)
+            self._by_user.setdefault(user_id, set()).add(token)
+            while len(self._tokens) > self.max_tokens:
+                self._drop(next(iter(self._tokens)))
+        return token
+
+    def get(self, token: str) -> Optional[int]:
+        with self._lock:
+            entry = self._tokens.get(token)
+            if entry is None:
+                return None
+            user_id, expires_at = entry
+            if expires_at <= time.time():
+                self._drop(token)
+                return None
+            self._tokens.move_to_end(token)
+            return user_id
+
+    def revoke(self, token: str) -> None:
+        with self._lock:
+            self._drop(token)
+
+    def revoke_user(self, user_id: int) -> int:
+        with self._lock:
+            tokens = self._by_user.pop(user_id, set())
+            for token in tokens:
+                self._tokens.pop(token, None)
+            return len(tokens)
+
+    def _drop(self, token: str) -> None:
+        entry = self._tokens.pop(token, None)
+        if entry is None:
+            return
+        user_tokens = self._by_user.get(entry[0])
+        if user_tokens is not None:
+            user_tokens.discard(token)
+            if not user_tokens:
+                del self._by_user[entry[0]]
+
+
+class SQLiteTokenStore(TokenStore):
+    # last_used is only rewritten when it is this stale, so reads stay read-only
+    TOUCH_INTERVAL = 60.0
+
+    def __init__(self, path, ttl: float = DEFAULT_TTL, max_tokens: int = DEFAULT_MAX_TOKENS):
+        super().__init__(ttl, max_tokens)
+        self.path = str(path)
+        with self._connect() as conn:
+            # WAL is a property of the database file: set it once, not per connection
+            conn.execute("PRAGMA journal_mode=WAL")
+            conn.executescript(
+                """
+                CREATE TABLE IF NOT EXISTS api_tokens (
+                    token      TEXT PRIMARY KEY,
+                    user_id    INTEGER NOT NULL,
+                    expires_at REAL NOT NULL,
+                    last_used  REAL NOT NULL
+                );
+                CREATE INDEX IF NOT EXISTS ix_api_tokens_user ON api_tokens (user_id);
+                CREATE INDEX IF NOT EXISTS ix_api_tokens_last_used ON api_tokens (last_used);
+                """
+            )
+
+    @contextmanager
+    def _connect(self) -> Iterator[sqlite3.Connection]:
+        """
+        A connection for one call: committed (or rolled back) and closed on exit, so
+        request threads do not each keep a file handle open for the server's lifetime.
+        """
+        conn = sqlite3.connect(self.path, timeout=10)
+        try:
+            conn.execute("PRAGMA synchronous=NORMAL")  # per connection, no file I/O
+            with conn:
+                yield conn
+        finally:
+            conn.close()
+
+    def issue(self, user_id: int) -> str:
+        token = self.new_token()
+        now = time.time()
+        with self._connect() as conn:
+            conn.execute("DELETE FROM api_tokens WHERE expires_at <= ?", (now,))
+            conn.execute(
+                "INSERT INTO api_tokens (token, user_id, expires_at, last_used) VALUES (?, ?, ?, ?)",
+                (token, user_id, now + self.ttl, now),
+            )
+            (count,) = conn.execute("SELECT COUNT(*) FROM api_tokens").fetchone()
+            if count > self.max_tokens:
+                conn.execute(
+                    "DELETE FROM api_tokens WHERE token IN "
+                    "(SELECT token FROM api_tokens ORDER BY last_used LIMIT ?)",
+                    (count - self.max_tokens,),
+                )
+        return token
+
+    def get(self, token: str) -> Optional[int]:
+        if not token:
+            return None
+        with self._connect() as conn:
+            row = conn.execute(
+                "SELECT user_id, expires_at, last_used FROM api_tokens WHERE token = ?", (token,)
+            ).fetchone()
+            if row is None:
+                return None
+            user_id, expires_at, last_used = row
+            now = time.time()
+            if expires_at <= now:
+                conn.execute("DELETE FROM api_tokens WHERE token = ?", (token,))
+                return None
+            if now - last_used > self.TOUCH_INTERVAL:
+                conn.execute("UPDATE api_tokens SET last_used = ? WHERE token = ?", (now, token))
+        return user_id
+
+    def revoke(self, token: str) -> None:
+        with self._connect() as conn:
+            conn.execute("DELETE FROM api_tokens WHERE token = ?", (token,))
+
+    def revoke_user(self, user_id: int) -> int:
+        with self._connect() as conn:
+            return conn.execute("DELETE FROM api_tokens WHERE user_id = ?", (user_id,)).rowcount
+
+
+def create_token_store(default_path) -> TokenStore:
+    """
+    Build the store selected by environment:
+      SOCCER_SEEKER_TOKEN_BACKEND = memory (default) | sqlite
+      SOCCER_SEEKER_TOKEN_DB      = path of the shared SQLite file
+      SOCCER_SEEKER_TOKEN_TTL     = seconds a token stays valid
+      SOCCER_SEEKER_TOKEN_MAX     = maximum live tokens before LRU eviction
+    """
+    ttl = float(os.environ.get("SOCCER_SEEKER_TOKEN_TTL", DEFAULT_TTL))
+    max_tokens = int(os.environ.get("SOCCER_SEEKER_TOKEN_MAX", DEFAULT_MAX_TOKENS))
+    backend = os.environ.get("SOCCER_SEEKER_TOKEN_BACKEND", "memory").lower()
+    if backend == "sqlite":
+        path = os.environ.get("SOCCER_SEEKER_TOKEN_DB", str(default_path))
+        return SQLiteTokenStore(path, ttl=ttl, max_tokens=max_tokens)
+    if backend != "memory":
+        raise ValueError(f"unknown token backend: {backend}")
+    return MemoryTokenStore(ttl=ttl, max_tokens=max_tokens)
@@ -0,0 +1,50 @@
+"""Per-process cache of the authenticated user's identity (id, role, name)."""
+
+import threading
+import time
+from collections import OrderedDict, namedtuple
+from typing import Callable, Optional
+
+
+AuthUser = namedtuple("AuthUser", ["id", "role", "name"])
+
+
+class UserCache:
+    """
+    user_id -> AuthUser with a short TTL. Writers that change a user's role/name or
+    delete the account call invalidate(); other worker processes converge within ttl.
+    """
+
+    def __init__(self, ttl: float = 30.0, max_entries: int = 10_000):
+        self.ttl = ttl
+        self.max_entries = max_entries
+        self._lock = threading.Lock()
+        self._entries: "OrderedDict[int, tuple]" = OrderedDict()
+
+    def get(self, user_id: int, loader: Callable) -> Optional[AuthUser]:
+        """Return the cached identity, or load the User via loader(user_id) on a miss."""
+        now = time.monotonic()
+        with self._lock:
+            entry = self._entries.get(user_id)
+            if entry is not None and entry[1] > now:
+                self._entries.move_to_end(user_id)
+                return entry[0]
+        user = loader(user_id)
+        if user is None:
+            self.invalidate(user_id)
+            return None
+        ident = AuthUser(user.id, user.role, user.name)
+        with self._lock:
+            self._entries[user_id] = (ident, now + self.ttl)
+            self._entries.move_to_end(user_id)
+            while len(self._entries) > self.max_entries:
+                self._entries.popitem(last=False)
+        return ident
+
+    def invalidate(self, user_id: int) -> None:
+        with self._lock:
+            self._entries.pop(user_id, None)
+
+    def clear(self) -> None:
+        with self._lock:
+            self._entries.clear()
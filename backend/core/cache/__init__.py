@@ -0,0 +1,20 @@
+"""Cache package exports."""
+
+from .fuzzy import FuzzyIndex, NameIndexStore, fold_name
+from .render_cache import RenderCache
+from .standings import SORT_TYPES as STANDINGS_SORT_TYPES
+from .standings import StandingsSnapshot, StandingsStore
+from .team_series import TEAM_SERIES, TeamSeries, TeamSeriesStore
+
+__all__ = [
+    "FuzzyIndex",
+    "NameIndexStore",
+    "fold_name",
+    "RenderCache",
+    "STANDINGS_SORT_TYPES",
+    "StandingsSnapshot",
+    "StandingsStore",
+    "TEAM_SERIES",
+    "TeamSeries",
+    "TeamSeriesStore",
+]
@@ -0,0 +1,223 @@
+"""
+In-memory fuzzy name matcher for players and teams.
+
+Names are accent-folded ("Ødegaard" -> "odegaard") and split into tokens. Each
+query token is matched against the token vocabulary as exact, prefix, alias
+("utd" -> "united") or, failing those, by bounded edit distance over trigram
+candidates. A name matches when every query token does; cheaper matches rank first.
+"""
+
+import heapq
+import threading
+from bisect import bisect_left
+from collections import Counter
+from typing import Dict, Iterable, List, Optional, Tuple
+
+from ..db.models import Player, Team
+from ..db.version import current_data_version
+from ..text import fold_name
+
+
+# common football shorthand -> full token(s)
+ALIASES = {
+    "utd": ("united",),
+    "spurs": ("tottenham",),
+    "wolves": ("wolverhampton",),
+    "boro": ("middlesbrough",),
+    "weds": ("wednesday",),
+}
+
+# per-token match costs; edit distance d costs EDIT_COST * d
+EXACT_COST, ALIAS_COST, PREFIX_COST, EDIT_COST = 0.0, 0.25, 0.5, 1.0
+PREFIX_LIMIT = 256  # vocabulary tokens considered per prefix
+TYPO_CANDIDATES = 48  # best trigram-overlap tokens verified by edit distance
+
+
+def _max_edits(token: str) -> int:
+    n = len(token)
+    return 0 if n <= 3 else 1 if n <= 6 else 2
+
+
+def _trigrams(token: str) -> set:
+    padded = f"${token}$"
+    return {padded[i:i + 3] for i in range(len(padded) - 2)}
+
+
+def bounded_edit_distance(a: str, b: str, limit: int) -> Optional[int]:
+    """
+    Edit distance (adjacent transpositions count as one edit) if it is <= limit,
+    else None. Only a band of width 2*limit+1 is computed and rows exit early.
+    """
+    if abs(len(a) - len(b)) > limit:
+        return None
+    if len(a) > len(b):
+        a, b = b, a
+    far = limit + 1
+    before: Optional[list] = None
+    prev = list(range(len(b) + 1))
+    for i in range(1, len(a) + 1):
+        cur = [i] + [far] * len(b)
+        lo, hi = max(1, i - limit), min(len(b), i + limit)
+        for j in range(lo, hi + 1):
+            cost = 0 if a[i - 1] == b[j - 1] else 1
+            d = min(prev[j] + 1, cur[j - 1] + 1, prev[j - 1] + cost)
+            if before is not None and j > 1 and a[i - 1] == b[j - 2] and a[i - 2] == b[j - 1]:
+                d = min(d, before[j - 2] + 1)
+            cur[j] = d
+        if min(cur[lo - 1:hi + 1]) > limit:
+            return None
+        before, prev = prev, cur
+    return prev[-1] if prev[-1] <= limit else None
+
+
+class FuzzyIndex:
+    """Immutable index over (id, display name) pairs."""
+
+    def __init__(self, entries: Iterable[Tuple[int, str]]):
+        self.ids: List[int] = []
+        self.names: List[str] = []
+        self.folded: List[str] = []
+        vocab: Dict[str, int] = {}
+        postings: List[List[int]] = []
+        for entry_id, name in entries:
+            folded = fold_name(name)
+            if not folded:
+                continue
+            idx = len(self.ids)
+            self.ids.append(entry_id)
+            self.names.append(name)
+            self.folded.append(folded)
+            tokens = folded.split()
+            # "van dijk" also answers "vandijk"; "weds" also answers "wednesday"
+            tokens += [a + b for a, b in zip(tokens, tokens[1:])]
+            tokens += [full for tok in tokens for full in ALIASES.get(tok, ())]
+            for tok in set(tokens):
+                tid = vocab.setdefault(tok, len(vocab))
+                if tid == len(postings):
+                    postings.append([])
+                postings[tid].append(idx)
+        self._vocab = vocab
+        self._vocab_list = sorted(vocab, key=vocab.get)  # tid -> token
+        self._tokens = sorted(vocab)
+        self._postings = [tuple(p) for p in postings]
+        # (trigram, token length) -> token ids; the length key lets the typo path
+        # skip tokens that cannot be within the edit bound
+        grams: Dict[Tuple[str, int], List[int]] = {}
+        for tok, tid in vocab.items():
+            for gram in _trigrams(tok):
+                grams.setdefault((gram, len(tok)), []).append(tid)
+        self._grams = {key: tuple(tids) for key, tids in grams.items()}
+
+    def __len__(self) -> int:
+        return len(self.ids)
+
+    def _token_matches(self, qtok: str, typos: bool = False) -> Dict[int, float]:
+        """
+        Vocabulary token id -> cost for one query token. Typo candidates are only
+        looked up when no whole token matched, or when `typos` forces it.
+        """
+        found: Dict[int, float] = {}
+        tid = self._vocab.get(qtok)
+        if tid is not None:
+            found[tid] = EXACT_COST
+        for alias in ALIASES.get(qtok, ()):
+            tid = self._vocab.get(alias)
+            if tid is not None:
+                found.setdefault(tid, ALIAS_COST)
+        whole = bool(found)
+        if len(qtok) >= 2:
+            i = bisect_left(self._tokens, qtok)
+            for tok in self._tokens[i:i + PREFIX_LIMIT]:
+                if not tok.startswith(qtok):
+                    break
+                found.setdefault(self._vocab[tok], PREFIX_COST)
+        limit = _max_edits(qtok)
+        if (whole and not typos) or not limit:
+            return found
+        # typo path: trigram overlap narrows the vocabulary, edit distance decides
+        qgrams = _trigrams(qtok)
+        need = max(1, len(qgrams) - 3 * limit)
+        size = len(qtok)
+        counts = Counter()
+        for gram in qgrams:
+            for length in range(size - limit, size + limit + 1):
+                counts.update(self._grams.get((gram, length), ()))
+        candidates = [(shared, tid) for tid, shared in counts.items() if shared >= need]
+        for _, tid in heapq.nlargest(TYPO_CANDIDATES, candidates):
+            if tid in found:
+                continue
+            dist = bounded_edit_distance(qtok, self._vocab_list[tid], limit)
+            if dist is not None:
+                found[tid] = EDIT_COST * dist
+        return found
+
+    def search(self, query: str, limit: int = 10) -> List[Tuple[int, float]]:
+        """[(id, cost)] for names matching every query token, best first."""
+        qtokens = fold_name(query).split()
+        if not qtokens:
+            return []
+        # "Bruno Fernandez": "fernandez" matches someone else exactly, so only a
+        # second pass that also tries typos for every token finds "Fernandes"
+        ranked = self._rank(qtokens, typos=False)
+        if not ranked and len(qtokens) > 1:
+            ranked = self._rank(qtokens, typos=True)
+        return [(self.ids[idx], cost) for idx, cost in ranked[:limit]]
+
+    def _rank(self, qtokens: List[str], typos: bool) -> List[Tuple[int, float]]:
+        scores: Optional[Dict[int, float]] = None
+        for qtok in qtokens:
+            best: Dict[int, float] = {}
+            for tid, cost in self._token_matches(qtok, typos).items():
+                for idx in self._postings[tid]:
+                    if cost < best.get(idx, 2.0 ** 31):
+                        best[idx] = cost
+            if scores is None:
+                scores = best
+            else:
+                scores = {idx: s + best[idx] for idx, s in scores.items() if idx in best}
+            if not scores:
+                return []
+        folded_query = " ".join(qtokens)
+        return sorted(
+            scores.items(),
+            key=lambda kv: (kv[1], self.folded[kv[0]] != folded_query, len(self.folded[kv[0]]), self.folded[kv[0]]),
+        )
+
+
+class NameIndexStore:
+    """
+    Player and team FuzzyIndex, rebuilt when the data version moves. Like
+    StandingsStore, a rebuild swaps in fresh indexes with one assignment.
+    """
+
+    def __init__(self, session_factory):
+        self._session_factory = session_factory
+        self._lock = threading.Lock()
+        self._state: Optional[Tuple[int, FuzzyIndex, FuzzyIndex]] = None
+
+    def _current(self) -> Tuple[int, FuzzyIndex, FuzzyIndex]:
+        version = current_data_version()
+        state = self._state
+        if state is not None and state[0] == version:
+            return state
+        with self._lock:
+            state = self._state
+            if state is None or state[0] != version:
+                session = self._session_factory()
+                try:
+                    players = FuzzyIndex(
+                        (pid, f"{first} {last}")
+                        for pid, first, last in session.query(Player.id, Player.first_name, Player.last_name)
+                    )
+                    teams = FuzzyIndex(session.query(Team.id, Team.name))
+                finally:
+                    session.close()
+                state = (version, players, teams)
+                self._state = state
+        return state
+
+    def players(self) -> FuzzyIndex:
+        return self._current()[1]
+
+    def teams(self) -> FuzzyIndex:
+        return self._current()[2]
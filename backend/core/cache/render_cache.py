@@ -0,0 +1,112 @@
+"""Two-tier cache for rendered chart images: in-memory LRU + size-bounded disk."""
+
+import hashlib
+import json
+import os
+import threading
+from collections import OrderedDict
+from pathlib import Path
+from typing import Optional
+
+
+class RenderCache:
+    """
+    Content-addressed render cache.
+
+    Keys are derived from (tag, data version, chart params); the tag (e.g. "team12")
+    prefixes every key so all renders of one entity can be invalidated together.
+    """
+
+    def __init__(self, cache_dir, max_items: int = 64, max_disk_bytes: int = 64 * 1024 * 1024):
+        self.cache_dir = Path(cache_dir)
+        self.cache_dir.mkdir(parents=True, exist_ok=True)
+        self.max_items = max_items
+        self.max_disk_bytes = max_disk_bytes
+        self._memory: "OrderedDict[str, bytes]" = OrderedDict()
+        self._lock = threading.Lock()
+        self._disk_bytes = sum(p.stat().st_size for p in self.cache_dir.glob("*.bin"))
+
+    @staticmethod
+    def make_key(tag: str, version: int, params: dict) -> str:
+        raw = json.dumps({"v": version, "params": params}, sort_keys=True, default=str)
+        digest = hashlib.sha256(raw.encode("utf-8")).hexdigest()[:32]
+        return f"{tag}-{digest}"
+
+    def _path(self, key: str) -> Path:
+        return self.cache_dir / f"{key}.bin"
+
+    def get(self, key: str) -> Optional[bytes]:
+        with self._lock:
+            data = self._memory.get(key)
+            if data is not None:
+                self._memory.move_to_end(key)
+                return data
+        path = self._path(key)
+        try:
+            data = path.read_bytes()
+            os.utime(path)  # mtime doubles as the disk tier's LRU clock
+        except OSError:
+            return None
+        with self._lock:
+            self._remember(key, data)
+        return data
+
+    def put(self, key: str, data: bytes) -> None:
+        with self._lock:
+            self._remember(key, data)
+        path = self._path(key)
+        tmp = path.with_suffix(f".{threading.get_ident()}.tmp")
+        try:
+            old_size = path.stat().st_size if path.exists() else 0
+            tmp.write_bytes(data)
+            os.replace(tmp, path)
+        except OSError:
+            tmp.unlink(missing_ok=True)
+            return
+        with self._lock:
+            self._disk_bytes += len(data) - old_size
+            if self._disk_bytes > self.max_disk_bytes:
+                self._trim_disk()
+
+    def invalidate(self, tag: str) -> None:
+        """Drop every cached render whose key carries this tag."""
+        prefix = f"{tag}-"
+        with self._lock:
+            for key in [k for k in self._memory if k.startswith(prefix)]:
+                del self._memory[key]
+            for path in self.cache_dir.glob(f"{prefix}*.bin"):
+                self._unlink(path)
+
+    def clear(self) -> None:
+        with self._lock:
+            self._memory.clear()
+            for path in self.cache_dir.glob("*.bin"):
+                self._unlink(path)
+
+    def _remember(self, key: str, data: bytes) -> None:
+        self._memory[key] = data
+        self._memory.move_to_end(key)
+        while len(self._memory) > self.max_items:
+            self._memory.popitem(last=False)
+
+    def _trim_disk(self) -> None:
+        """Evict least recently used files until the disk tier fits its budget."""
+        files = []
+        for path in self.cache_dir.glob("*.bin"):
+            try:
+                files.append((path.stat().st_mtime, path))
+            except OSError:
+                continue
+        files.sort()
+        for _, path in files:
+            if self._disk_bytes <= self.max_disk_bytes:
+                break
+            self._unlink(path)
+
+    def _unlink(self, path: Path) -> None:
+        try:
+            size = path.stat().st_size
+            path.unlink()
+        except OSError:
+            return
+        self._disk_bytes -= size
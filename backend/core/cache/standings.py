@@ -0,0 +1,120 @@
+"""Process-wide standings snapshot: column arrays + precomputed sort permutations."""
+
+import threading
+from array import array
+from typing import Dict, List, Optional
+
+from ..db.models import Season, Team, TeamSeasonStats
+from ..db.version import current_data_version
+
+
+STAT_COLUMNS = ("position", "played", "won", "drawn", "lost", "gf", "ga", "gd", "points")
+SORT_TYPES = ("points", "goals_for", "goals_against", "goal_diff")
+
+# Same tie-breakers as the ORDER BY clauses the endpoints used to issue;
+# "name" is the home page's fallback for unknown sort types.
+SORT_KEYS = {
+    "points": lambda t, i: (-t.points[i], -t.gd[i], -t.gf[i], t.team_names[i]),
+    "goals_for": lambda t, i: (-t.gf[i], -t.points[i], t.team_names[i]),
+    "goals_against": lambda t, i: (t.ga[i], -t.points[i], t.team_names[i]),
+    "goal_diff": lambda t, i: (-t.gd[i], -t.points[i], t.team_names[i]),
+    "name": lambda t, i: t.team_names[i],
+}
+
+
+class SeasonTable:
+    """One season's table stored column-wise; `orders` maps sort type -> row permutation."""
+
+    __slots__ = ("end_year", "name", "team_ids", "team_names", "orders") + STAT_COLUMNS
+
+    def __init__(self, end_year: int, name: str):
+        self.end_year = end_year
+        self.name = name
+        self.team_ids = array("i")
+        self.team_names: List[str] = []
+        for col in STAT_COLUMNS:
+            setattr(self, col, array("i"))
+        self.orders: Dict[str, array] = {}
+
+    def append(self, team_id: int, team_name: str, stats) -> None:
+        self.team_ids.append(team_id)
+        self.team_names.append(team_name)
+        for col, value in zip(STAT_COLUMNS, stats):
+            getattr(self, col).append(value)
+
+    def finalize(self) -> None:
+        idx = range(len(self.team_ids))
+        for sort_type, key in SORT_KEYS.items():
+            self.orders[sort_type] = array("i", sorted(idx, key=lambda i: key(self, i)))
+
+    def row(self, i: int) -> dict:
+        row = {"team_id": self.team_ids[i], "team": self.team_names[i]}
+        for col in STAT_COLUMNS:
+            row[col] = getattr(self, col)[i]
+        return row
+
+    def rows(self, sort_type: str = "points") -> List[dict]:
+        return [self.row(i) for i in self.orders[sort_type]]
+
+
+class StandingsSnapshot:
+    """Immutable view of every season, tagged with the data version it was built from."""
+
+    def __init__(self, version: int, tables: Dict[int, SeasonTable]):
+        self.version = version
+        self.tables = tables
+        self.season_years = sorted(tables)
+
+    def season(self, end_year: int) -> Optional[SeasonTable]:
+        return self.tables.get(end_year)
+
+
+def load_standings_snapshot(session, version: int) -> StandingsSnapshot:
+    tables: Dict[int, SeasonTable] = {}
+    for end_year, name in session.query(Season.end_year, Season.name).all():
+        tables[end_year] = SeasonTable(end_year, name)
+    rows = (
+        session.query(
+            Season.end_year,
+            Team.id,
+            Team.name,
+            *(getattr(TeamSeasonStats, col) for col in STAT_COLUMNS),
+        )
+        .join(TeamSeasonStats, TeamSeasonStats.season_id == Season.id)
+        .join(Team, Team.id == TeamSeasonStats.team_id)
+        .all()
+    )
+    for end_year, team_id, team_name, *stats in rows:
+        tables[end_year].append(team_id, team_name, stats)
+    for table in tables.values():
+        table.finalize()
+    return StandingsSnapshot(version, tables)
+
+
+class StandingsStore:
+    """
+    Holds the current snapshot and rebuilds it when the data version moves.
+    Readers take one reference and never see a half-built snapshot: the new one
+    replaces the old with a single attribute assignment.
+    """
+
+    def __init__(self, session_factory):
+        self._session_factory = session_factory
+        self._snapshot: Optional[StandingsSnapshot] = None
+        self._lock = threading.Lock()
+
+    def snapshot(self) -> StandingsSnapshot:
+        version = current_data_version()
+        snap = self._snapshot
+        if snap is not None and snap.version == version:
+            return snap
+        with self._lock:
+            snap = self._snapshot
+            if snap is None or snap.version != version:
+                session = self._session_factory()
+                try:
+                    snap = load_standings_snapshot(session, version)
+                finally:
+                    session.close()
+                self._snapshot = snap
+        return snap
@@ -0,0 +1,140 @@
+"""Team-major time-series store: each team's season history as packed arrays."""
+
+import threading
+from array import array
+from typing import Dict, List, Optional
+
+from ..db.base import SessionLocal
+from ..db.models import Season, Team, TeamSeasonStats
+from ..db.version import current_data_version
+from .standings import STAT_COLUMNS
+
+
+class TeamSeries:
+    """One team's history ordered by season end year; column i is season i."""
+
+    __slots__ = ("team_id", "team_name", "season_years", "season_names", "notes") + STAT_COLUMNS
+
+    def __init__(self, team_id: int, team_name: str):
+        self.team_id = team_id
+        self.team_name = team_name
+        self.season_years = array("i")
+        self.season_names: List[str] = []
+        self.notes: List[Optional[str]] = []
+        for col in STAT_COLUMNS:
+            setattr(self, col, array("i"))
+
+    def __len__(self) -> int:
+        return len(self.season_years)
+
+    def append(self, end_year: int, season_name: str, stats, notes=None) -> None:
+        self.season_years.append(end_year)
+        self.season_names.append(season_name)
+        self.notes.append(notes)
+        for col, value in zip(STAT_COLUMNS, stats):
+            getattr(self, col).append(value)
+
+
+def _query_rows(session, team_id=None):
+    q = (
+        session.query(
+            TeamSeasonStats.team_id,
+            Season.end_year,
+            Season.name,
+            TeamSeasonStats.notes,
+            *(getattr(TeamSeasonStats, col) for col in STAT_COLUMNS),
+        )
+        .join(Season, TeamSeasonStats.season_id == Season.id)
+    )
+    if team_id is not None:
+        q = q.filter(TeamSeasonStats.team_id == team_id)
+    return q.order_by(TeamSeasonStats.team_id, Season.end_year).all()
+
+
+class TeamSeriesStore:
+    """
+    Built once, then kept current: admin writes refresh just the touched team via
+    apply_change(); any other version move (another process, an import script)
+    falls back to a full rebuild on the next read.
+    """
+
+    def __init__(self, session_factory):
+        self._session_factory = session_factory
+        self._lock = threading.Lock()
+        self._version: Optional[int] = None
+        self._by_id: Dict[int, TeamSeries] = {}
+        self._by_name: Dict[str, int] = {}
+
+    def load(self) -> None:
+        with self._lock:
+            self._load(current_data_version())
+
+    def _load(self, version: int) -> None:
+        # caller holds self._lock, so concurrent readers wait for one rebuild
+        session = self._session_factory()
+        try:
+            by_id = {tid: TeamSeries(tid, name) for tid, name in session.query(Team.id, Team.name).all()}
+            for team_id, end_year, season_name, notes, *stats in _query_rows(session):
+                by_id[team_id].append(end_year, season_name, stats, notes)
+        finally:
+            session.close()
+        self._by_id = by_id
+        self._by_name = {s.team_name: tid for tid, s in by_id.items()}
+        self._version = version
+
+    def _ensure_current(self) -> None:
+        version = current_data_version()
+        if self._version == version:
+            return
+        with self._lock:
+            # another thread may have rebuilt (or applied a change) while we waited
+            if self._version is None or self._version < version:
+                self._load(version)
+
+    def get(self, team_id: int) -> Optional[TeamSeries]:
+        self._ensure_current()
+        return self._by_id.get(team_id)
+
+    def get_by_name(self, team_name: str) -> Optional[TeamSeries]:
+        self._ensure_current()
+        team_id = self._by_name.get(team_name)
+        return self._by_id.get(team_id) if team_id is not None else None
+
+    def apply_change(self, version: int, team_id: Optional[int] = None) -> None:
+        """
+        Fold one committed write into the store. `version` is the value returned by
+        bump_data_version(); if the store has missed an earlier bump it stays stale
+        and the next read rebuilds it in full.
+        """
+        with self._lock:
+            if self._version is None or self._version != version - 1:
+                return
+            if team_id is None:
+                self._version = version
+                return
+        session = self._session_factory()
+        try:
+            team = session.query(Team.id, Team.name).filter(Team.id == team_id).first()
+            series = None
+            if team:
+                series = TeamSeries(team.id, team.name)
+                for _, end_year, season_name, notes, *stats in _query_rows(session, team_id):
+                    series.append(end_year, season_name, stats, notes)
+        finally:
+            session.close()
+        with self._lock:
+            if self._version != version - 1:
+                return
+            by_id = dict(self._by_id)
+            by_name = dict(self._by_name)
+            old = by_id.pop(team_id, None)
+            if old is not None:
+                by_name.pop(old.team_name, None)
+            if series is not None:
+                by_id[team_id] = series
+                by_name[series.team_name] = team_id
+            self._by_id, self._by_name = by_id, by_name
+            self._version = version
+
+
+TEAM_SERIES = TeamSeriesStore(SessionLocal)
@@ -0,0 +1,12 @@
+"""Chart rendering package exports."""
+
+from .pool import RenderPool, RenderTimeout, configure_matplotlib
+from .team_history import TEAM_HISTORY_FIGSIZE, render_team_history_png
+
+__all__ = [
+    "RenderPool",
+    "RenderTimeout",
+    "configure_matplotlib",
+    "TEAM_HISTORY_FIGSIZE",
+    "render_team_history_png",
+]
@@ -0,0 +1,129 @@
+"""Out-of-process chart rendering: a pre-warmed worker pool with per-job timeouts."""
+
+import contextlib
+import io
+import multiprocessing
+import sys
+import threading
+from concurrent.futures import ProcessPoolExecutor
+from concurrent.futures import TimeoutError as FutureTimeout
+from concurrent.futures.process import BrokenProcessPool
+
+
+class RenderTimeout(Exception):
+    """Raised when a chart job does not finish within the pool timeout."""
+
+
+def configure_matplotlib():
+    """Headless backend + CJK font settings shared by the server and every worker."""
+    import matplotlib
+    matplotlib.use('Agg')
+    matplotlib.rcParams['font.sans-serif'] = ['SimHei']  # 指定为黑体
+    matplotlib.rcParams['axes.unicode_minus'] = False    # 负号正常显示
+
+
+def _warm_worker():
+    """Worker initializer: resolve fonts and load Agg once, before the first job."""
+    configure_matplotlib()
+    from matplotlib import font_manager
+    from matplotlib.figure import Figure
+
+    font_manager.findfont(font_manager.FontProperties(family=["sans-serif"]))
+    fig = Figure(figsize=(1, 1))
+    fig.add_subplot().plot([0, 1], [0, 1])
+    fig.savefig(io.BytesIO(), format="png")
+
+
+@contextlib.contextmanager
+def _main_module_hidden():
+    """
+    A spawned child re-runs the parent's __main__ (as __mp_main__) when it has a
+    __file__ or __spec__; hide both so workers import only what their jobs need.
+    """
+    main = sys.modules["__main__"]
+    file = main.__dict__.pop("__file__", None)
+    spec, main.__spec__ = getattr(main, "__spec__", None), None
+    try:
+        yield
+    finally:
+        main.__spec__ = spec
+        if file is not None:
+            main.__file__ = file
+
+
+class RenderPool:
+    """
+    Submit chart jobs (picklable top-level functions returning bytes) to worker processes.
+
+    workers <= 0 renders inline in the calling thread, serialized by a lock; useful for
+    debugging and for platforms where spawning processes is not allowed.
+    """
+
+    def __init__(self, workers: int, timeout: float = 10.0):
+        self.workers = workers
+        self.timeout = timeout
+        self._executor = None
+        self._inline_ready = False
+        self._lock = threading.Lock()
+
+    def _get_executor(self) -> ProcessPoolExecutor:
+        with self._lock:
+            if self._executor is None:
+                # spawn: never fork a multi-threaded Flask process
+                executor = ProcessPoolExecutor(
+                    max_workers=self.workers,
+                    mp_context=multiprocessing.get_context("spawn"),
+                    initializer=_warm_worker,
+                )
+                # spawn workers start one per submit() while none is idle: start them
+                # all here, without letting them re-import the server script
+                with _main_module_hidden():
+                    for _ in range(self.workers):
+                        executor.submit(int)
+                self._executor = executor
+            return self._executor
+
+    def _warm_inline(self) -> None:
+        if not self._inline_ready:
+            _warm_worker()
+            self._inline_ready = True
+
+    def _reset(self, broken) -> None:
+        with self._lock:
+            if self._executor is broken:
+                self._executor = None
+        broken.shutdown(wait=False, cancel_futures=True)
+
+    def submit(self, fn, *args) -> bytes:
+        """Run fn(*args) on a worker and wait up to `timeout` seconds for the result."""
+        if self.workers <= 0:
+            with self._lock:
+                self._warm_inline()
+                return fn(*args)
+        for attempt in range(2):
+            executor = self._get_executor()
+            try:
+                return executor.submit(fn, *args).result(timeout=self.timeout)
+            except FutureTimeout as exc:
+                raise RenderTimeout(f"render did not finish within {self.timeout}s") from exc
+            except BrokenProcessPool:
+                # A worker died (OOM, segfault); rebuild the pool and retry once.
+                self._reset(executor)
+                if attempt:
+                    raise
+
+    def warm_up(self) -> None:
+        """Start every worker (fonts resolved, Agg loaded) now instead of on the first request."""
+        if self.workers <= 0:
+            with self._lock:
+                self._warm_inline()
+            return
+        executor = self._get_executor()
+        for future in [executor.submit(int) for _ in range(self.workers)]:
+            future.result()
+
+    def shutdown(self) -> None:
+        with self._lock:
+            executor, self._executor = self._executor, None
+        if executor is not None:
+            executor.shutdown(wait=False, cancel_futures=True)
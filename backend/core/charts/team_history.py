@@ -0,0 +1,37 @@
+"""Team history chart: league position and goals per season."""
+
+import io
+
+from matplotlib.figure import Figure
+from matplotlib.ticker import MaxNLocator
+
+
+TEAM_HISTORY_FIGSIZE = (8, 8)
+
+
+def render_team_history_png(team_name, seasons, ranks, gf, ga, gd) -> bytes:
+    """
+    Render the two-axes history chart and return PNG bytes.
+    Uses the object-oriented Figure API so no pyplot global state is touched.
+    """
+    fig = Figure(figsize=TEAM_HISTORY_FIGSIZE)
+    ax1, ax2 = fig.subplots(2, 1)
+    ax1.plot(seasons, ranks, marker='o', color='#1976d2', linewidth=2, label='排名')
+    ax1.set_title(f'{team_name} 历年排名')
+    ax1.set_xlabel('赛季')
+    ax1.set_ylabel('排名')
+    ax1.invert_yaxis()
+    ax1.yaxis.set_major_locator(MaxNLocator(integer=True))
+    ax1.grid(True, linestyle='--', alpha=0.5)
+    ax2.plot(seasons, gf, marker='o', color='#43a047', label='进球')
+    ax2.plot(seasons, ga, marker='o', color='#e53935', label='失球')
+    ax2.plot(seasons, gd, marker='o', color='#fbc02d', label='净胜球')
+    ax2.set_title(f'{team_name} 历年进球/失球/净胜球')
+    ax2.set_xlabel('赛季')
+    ax2.set_ylabel('数量')
+    ax2.legend()
+    ax2.grid(True, linestyle='--', alpha=0.5)
+    fig.tight_layout()
+    buf = io.BytesIO()
+    fig.savefig(buf, format='png')
+    return buf.getvalue()
@@ -1,7 +1,10 @@
 """Database package exports."""
 
 from .base import Base, SessionLocal, engine
+from .indexes import ensure_indexes
 from .models import Season, Team, TeamSeasonStats
+from .search import ensure_search_index, search_player_ids, search_team_ids
+from .version import bump_data_version, current_data_version, data_version_updated_at
 
 __all__ = [
     "Base",
@@ -10,4 +13,11 @@ __all__ = [
     "Season",
     "Team",
     "TeamSeasonStats",
+    "bump_data_version",
+    "current_data_version",
+    "data_version_updated_at",
+    "ensure_indexes",
+    "ensure_search_index",
+    "search_player_ids",
+    "search_team_ids",
 ]
@@ -0,0 +1,21 @@
+"""
+Indexes added to tables after they first shipped. Base.metadata.create_all() never
+adds an index to a table that already exists, so create_db and the importers
+issue these explicitly, like ensure_search_index() does for the FTS tables.
+"""
+
+from sqlalchemy import text
+
+from .base import engine
+
+_DDL = [
+    # 球队历年数据：按 team_id 取整条时间序列（TeamSeasonStats.__table_args__）
+    "CREATE INDEX IF NOT EXISTS ix_team_season_stats_team ON team_season_stats (team_id)",
+]
+
+
+def ensure_indexes(bind=engine) -> None:
+    """Create any missing index from _DDL; the tables must exist already."""
+    with bind.begin() as conn:
+        for ddl in _DDL:
+            conn.execute(text(ddl))
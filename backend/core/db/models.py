@@ -1,6 +1,6 @@
 # backend/core/db/models.py
 from sqlalchemy import (
-    Column, Integer, String, ForeignKey, UniqueConstraint, Date, Enum, Index
+    Column, Integer, String, ForeignKey, UniqueConstraint, Date, DateTime, Enum, Index
 )
 from sqlalchemy.orm import relationship
 from .base import Base
@@ -39,6 +39,11 @@ class Team(Base):
         back_populates="team",
         cascade="all, delete-orphan"
     )
+    aliases = relationship(
+        "TeamAlias",
+        back_populates="team",
+        cascade="all, delete-orphan"
+    )
 
     def __repr__(self):
         return f"<Team {self.name}>"
@@ -51,6 +56,8 @@ class TeamSeasonStats(Base):
         # 常用查询：赛季榜单/排序
         Index("ix_team_season_stats_season_pos", "season_id", "position"),
         Index("ix_team_season_stats_season_points", "season_id", "points"),
+        # 球队历年数据：按 team_id 取整条时间序列
+        Index("ix_team_season_stats_team", "team_id"),
     )
 
     id = Column(Integer, primary_key=True, autoincrement=True)
@@ -116,3 +123,35 @@ class Player(Base):
 
     def __repr__(self):
         return f"<Player {self.first_name} {self.last_name} team={self.team_id} no={self.shirt_no}>"
+
+
+class TeamAlias(Base):
+    """How an external source names a team, e.g. Sina's "曼联" / team id -> Manchester United."""
+    __tablename__ = "team_aliases"
+    __table_args__ = (
+        UniqueConstraint("source", "name", name="uq_team_alias_name"),
+        Index("ix_team_aliases_source_external", "source", "external_id"),
+    )
+
+    id = Column(Integer, primary_key=True, autoincrement=True)
+    source = Column(String, nullable=False)           # "sina"
+    name = Column(String, nullable=False)             # 来源里的队名（原文）
+    external_id = Column(String, nullable=True)       # 来源里的球队 id（若有）
+    team_id = Column(Integer, ForeignKey("teams.id", ondelete="CASCADE"), nullable=False, index=True)
+
+    team = relationship("Team", back_populates="aliases")
+
+    def __repr__(self):
+        return f"<TeamAlias {self.source}:{self.name} -> team={self.team_id}>"
+
+
+class DataVersion(Base):
+    """Single-row table: global data version, bumped by every admin mutation."""
+    __tablename__ = "data_version"
+
+    id = Column(Integer, primary_key=True)
+    version = Column(Integer, nullable=False, default=0)
+    updated_at = Column(DateTime, nullable=False)
+
+    def __repr__(self):
+        return f"<DataVersion {self.version} at {self.updated_at}>"
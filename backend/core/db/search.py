@@ -0,0 +1,121 @@
+"""
+FTS5 trigram shadow index over player and team names.
+
+player_search / team_search are kept in sync with players / teams by triggers, so
+admin writes and the import scripts maintain them without extra code. A trigram
+MATCH is an indexed substring search (same semantics as ILIKE '%kw%', case
+insensitive) and can be ranked with bm25.
+"""
+
+import threading
+from typing import List, Optional
+
+from sqlalchemy import text
+from sqlalchemy.exc import OperationalError
+
+from .base import engine
+
+
+MIN_QUERY_LEN = 3  # trigram needs at least one full trigram
+
+_DDL = [
+    "CREATE VIRTUAL TABLE IF NOT EXISTS player_search USING fts5(full_name, tokenize='trigram')",
+    "CREATE VIRTUAL TABLE IF NOT EXISTS team_search USING fts5(name, tokenize='trigram')",
+    """
+    CREATE TRIGGER IF NOT EXISTS players_search_ai AFTER INSERT ON players BEGIN
+        INSERT INTO player_search(rowid, full_name) VALUES (new.id, new.first_name || ' ' || new.last_name);
+    END
+    """,
+    """
+    CREATE TRIGGER IF NOT EXISTS players_search_ad AFTER DELETE ON players BEGIN
+        DELETE FROM player_search WHERE rowid = old.id;
+    END
+    """,
+    """
+    CREATE TRIGGER IF NOT EXISTS players_search_au AFTER UPDATE OF first_name, last_name ON players BEGIN
+        UPDATE player_search SET full_name = new.first_name || ' ' || new.last_name WHERE rowid = old.id;
+    END
+    """,
+    """
+    CREATE TRIGGER IF NOT EXISTS teams_search_ai AFTER INSERT ON teams BEGIN
+        INSERT INTO team_search(rowid, name) VALUES (new.id, new.name);
+    END
+    """,
+    """
+    CREATE TRIGGER IF NOT EXISTS teams_search_ad AFTER DELETE ON teams BEGIN
+        DELETE FROM team_search WHERE rowid = old.id;
+    END
+    """,
+    """
+    CREATE TRIGGER IF NOT EXISTS teams_search_au AFTER UPDATE OF name ON teams BEGIN
+        UPDATE team_search SET name = new.name WHERE rowid = old.id;
+    END
+    """,
+]
+
+_lock = threading.Lock()
+_state = {"ready": False, "available": True}
+
+
+def ensure_search_index(bind=engine, rebuild: bool = False) -> bool:
+    """
+    Create the FTS tables/triggers if missing and backfill them when they are out of
+    step with the base tables. Returns False if this SQLite build lacks FTS5/trigram.
+    """
+    try:
+        with bind.begin() as conn:
+            for ddl in _DDL:
+                conn.execute(text(ddl))
+            for fts, col, base, expr in (
+                ("player_search", "full_name", "players", "first_name || ' ' || last_name"),
+                ("team_search", "name", "teams", "name"),
+            ):
+                n_fts = conn.execute(text(f"SELECT COUNT(*) FROM {fts}")).scalar()
+                n_base = conn.execute(text(f"SELECT COUNT(*) FROM {base}")).scalar()
+                if rebuild or n_fts != n_base:
+                    conn.execute(text(f"DELETE FROM {fts}"))
+                    conn.execute(text(f"INSERT INTO {fts}(rowid, {col}) SELECT id, {expr} FROM {base}"))
+    except OperationalError:
+        return False
+    return True
+
+
+def _ready() -> bool:
+    if not _state["ready"]:
+        with _lock:
+            if not _state["ready"]:
+                _state["available"] = ensure_search_index()
+                _state["ready"] = True
+    return _state["available"]
+
+
+def _match_expr(keyword: str) -> Optional[str]:
+    keyword = (keyword or "").strip()
+    if len(keyword) < MIN_QUERY_LEN:
+        return None
+    return '"' + keyword.replace('"', '""') + '"'
+
+
+def _search(session, table: str, keyword: str, limit: Optional[int]) -> Optional[List[int]]:
+    expr = _match_expr(keyword)
+    if expr is None or not _ready():
+        return None
+    sql = f"SELECT rowid FROM {table} WHERE {table} MATCH :q ORDER BY rank"
+    params = {"q": expr}
+    if limit is not None:
+        sql += " LIMIT :limit"
+        params["limit"] = limit
+    return [row[0] for row in session.execute(text(sql), params)]
+
+
+def search_player_ids(session, keyword: str, limit: Optional[int] = None) -> Optional[List[int]]:
+    """
+    Player ids whose "first last" name contains keyword, best bm25 match first.
+    None means the index cannot answer (keyword too short, no FTS5): use ILIKE.
+    """
+    return _search(session, "player_search", keyword, limit)
+
+
+def search_team_ids(session, keyword: str, limit: Optional[int] = None) -> Optional[List[int]]:
+    """Team ids whose name contains keyword, best match first; None -> fall back to ILIKE."""
+    return _search(session, "team_search", keyword, limit)
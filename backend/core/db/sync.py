@@ -0,0 +1,114 @@
+"""
+Diff-based sync for the import scripts.
+
+Each source row and each stored row is reduced to a content fingerprint over the
+same columns; only keys whose fingerprint differs are written. The stored side is
+fingerprinted from the live row, so edits made through the admin UI are seen too.
+"""
+
+import hashlib
+from collections import defaultdict
+from typing import Callable, Dict, Hashable, Iterable, List, Optional, Sequence, Tuple
+
+from sqlalchemy import bindparam, delete, select, update
+
+
+def row_digest(values: dict, fields: Sequence[str]) -> str:
+    raw = "\x1f".join("" if values.get(f) is None else str(values.get(f)) for f in fields)
+    return hashlib.blake2b(raw.encode("utf-8"), digest_size=16).hexdigest()
+
+
+class ChangeSet:
+    def __init__(self):
+        self.inserts: List[dict] = []
+        self.updates: List[dict] = []  # carry "_id"
+        self.deletes: List[int] = []
+        self.unchanged = 0
+
+    def __bool__(self) -> bool:
+        return bool(self.inserts or self.updates or self.deletes)
+
+    def summary(self) -> str:
+        return (
+            f"inserted={len(self.inserts)}, updated={len(self.updates)}, "
+            f"deleted={len(self.deletes)}, unchanged={self.unchanged}"
+        )
+
+
+def load_fingerprints(conn, table, key_cols: Sequence[str], fields: Sequence[str], where=None):
+    """{key tuple: (id, digest)} for the stored rows (optionally filtered)."""
+    cols = [table.c.id] + [table.c[c] for c in key_cols] + [table.c[f] for f in fields if f not in key_cols]
+    stmt = select(*cols)
+    if where is not None:
+        stmt = stmt.where(where)
+    stored = {}
+    for row in conn.execute(stmt):
+        values = row._mapping
+        stored[tuple(values[c] for c in key_cols)] = (values["id"], row_digest(values, fields))
+    return stored
+
+
+def diff_rows(
+    stored: Dict[Hashable, Tuple[int, str]],
+    incoming: Iterable[Tuple[Hashable, dict]],
+    fields: Sequence[str],
+    identity: Optional[Callable[[Hashable], Hashable]] = None,
+) -> ChangeSet:
+    """
+    Compare source rows (key, values) against stored fingerprints. Stored keys the
+    source does not mention become deletes, so callers scope `stored` to what the
+    source is authoritative for.
+
+    identity(key) names the entity behind a key when the key also holds mutable
+    columns (e.g. a player's shirt number): a stored row that lost its key and a
+    new row are paired into an update, keeping the row id, when they are the only
+    ones on either side with that identity.
+    """
+    changes = ChangeSet()
+    seen = set()
+    new_keys: List[Hashable] = []
+    for key, values in incoming:
+        seen.add(key)
+        current = stored.get(key)
+        if current is None:
+            changes.inserts.append(values)
+            new_keys.append(key)
+        elif current[1] != row_digest(values, fields):
+            changes.updates.append(dict(values, _id=current[0]))
+        else:
+            changes.unchanged += 1
+    gone = {key: row_id for key, (row_id, _) in stored.items() if key not in seen}
+    if identity is not None and gone and changes.inserts:
+        gone_by_identity: Dict[Hashable, List[Hashable]] = defaultdict(list)
+        for key in gone:
+            gone_by_identity[identity(key)].append(key)
+        new_by_identity: Dict[Hashable, List[int]] = defaultdict(list)
+        for index, key in enumerate(new_keys):
+            new_by_identity[identity(key)].append(index)
+        moved = set()
+        for ident, indexes in new_by_identity.items():
+            old_keys = gone_by_identity.get(ident, [])
+            if len(indexes) == 1 and len(old_keys) == 1:
+                changes.updates.append(dict(changes.inserts[indexes[0]], _id=gone.pop(old_keys[0])))
+                moved.add(indexes[0])
+        changes.inserts = [values for index, values in enumerate(changes.inserts) if index not in moved]
+    changes.deletes = list(gone.values())
+    return changes
+
+
+def apply_changes(conn, table, changes: ChangeSet, fields: Sequence[str], batch_size: int = 1000) -> None:
+    """Write a ChangeSet with batched executemany statements on an open transaction."""
+    for i in range(0, len(changes.deletes), batch_size):
+        conn.execute(delete(table).where(table.c.id.in_(changes.deletes[i:i + batch_size])))
+    for i in range(0, len(changes.inserts), batch_size):
+        conn.execute(table.insert(), changes.inserts[i:i + batch_size])
+    if changes.updates:
+        # bind names must not collide with column names in an UPDATE ... SET
+        stmt = (
+            update(table)
+            .where(table.c.id == bindparam("_id"))
+            .values({f: bindparam(f"_{f}") for f in fields})
+        )
+        params = [{"_id": row["_id"], **{f"_{f}": row.get(f) for f in fields}} for row in changes.updates]
+        for i in range(0, len(params), batch_size):
+            conn.execute(stmt, params[i:i + batch_size])
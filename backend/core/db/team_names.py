@@ -0,0 +1,169 @@
+"""
+Resolve club names from external sources to Team ids.
+
+The tables CSV uses short names ("Wolves", "Sheffield Utd") while the Premier
+League API reports official ones ("Wolverhampton Wanderers", "Sheffield United").
+Names are compared accent/punctuation-folded, through a small alias list.
+Sources that use their own names/ids (Sina's Chinese names) go through the
+persisted team_aliases table instead; see TeamAliasMap.
+"""
+
+from typing import Dict, Iterable, List, Optional, Tuple
+
+from sqlalchemy import select
+from sqlalchemy.dialects.sqlite import insert as sqlite_insert
+
+from ..text import fold_name
+from .models import Team, TeamAlias
+
+
+# official / common name -> name used in the teams table
+CLUB_ALIASES = {
+    "AFC Bournemouth": "Bournemouth",
+    "Blackburn Rovers": "Blackburn",
+    "Bolton Wanderers": "Bolton",
+    "Brighton & Hove Albion": "Brighton",
+    "Brighton and Hove Albion": "Brighton",
+    "Charlton Athletic": "Charlton Ath",
+    "Huddersfield Town": "Huddersfield",
+    "Man City": "Manchester City",
+    "Man Utd": "Manchester United",
+    "Newcastle": "Newcastle United",
+    "Nott'm Forest": "Nottingham Forest",
+    "Queens Park Rangers": "QPR",
+    "Sheffield United": "Sheffield Utd",
+    "Sheffield Wednesday": "Sheffield Weds",
+    "Spurs": "Tottenham Hotspur",
+    "Tottenham": "Tottenham Hotspur",
+    "West Bromwich Albion": "West Brom",
+    "West Ham United": "West Ham",
+    "Wolverhampton Wanderers": "Wolves",
+}
+
+_NOISE = {"fc", "afc"}
+
+
+def club_key(name: str) -> str:
+    """"Brighton & Hove Albion FC" -> "brighton hove albion"."""
+    return " ".join(tok for tok in fold_name(name).split() if tok not in _NOISE)
+
+
+class TeamNameResolver:
+    """In-memory name -> Team id map; build it once per import run."""
+
+    def __init__(self, teams: Iterable[Tuple[int, str]]):
+        self._ids: Dict[str, int] = {}
+        for team_id, name in teams:
+            self.add(name, team_id)
+        for alias, canonical in CLUB_ALIASES.items():
+            team_id = self._ids.get(club_key(canonical))
+            if team_id is not None:
+                self._ids.setdefault(club_key(alias), team_id)
+
+    @classmethod
+    def load(cls, conn) -> "TeamNameResolver":
+        """Build from a Connection or Session."""
+        return cls(conn.execute(select(Team.id, Team.name)).all())
+
+    def add(self, name: str, team_id: int) -> None:
+        self._ids[club_key(name)] = team_id
+
+    def resolve(self, name: str) -> Optional[int]:
+        return self._ids.get(club_key(name))
+
+
+# 新浪积分榜 team_cn -> teams 表中的队名；首次使用时写入 team_aliases
+SINA_TEAM_NAMES = {
+    "阿森纳": "Arsenal",
+    "阿斯顿维拉": "Aston Villa",
+    "维拉": "Aston Villa",
+    "伯恩茅斯": "Bournemouth",
+    "布伦特福德": "Brentford",
+    "布莱顿": "Brighton",
+    "伯恩利": "Burnley",
+    "切尔西": "Chelsea",
+    "水晶宫": "Crystal Palace",
+    "埃弗顿": "Everton",
+    "富勒姆": "Fulham",
+    "伊普斯维奇": "Ipswich Town",
+    "利兹联": "Leeds United",
+    "莱斯特城": "Leicester City",
+    "利物浦": "Liverpool",
+    "卢顿": "Luton Town",
+    "曼城": "Manchester City",
+    "曼联": "Manchester United",
+    "纽卡斯尔": "Newcastle United",
+    "纽卡斯尔联": "Newcastle United",
+    "诺丁汉森林": "Nottingham Forest",
+    "诺丁汉": "Nottingham Forest",
+    "谢菲尔德联": "Sheffield Utd",
+    "谢菲联": "Sheffield Utd",
+    "南安普顿": "Southampton",
+    "桑德兰": "Sunderland",
+    "热刺": "Tottenham Hotspur",
+    "西汉姆联": "West Ham",
+    "西汉姆": "West Ham",
+    "狼队": "Wolves",
+}
+
+
+class TeamAliasMap:
+    """
+    In-memory view of team_aliases for one source: external id / raw name -> Team id.
+    Misses fall back to seed names and English-name resolution; whatever resolves
+    that way is written back so the next run finds it directly.
+    """
+
+    def __init__(self, source: str, aliases: Iterable, resolver: TeamNameResolver,
+                 seed: Optional[Dict[str, str]] = None):
+        self.source = source
+        self.resolver = resolver
+        self.seed = seed or {}
+        self._by_id: Dict[str, int] = {}
+        self._by_name: Dict[str, int] = {}
+        for alias in aliases:  # rows with name / external_id / team_id
+            if alias.external_id:
+                self._by_id[alias.external_id] = alias.team_id
+            self._by_name[alias.name] = alias.team_id
+
+    @classmethod
+    def load(cls, conn, source: str, seed: Optional[Dict[str, str]] = None) -> "TeamAliasMap":
+        """Build from a Connection (creates team_aliases on first use)."""
+        table = TeamAlias.__table__
+        table.create(conn, checkfirst=True)
+        # 清掉指向已删除球队的旧映射（早于 ON DELETE CASCADE 建的表不会自动删）
+        conn.execute(table.delete().where(table.c.team_id.not_in(select(Team.__table__.c.id))))
+        rows = conn.execute(
+            select(table.c.name, table.c.external_id, table.c.team_id)
+            .join(Team.__table__, Team.id == table.c.team_id)
+            .where(table.c.source == source)
+        )
+        return cls(source, rows.all(), TeamNameResolver.load(conn), seed)
+
+    def resolve(self, conn, name: str, external_id=None, english_name: str = "") -> Optional[int]:
+        """Team id for a source team, persisting a new alias row when it had to be worked out."""
+        external_id = str(external_id) if external_id not in (None, "") else None
+        if external_id and external_id in self._by_id:
+            return self._by_id[external_id]
+        team_id = self._by_name.get(name)
+        if team_id is not None and not external_id:
+            return team_id
+        if team_id is None:
+            team_id = self.resolver.resolve(self.seed.get(name, "")) or self.resolver.resolve(english_name or name)
+            if team_id is None:
+                return None
+        self.remember(conn, name, external_id, team_id)
+        return team_id
+
+    def remember(self, conn, name: str, external_id, team_id: int) -> None:
+        table = TeamAlias.__table__
+        stmt = sqlite_insert(table).values(source=self.source, name=name, external_id=external_id, team_id=team_id)
+        conn.execute(
+            stmt.on_conflict_do_update(
+                index_elements=[table.c.source, table.c.name],
+                set_={"external_id": stmt.excluded.external_id, "team_id": stmt.excluded.team_id},
+            )
+        )
+        self._by_name[name] = team_id
+        if external_id:
+            self._by_id[external_id] = team_id
@@ -0,0 +1,103 @@
+"""
+Global data version: a single DB row bumped by every admin mutation.
+
+Readers get a process-local copy that is re-read from the DB at most once per
+SOCCER_SEEKER_VERSION_TTL seconds, so checking the version is normally free and
+bumps made by other worker processes or import scripts are seen within the TTL.
+"""
+
+import os
+import threading
+import time
+from datetime import datetime, timedelta, timezone
+from typing import Optional
+
+from sqlalchemy import update
+from sqlalchemy.dialects.sqlite import insert as sqlite_insert
+from sqlalchemy.schema import CreateTable
+
+from .base import engine
+from .models import DataVersion
+
+
+VERSION_TTL = float(os.environ.get("SOCCER_SEEKER_VERSION_TTL", 1.0))
+
+_lock = threading.Lock()
+_version = 0
+_updated_at: Optional[datetime] = None
+_checked_at = float("-inf")
+_table_ready = False
+
+
+def _ensure_row(conn) -> None:
+    global _table_ready
+    if _table_ready:
+        return
+    # IF NOT EXISTS / OR IGNORE: the server, importers and render workers may all
+    # start against a fresh DB, and a check-then-create would let two of them race
+    conn.execute(CreateTable(DataVersion.__table__, if_not_exists=True))
+    conn.execute(
+        sqlite_insert(DataVersion.__table__)
+        .values(id=1, version=0, updated_at=_utcnow())
+        .on_conflict_do_nothing(index_elements=["id"])
+    )
+    _table_ready = True
+
+
+def _utcnow() -> datetime:
+    return datetime.now(timezone.utc).replace(tzinfo=None, microsecond=0)
+
+
+def _store(version: int, updated_at: datetime) -> None:
+    global _version, _updated_at, _checked_at
+    # never step backwards if a slower reader races a bump
+    if version >= _version:
+        _version, _updated_at = version, updated_at
+    _checked_at = time.monotonic()
+
+
+def _refresh() -> None:
+    with _lock:
+        if time.monotonic() - _checked_at < VERSION_TTL:
+            return
+        with engine.begin() as conn:
+            _ensure_row(conn)
+            row = conn.execute(DataVersion.__table__.select()).first()
+        _store(row.version, row.updated_at)
+
+
+def current_data_version() -> int:
+    """Return the current data version (monotonically increasing)."""
+    if time.monotonic() - _checked_at >= VERSION_TTL:
+        _refresh()
+    return _version
+
+
+def data_version_updated_at() -> datetime:
+    """
+    UTC time (naive, whole seconds) of the last bump; backs Last-Modified. Every bump
+    moves it forward by at least a second, so each version has its own value and
+    If-Modified-Since >= updated_at really means "has seen this version".
+    """
+    current_data_version()
+    return _updated_at
+
+
+def bump_data_version() -> int:
+    """Advance the data version after a write and return the new value."""
+    with _lock:
+        with engine.begin() as conn:
+            _ensure_row(conn)
+            # bump first: the write lock is held from here, so no other process reads
+            # the same previous timestamp
+            conn.execute(
+                update(DataVersion).where(DataVersion.id == 1).values(version=DataVersion.version + 1)
+            )
+            row = conn.execute(DataVersion.__table__.select()).first()
+            # two bumps in the same second must not share a Last-Modified
+            now = _utcnow()
+            if row.updated_at is not None and now <= row.updated_at:
+                now = row.updated_at + timedelta(seconds=1)
+            conn.execute(update(DataVersion).where(DataVersion.id == 1).values(updated_at=now))
+        _store(row.version, now)
+        return row.version
@@ -0,0 +1,19 @@
+"""Name normalisation shared by the db layer (club resolution) and the fuzzy matcher."""
+
+import re
+import unicodedata
+
+
+# letters NFKD leaves alone
+_FOLD_EXTRA = str.maketrans({
+    "ø": "o", "æ": "ae", "œ": "oe", "ß": "ss", "đ": "d", "ð": "d",
+    "ł": "l", "þ": "th", "ı": "i", "ħ": "h",
+})
+_NON_WORD = re.compile(r"[^0-9a-z]+")
+
+
+def fold_name(text: str) -> str:
+    """Lowercase, strip accents and punctuation: "Martin Ødegaard" -> "martin odegaard"."""
+    text = unicodedata.normalize("NFKD", (text or "").lower()).translate(_FOLD_EXTRA)
+    text = "".join(ch for ch in text if not unicodedata.combining(ch))
+    return _NON_WORD.sub(" ", text).strip()
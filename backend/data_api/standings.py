@@ -5,6 +5,7 @@ from sqlalchemy import select
 from .session import get_session
 from .schemas import TeamSeasonRow
 from core.db import Season, Team, TeamSeasonStats
+from core.cache import TEAM_SERIES
 
 def get_standings_by_year(end_year: int) -> List[TeamSeasonRow]:
     """
@@ -44,39 +45,30 @@ def get_standings_by_year(end_year: int) -> List[TeamSeasonRow]:
 
 def get_team_history(team_id: int) -> List[TeamSeasonRow]:
     """
-    返回某球队历年在英超的联赛表现（每年一行）
+    返回某球队历年在英超的联赛表现（每年一行），数据来自内存中的球队时间序列
     """
-    with get_session() as session:
-        stmt = (
-            select(Season, Team, TeamSeasonStats)
-            .join(TeamSeasonStats, TeamSeasonStats.season_id == Season.id)
-            .join(Team, TeamSeasonStats.team_id == Team.id)
-            .where(Team.id == team_id)
-            .order_by(Season.end_year)
+    series = TEAM_SERIES.get(team_id)
+    if series is None:
+        return []
+    return [
+        TeamSeasonRow(
+            season_end_year=series.season_years[i],
+            season_name=series.season_names[i],
+            team_id=series.team_id,
+            team_name=series.team_name,
+            position=series.position[i],
+            played=series.played[i],
+            won=series.won[i],
+            drawn=series.drawn[i],
+            lost=series.lost[i],
+            gf=series.gf[i],
+            ga=series.ga[i],
+            gd=series.gd[i],
+            points=series.points[i],
+            notes=series.notes[i],
         )
-        rows = session.execute(stmt).all()
-
-        result: List[TeamSeasonRow] = []
-        for s, t, stats in rows:
-            result.append(
-                TeamSeasonRow(
-                    season_end_year=s.end_year,
-                    season_name=s.name,
-                    team_id=t.id,
-                    team_name=t.name,
-                    position=stats.position,
-                    played=stats.played,
-                    won=stats.won,
-                    drawn=stats.drawn,
-                    lost=stats.lost,
-                    gf=stats.gf,
-                    ga=stats.ga,
-                    gd=stats.gd,
-                    points=stats.points,
-                    notes=stats.notes,
-                )
-            )
-        return result
+        for i in range(len(series))
+    ]
     
 def get_team_season_stats(team_id: int, end_year: int) -> TeamSeasonRow:
     """
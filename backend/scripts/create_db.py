@@ -7,13 +7,15 @@ PROJECT_ROOT = Path(__file__).resolve().parents[2]
 if str(PROJECT_ROOT) not in sys.path:
     sys.path.insert(0, str(PROJECT_ROOT))
 
-from backend.core.db import Base, engine, SessionLocal
+from backend.core.db import Base, engine, SessionLocal, ensure_indexes, ensure_search_index
 
 # 关键：一定要导入 models，让 Base 注册所有表
 from backend.core.db.models import User  # Season/Team/TeamSeasonStats 也会被加载进来
 
 def init_db():
     Base.metadata.create_all(bind=engine)
+    ensure_indexes(engine)
+    ensure_search_index(engine)  # FTS 名称索引 + 同步触发器
 
     # （可选）初始化 admin 账号：如果不存在就创建
     session = SessionLocal()
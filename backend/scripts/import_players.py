@@ -1,151 +1,265 @@
 """
 Import player roster data into the players table.
 
-Data source: data/epl_players_23_24(1).csv (tab-separated, includes teamID matching teams.id)
+Accepts either roster layout (detected from the header):
+- data/epl_players_23_24.csv: firstName,lastName,shirtNo,birthDate,position,teamID
+- data/epl_players_2025.csv (crawl_players.py output): player_id,first_name,last_name,
+  club,position,shirt_number,date_of_birth,appearances,goals,assists,...
+
+Rows are streamed, clubs resolved through an in-memory name map, duplicates dropped
+in memory and players upserted in batches on uq_team_player_unique, in one transaction.
 """
+import argparse
 import csv
 import sys
+import time
 from datetime import datetime
 from pathlib import Path
 
-from sqlalchemy import select, UniqueConstraint, delete
+from sqlalchemy import bindparam, delete, select, update
+from sqlalchemy.dialects.sqlite import insert as sqlite_insert
 
 # Add project root to sys.path so `backend` is importable when running directly
 PROJECT_ROOT = Path(__file__).resolve().parents[2]
 if str(PROJECT_ROOT) not in sys.path:
     sys.path.insert(0, str(PROJECT_ROOT))
 
-from backend.core.db import Base, SessionLocal, engine
+from backend.core.db import Base, engine, bump_data_version, ensure_indexes, ensure_search_index
 from backend.core.db.models import Team, Player  # noqa: E402
+from backend.core.db.sync import apply_changes, diff_rows, load_fingerprints  # noqa: E402
+from backend.core.db.team_names import TeamNameResolver  # noqa: E402
 
 DATA_FILE = PROJECT_ROOT / "data" / "epl_players_23_24.csv"
+BATCH_SIZE = 1000
+
+DATE_FORMATS = ("%Y/%m/%d", "%d %B %Y")  # 2002/4/13 (roster CSV), 13 April 2002 (crawler)
+POSITIONS = {"G": "Goalkeeper", "D": "Defender", "M": "Midfielder", "F": "Forward"}
 
 
 def parse_date(raw: str):
-    """Parse YYYY/M/D (or similar) to date; return None if invalid."""
+    """Parse YYYY/M/D or "D Month YYYY" to date; return None if invalid."""
     if not raw:
         return None
     raw = raw.strip().replace("-", "/")
-    try:
-        return datetime.strptime(raw, "%Y/%m/%d").date()
-    except Exception:
+    for fmt in DATE_FORMATS:
         try:
-            return datetime.strptime(raw, "%Y/%m/%d").date()
-        except Exception:
-            return None
+            return datetime.strptime(raw, fmt).date()
+        except ValueError:
+            continue
+    return None
 
 
-def reset_players():
-    """Dangerous: wipe players table before import."""
-    session = SessionLocal()
+def parse_int(raw):
     try:
-        session.execute(delete(Player))
-        session.commit()
-        print("🧹 Cleared players table.")
-    finally:
-        session.close()
+        return int(raw) if raw not in (None, "", "NA") else None
+    except (TypeError, ValueError):
+        return None
 
 
-def import_players(reset: bool = True):
-    if not DATA_FILE.exists():
-        raise FileNotFoundError(f"Player CSV not found: {DATA_FILE}")
+def open_roster(path: Path):
+    """Return (file, format, DictReader); the delimiter (comma or tab) is sniffed from the header."""
+    f = path.open(newline="", encoding="utf-8-sig")
+    header = f.readline()
+    f.seek(0)
+    reader = csv.DictReader(f, delimiter="\t" if "\t" in header else ",")
+    fields = set(reader.fieldnames or ())
+    if "teamID" in fields:
+        return f, "roster", reader
+    if "club" in fields:
+        return f, "crawler", reader
+    f.close()
+    raise ValueError(f"Unrecognised roster header in {path}: {reader.fieldnames}")
 
-    Base.metadata.create_all(engine)  # Ensure table exists
 
-    if reset:
-        reset_players()
+def normalize_row(fmt: str, row: dict, resolver: TeamNameResolver, team_ids: set):
+    """Map one CSV row to players columns; returns (values, None) or (None, skip reason)."""
+    if fmt == "roster":
+        team_id = parse_int(row.get("teamID"))
+        if team_id not in team_ids:
+            return None, "unknown team"
+        first = (row.get("firstName") or "").strip()
+        last = (row.get("lastName") or "").strip()
+        shirt_no = parse_int(row.get("shirtNo"))
+        birth_date = parse_date(row.get("birthDate") or "")
+        position = (row.get("position") or "").strip()
+    else:
+        team_id = resolver.resolve(row.get("club") or "")
+        if team_id is None:
+            return None, "unknown club"
+        first = (row.get("first_name") or "").strip()
+        last = (row.get("last_name") or "").strip()
+        if not first and not last:
+            first, _, last = (row.get("name") or "").strip().partition(" ")
+        shirt_no = parse_int(row.get("shirt_number"))
+        birth_date = parse_date(row.get("date_of_birth") or "")
+        raw_position = (row.get("position") or "").strip()
+        position = POSITIONS.get(raw_position, raw_position)
+    if not first and not last:
+        return None, "no name"
+    return dict(
+        team_id=team_id,
+        first_name=first,
+        last_name=last,
+        shirt_no=shirt_no,
+        birth_date=birth_date,
+        position=position,
+    ), None
 
-    session = SessionLocal()
-    inserted, updated, skipped = 0, 0, 0
-    seen_keys = set()  # (team_id, first, last, shirt_no)
-    try:
-        with DATA_FILE.open(newline="", encoding="utf-8-sig") as f:
-            reader = csv.DictReader(f, delimiter=",")
-            for row in reader:
-                if not row or not row.get("teamID"):
-                    skipped += 1
-                    continue
-                try:
-                    team_id = int(row["teamID"])
-                except Exception:
-                    skipped += 1
-                    continue
 
-                team = session.get(Team, team_id)
-                if not team:
-                    print(f"⚠️ Skip player because team_id {team_id} not found: {row}")
-                    skipped += 1
-                    continue
+def iter_roster(conn, fmt: str, reader):
+    """Yield (uq_team_player_unique key, values), or (None, skip reason) for unusable rows."""
+    resolver = TeamNameResolver.load(conn)
+    team_ids = set(conn.execute(select(Team.id)).scalars())
+    for row in reader:
+        values, reason = normalize_row(fmt, row, resolver, team_ids) if row else (None, "empty")
+        if values is None:
+            yield None, reason
+            continue
+        yield (values["team_id"], values["first_name"], values["last_name"], values["shirt_no"]), values
 
-                first = (row.get("firstName") or "").strip()
-                last = (row.get("lastName") or "").strip()
-                if not first and not last:
-                    skipped += 1
-                    continue
 
-                shirt = row.get("shirtNo")
-                try:
-                    shirt_no = int(shirt) if shirt not in (None, "", "NA") else None
-                except Exception:
-                    shirt_no = None
+def import_players(reset: bool = True, csv_path: Path = DATA_FILE, batch_size: int = BATCH_SIZE):
+    csv_path = Path(csv_path)
+    if not csv_path.exists():
+        raise FileNotFoundError(f"Player CSV not found: {csv_path}")
 
-                dedupe_key = (team_id, first, last, shirt_no)
-                if dedupe_key in seen_keys:
-                    skipped += 1
-                    continue
-                seen_keys.add(dedupe_key)
+    Base.metadata.create_all(engine)  # Ensure table exists
+    ensure_indexes(engine)
+    ensure_search_index(engine)  # 触发器随导入同步维护 player_search
 
-                stmt = select(Player).where(
-                    Player.team_id == team_id,
-                    Player.first_name == first,
-                    Player.last_name == last,
-                    Player.shirt_no == shirt_no,
-                )
-                player = session.execute(stmt).scalar_one_or_none()
+    table = Player.__table__
+    upsert = sqlite_insert(table)
+    upsert = upsert.on_conflict_do_update(
+        index_elements=[table.c.team_id, table.c.first_name, table.c.last_name, table.c.shirt_no],
+        set_={"birth_date": upsert.excluded.birth_date, "position": upsert.excluded.position},
+    )
+    # shirt_no may be NULL, which never conflicts in SQLite, so known rows are updated by id
+    update_by_id = (
+        update(table)
+        .where(table.c.id == bindparam("_id"))
+        .values(birth_date=bindparam("birth_date"), position=bindparam("position"))
+    )
 
-                payload = dict(
-                    birth_date=parse_date(row.get("birthDate") or ""),
-                    position=(row.get("position") or "").strip(),
+    started = time.perf_counter()
+    inserted, updated, skipped = 0, 0, {}
+    f, fmt, reader = open_roster(csv_path)
+    try:
+        with engine.begin() as conn:
+            if reset:
+                conn.execute(delete(Player))
+            existing = {
+                (row.team_id, row.first_name, row.last_name, row.shirt_no): row.id
+                for row in conn.execute(
+                    select(table.c.id, table.c.team_id, table.c.first_name, table.c.last_name, table.c.shirt_no)
                 )
+            }
+            seen = set()
+            new_rows, changed_rows = [], []
+
+            def flush():
+                if new_rows:
+                    conn.execute(upsert, new_rows)
+                    new_rows.clear()
+                if changed_rows:
+                    conn.execute(update_by_id, changed_rows)
+                    changed_rows.clear()
 
-                if player is None:
-                    player = Player(
-                        first_name=first,
-                        last_name=last,
-                        shirt_no=shirt_no,
-                        team_id=team_id,
-                        **payload,
-                    )
-                    session.add(player)
+            for key, values in iter_roster(conn, fmt, reader):
+                if key is None:
+                    skipped[values] = skipped.get(values, 0) + 1
+                    continue
+                if key in seen:
+                    skipped["duplicate"] = skipped.get("duplicate", 0) + 1
+                    continue
+                seen.add(key)
+                player_id = existing.get(key)
+                if player_id is None:
+                    new_rows.append(values)
                     inserted += 1
                 else:
-                    for k, v in payload.items():
-                        setattr(player, k, v)
+                    changed_rows.append(dict(values, _id=player_id))
                     updated += 1
-
-                if (inserted + updated) % 500 == 0:
-                    session.commit()
-                    print(f"... committed {inserted+updated} players")
-
-        session.commit()
-        print(f"✅ Imported players from {DATA_FILE}")
-        print(f"   inserted={inserted}, updated={updated}, skipped={skipped}")
+                if len(new_rows) + len(changed_rows) >= batch_size:
+                    flush()
+            flush()
     except Exception as e:
-        session.rollback()
         print("❌ Import players failed:", e)
         raise
     finally:
-        session.close()
+        f.close()
+
+    bump_data_version()
+    elapsed = time.perf_counter() - started
+    print(f"✅ Imported players from {csv_path} ({fmt} format)")
+    print(f"   inserted={inserted}, updated={updated}, skipped={sum(skipped.values())} {skipped or ''}")
+    print(f"   {inserted + updated} rows in {elapsed:.2f}s")
+    return inserted, updated, skipped
+
+
+def import_players_incremental(csv_path: Path = DATA_FILE, prune: bool = False):
+    """
+    Diff the source against the table instead of wiping it: rows are fingerprinted and
+    only inserts/updates for changed players are written, in one transaction. A new
+    shirt number updates the player in place (same players.id) rather than deleting
+    and re-inserting them.
+
+    Stored players missing from the source are only deleted with prune=True, i.e. when
+    the file is the full squad list of every team it mentions; a partial crawler
+    export would otherwise empty those squads. Other teams are never touched.
+    """
+    csv_path = Path(csv_path)
+    if not csv_path.exists():
+        raise FileNotFoundError(f"Player CSV not found: {csv_path}")
 
+    Base.metadata.create_all(engine)
+    ensure_indexes(engine)
+    ensure_search_index(engine)
 
-def debug_preview(n: int = 5):
-    print("CSV file:", DATA_FILE)
-    if not DATA_FILE.exists():
+    table = Player.__table__
+    key_cols = ("team_id", "first_name", "last_name", "shirt_no")
+    fields = key_cols + ("birth_date", "position")
+    started = time.perf_counter()
+    skipped = {}
+    f, fmt, reader = open_roster(csv_path)
+    try:
+        with engine.begin() as conn:
+            incoming = {}
+            for key, values in iter_roster(conn, fmt, reader):
+                if key is None:
+                    skipped[values] = skipped.get(values, 0) + 1
+                elif key in incoming:
+                    skipped["duplicate"] = skipped.get("duplicate", 0) + 1
+                else:
+                    incoming[key] = values
+            team_ids = {key[0] for key in incoming}
+            stored = load_fingerprints(conn, table, key_cols, fields, where=table.c.team_id.in_(team_ids))
+            # the unique key includes shirt_no; the player is (team_id, first_name, last_name)
+            changes = diff_rows(stored, incoming.items(), fields, identity=lambda key: key[:3])
+            if changes.deletes and not prune:
+                print(f"   keeping {len(changes.deletes)} stored players missing from the source (--prune deletes them)")
+                changes.deletes = []
+            elif changes.deletes:
+                print(f"   deleting {len(changes.deletes)} players of {len(team_ids)} teams missing from the source")
+            apply_changes(conn, table, changes, fields)
+    finally:
+        f.close()
+
+    if changes:
+        bump_data_version()
+    elapsed = time.perf_counter() - started
+    print(f"✅ Incremental player import from {csv_path} ({fmt} format)")
+    print(f"   {changes.summary()}, skipped={sum(skipped.values())} {skipped or ''} ({elapsed:.2f}s)")
+    return changes
+
+
+def debug_preview(csv_path: Path = DATA_FILE, n: int = 5):
+    print("CSV file:", csv_path)
+    if not csv_path.exists():
         print("❌ file missing")
         return
-    with DATA_FILE.open(newline="", encoding="utf-8-sig") as f:
-        reader = csv.DictReader(f, delimiter="\t")
-        print("Headers:", reader.fieldnames)
+    f, fmt, reader = open_roster(csv_path)
+    with f:
+        print("Format:", fmt, "Headers:", reader.fieldnames)
         for i, row in enumerate(reader):
             if i >= n:
                 break
@@ -153,5 +267,19 @@ def debug_preview(n: int = 5):
 
 
 if __name__ == "__main__":
-    debug_preview()
-    import_players(reset=True)
+    parser = argparse.ArgumentParser(description="Import a roster CSV (either layout) into players")
+    parser.add_argument("csv", nargs="?", default=str(DATA_FILE))
+    parser.add_argument("--keep", action="store_true", help="upsert into the existing table instead of clearing it")
+    parser.add_argument("--incremental", action="store_true", help="write only players whose row changed")
+    parser.add_argument(
+        "--prune",
+        action="store_true",
+        help="--incremental: delete stored players of the file's teams that the file does not list",
+    )
+    args = parser.parse_args()
+
+    debug_preview(Path(args.csv))
+    if args.incremental:
+        import_players_incremental(csv_path=Path(args.csv), prune=args.prune)
+    else:
+        import_players(reset=not args.keep, csv_path=Path(args.csv))
@@ -0,0 +1,149 @@
+# backend/scripts/import_sina_standings.py
+"""
+把新浪积分榜（sina_epl_crawler.fetch_epl_standings）直接写入 team_season_stats。
+
+新浪的队名（team_cn）/ 球队 id 通过持久化的 team_aliases 表映射到 teams.id；
+整季数据在一个事务里 upsert，只有内容变化时才写库并 bump 数据版本，
+所以比赛日可以每隔几分钟跑一次（--interval）。
+"""
+import argparse
+import json
+import sys
+import time
+from pathlib import Path
+
+from sqlalchemy import select
+from sqlalchemy.dialects.sqlite import insert as sqlite_insert
+
+# Allow running this file directly: add project root to sys.path
+PROJECT_ROOT = Path(__file__).resolve().parents[2]
+if str(PROJECT_ROOT) not in sys.path:
+    sys.path.insert(0, str(PROJECT_ROOT))
+
+from backend.core.db import Base, engine, bump_data_version, ensure_indexes, ensure_search_index
+from backend.core.db.models import Season, TeamSeasonStats
+from backend.core.db.sync import diff_rows, load_fingerprints
+from backend.core.db.team_names import SINA_TEAM_NAMES, TeamAliasMap, TeamNameResolver
+from sina_epl_crawler import fetch_epl_standings, make_sina_session, season_end_year
+
+SOURCE = "sina"
+STAT_FIELDS = ("position", "played", "won", "drawn", "lost", "gf", "ga", "gd", "points")
+
+
+def to_int(x, default: int = 0) -> int:
+    try:
+        return int(str(x).strip())
+    except Exception:
+        return default
+
+
+def get_or_create_season_id(conn, end_year: int) -> int:
+    season_id = conn.execute(select(Season.id).where(Season.end_year == end_year)).scalar()
+    if season_id is None:
+        season_id = conn.execute(
+            Season.__table__.insert().values(end_year=end_year, name=f"{end_year-1}-{end_year}")
+        ).inserted_primary_key[0]
+    return season_id
+
+
+def ingest_standings(standings, sina_season: int):
+    """
+    upsert 一个赛季的积分榜。返回 (ChangeSet, 未能映射的队名列表)。
+    不删除行：接口偶尔少返回一支球队时不应把它从榜单里抹掉。
+    """
+    Base.metadata.create_all(engine)
+    ensure_indexes(engine)
+    ensure_search_index(engine)
+
+    table = TeamSeasonStats.__table__
+    fields = STAT_FIELDS + ("notes",)
+    unmapped = []
+    with engine.begin() as conn:
+        aliases = TeamAliasMap.load(conn, SOURCE, seed=SINA_TEAM_NAMES)
+        season_id = get_or_create_season_id(conn, season_end_year(sina_season))
+
+        incoming = {}
+        for row in standings:
+            team_id = aliases.resolve(conn, row.get("team_name") or "", row.get("team_id"), row.get("team_en") or "")
+            if team_id is None:
+                unmapped.append(row.get("team_name"))
+                continue
+            gf, ga = to_int(row.get("goals_for")), to_int(row.get("goals_against"))
+            incoming[(season_id, team_id)] = dict(
+                season_id=season_id,
+                team_id=team_id,
+                position=to_int(row.get("rank")),
+                played=to_int(row.get("played")),
+                won=to_int(row.get("win")),
+                drawn=to_int(row.get("draw")),
+                lost=to_int(row.get("lose")),
+                gf=gf,
+                ga=ga,
+                gd=to_int(row.get("goal_diff"), gf - ga),
+                points=to_int(row.get("points")),
+                notes=None,
+            )
+
+        stored = load_fingerprints(conn, table, ("season_id", "team_id"), fields, where=table.c.season_id == season_id)
+        changes = diff_rows(stored, incoming.items(), fields)
+        changes.deletes = []
+        rows = changes.inserts + [{k: v for k, v in row.items() if k != "_id"} for row in changes.updates]
+        if rows:
+            stmt = sqlite_insert(table)
+            stmt = stmt.on_conflict_do_update(
+                index_elements=[table.c.season_id, table.c.team_id],
+                set_={col: stmt.excluded[col] for col in fields},
+            )
+            conn.execute(stmt, rows)
+
+    if changes:
+        bump_data_version()
+    return changes, unmapped
+
+
+def add_alias(raw: str):
+    """--alias "曼联=Manchester United"：手动补一条映射。"""
+    name, _, team_name = raw.partition("=")
+    with engine.begin() as conn:
+        aliases = TeamAliasMap.load(conn, SOURCE)
+        team_id = TeamNameResolver.load(conn).resolve(team_name)
+        if team_id is None:
+            raise SystemExit(f"❌ team not found: {team_name}")
+        aliases.remember(conn, name.strip(), None, team_id)
+    print(f"✅ alias {SOURCE}:{name.strip()} -> {team_name} (team_id={team_id})")
+
+
+def run_once(season: int, from_file=None, session=None):
+    if from_file:
+        with open(from_file, encoding="utf-8") as f:
+            standings = json.load(f)
+    else:
+        standings = fetch_epl_standings(season=season, session=session)
+    started = time.perf_counter()
+    changes, unmapped = ingest_standings(standings, season)
+    print(f"✅ Sina {season}/{(season + 1) % 100:02d}: {changes.summary()} ({time.perf_counter() - started:.2f}s)")
+    if unmapped:
+        print(f"⚠️ 未映射的球队（用 --alias 补充）: {', '.join(map(str, unmapped))}")
+
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description="Load Sina live standings into team_season_stats")
+    parser.add_argument("--season", type=int, default=2025, help="新浪赛季参数，2025 = 2025/26")
+    parser.add_argument("--from-file", help="读取已保存的 data/epl_standings_{season}.json 而不是请求接口")
+    parser.add_argument("--interval", type=float, default=0, help="每隔多少秒刷新一次（0 = 只跑一次）")
+    parser.add_argument("--alias", action="append", default=[], help='手动映射，如 "曼联=Manchester United"')
+    args = parser.parse_args()
+
+    for raw in args.alias:
+        add_alias(raw)
+    session = None if args.from_file else make_sina_session()
+    while True:
+        try:
+            run_once(args.season, args.from_file, session)
+        except Exception as e:
+            if not args.interval:
+                raise
+            print("❌ Sina ingest failed:", e)
+        if not args.interval:
+            break
+        time.sleep(args.interval)
@@ -1,17 +1,21 @@
 # backend/scripts/import_tables.py
+import argparse
 import csv
 import sys
+import time
 from pathlib import Path
 
 from sqlalchemy import select, delete
+from sqlalchemy.dialects.sqlite import insert as sqlite_insert
 
 # Allow running this file directly: add project root to sys.path
 PROJECT_ROOT = Path(__file__).resolve().parents[2]
 if str(PROJECT_ROOT) not in sys.path:
     sys.path.insert(0, str(PROJECT_ROOT))
 
-from backend.core.db import Base, SessionLocal, engine
+from backend.core.db import Base, SessionLocal, engine, bump_data_version, ensure_indexes, ensure_search_index
 from backend.core.db.models import Season, Team, TeamSeasonStats  # ✅ 建议从 models 导入，避免 core.db 未导出时报错
+from backend.core.db.sync import apply_changes, diff_rows, load_fingerprints
 
 # ✅ CSV 实际在 backend/data 目录
 DATA_FILE = (
@@ -72,6 +76,8 @@ def import_csv(reset_stats: bool = True):
     if not DATA_FILE.exists():
         raise FileNotFoundError(f"CSV not found: {DATA_FILE}")
 
+    ensure_indexes(engine)
+    ensure_search_index(engine)  # 触发器随导入同步维护 team_search
     session = SessionLocal()
     inserted, updated, skipped = 0, 0, 0
 
@@ -133,6 +139,7 @@ def import_csv(reset_stats: bool = True):
                     print(f"... committed {inserted+updated} rows")
 
         session.commit()
+        bump_data_version()
         print(f"✅ Imported from {DATA_FILE}")
         print(f"   inserted={inserted}, updated={updated}, skipped={skipped}")
 
@@ -145,6 +152,146 @@ def import_csv(reset_stats: bool = True):
 
 
 
+STAT_FIELDS = ("position", "played", "won", "drawn", "lost", "gf", "ga", "gd", "points")
+BULK_BATCH_SIZE = 2000
+
+
+def _stats_payload(row) -> dict:
+    gf, ga = to_int(row.get("gf"), 0), to_int(row.get("ga"), 0)
+    payload = {field: to_int(row.get(field), 0) for field in STAT_FIELDS}
+    payload["gd"] = to_int(row.get("gd"), gf - ga)
+    payload["notes"] = None
+    return payload
+
+
+def iter_stats_rows(conn, csv_path: Path):
+    """
+    流式读取 CSV，产出 ((season_id, team_id), 参数)；无效行产出 (None, None)。
+    season/team 先整体载入字典，CSV 中新出现的才逐个插入。
+    """
+    seasons = dict(conn.execute(select(Season.end_year, Season.id)).all())
+    teams = dict(conn.execute(select(Team.name, Team.id)).all())
+    with Path(csv_path).open(newline="", encoding="utf-8-sig") as f:
+        for row in csv.DictReader(f):
+            if not row or not row.get("season_end_year") or not row.get("team"):
+                yield None, None
+                continue
+            end_year = to_int(row["season_end_year"], default=-1)
+            team_name = row["team"].strip()
+            if end_year <= 0 or not team_name:
+                yield None, None
+                continue
+
+            season_id = seasons.get(end_year)
+            if season_id is None:
+                season_id = conn.execute(
+                    Season.__table__.insert().values(end_year=end_year, name=f"{end_year-1}-{end_year}")
+                ).inserted_primary_key[0]
+                seasons[end_year] = season_id
+            team_id = teams.get(team_name)
+            if team_id is None:
+                team_id = conn.execute(Team.__table__.insert().values(name=team_name)).inserted_primary_key[0]
+                teams[team_name] = team_id
+
+            yield (season_id, team_id), dict(season_id=season_id, team_id=team_id, **_stats_payload(row))
+
+
+def import_csv_bulk(reset_stats: bool = True, csv_path: Path = DATA_FILE, batch_size: int = BULK_BATCH_SIZE):
+    """
+    批量导入：流式读取 CSV，season/team 先整体载入字典，
+    统计行用 INSERT ... ON CONFLICT(season_id, team_id) DO UPDATE 分批写入，全程一个事务。
+    """
+    csv_path = Path(csv_path)
+    if not csv_path.exists():
+        raise FileNotFoundError(f"CSV not found: {csv_path}")
+
+    Base.metadata.create_all(engine)
+    ensure_indexes(engine)
+    ensure_search_index(engine)
+
+    table = TeamSeasonStats.__table__
+    stmt = sqlite_insert(table)
+    stmt = stmt.on_conflict_do_update(
+        index_elements=[table.c.season_id, table.c.team_id],
+        set_={col: stmt.excluded[col] for col in STAT_FIELDS + ("notes",)},
+    )
+
+    started = time.perf_counter()
+    inserted, updated, skipped = 0, 0, 0
+    with engine.begin() as conn:
+        if reset_stats:
+            conn.execute(delete(TeamSeasonStats))
+        existing = set(conn.execute(select(TeamSeasonStats.season_id, TeamSeasonStats.team_id)).all())
+
+        batch = {}  # (season_id, team_id) -> params；同一批内重复行以最后一行为准
+
+        def flush():
+            if batch:
+                conn.execute(stmt, list(batch.values()))
+                batch.clear()
+
+        for key, params in iter_stats_rows(conn, csv_path):
+            if key is None:
+                skipped += 1
+                continue
+            if key in existing:
+                updated += 1
+            else:
+                existing.add(key)
+                inserted += 1
+            batch[key] = params
+            if len(batch) >= batch_size:
+                flush()
+        flush()
+
+    bump_data_version()
+    elapsed = time.perf_counter() - started
+    rows = inserted + updated
+    print(f"✅ Bulk imported from {csv_path}")
+    print(f"   inserted={inserted}, updated={updated}, skipped={skipped}")
+    print(f"   {rows} rows in {elapsed:.2f}s ({rows / elapsed if elapsed else 0:.0f} rows/sec)")
+    return inserted, updated, skipped
+
+
+def import_csv_incremental(csv_path: Path = DATA_FILE):
+    """
+    增量导入：不清表。每行按内容指纹与库中现有行比较，只写入新增/变化的行，
+    并删除 CSV 覆盖的赛季中已不存在的行；全程一个事务，读者不会看到空表。
+    """
+    csv_path = Path(csv_path)
+    if not csv_path.exists():
+        raise FileNotFoundError(f"CSV not found: {csv_path}")
+
+    Base.metadata.create_all(engine)
+    ensure_indexes(engine)
+    ensure_search_index(engine)
+
+    table = TeamSeasonStats.__table__
+    fields = STAT_FIELDS + ("notes",)
+    started = time.perf_counter()
+    skipped = 0
+    with engine.begin() as conn:
+        incoming = {}  # 重复行以最后一行为准
+        for key, params in iter_stats_rows(conn, csv_path):
+            if key is None:
+                skipped += 1
+            else:
+                incoming[key] = params
+        season_ids = {season_id for season_id, _ in incoming}
+        stored = load_fingerprints(
+            conn, table, ("season_id", "team_id"), fields, where=table.c.season_id.in_(season_ids)
+        )
+        changes = diff_rows(stored, incoming.items(), fields)
+        apply_changes(conn, table, changes, fields)
+
+    if changes:
+        bump_data_version()
+    elapsed = time.perf_counter() - started
+    print(f"✅ Incremental import from {csv_path}")
+    print(f"   {changes.summary()}, skipped={skipped} ({elapsed:.2f}s)")
+    return changes
+
+
 def debug_preview_csv(n: int = 5):
     """
     调试用：打印 CSV 路径、表头、前 n 行内容
@@ -173,8 +320,20 @@ def debug_preview_csv(n: int = 5):
 
 
 if __name__ == "__main__":
-    # 先看看 CSV 到底读到了什么
-    debug_preview_csv(n=5)
-
-    # 再真正导入（确认没问题后）
-    import_csv(reset_stats=True)
+    parser = argparse.ArgumentParser(description="Import Premier League tables CSV")
+    parser.add_argument("csv", nargs="?", default=str(DATA_FILE), help="CSV path (--bulk / --incremental)")
+    parser.add_argument("--bulk", action="store_true", help="set-based upsert in one transaction")
+    parser.add_argument("--keep-stats", action="store_true", help="do not clear team_season_stats first")
+    parser.add_argument("--incremental", action="store_true", help="write only rows whose content changed")
+    args = parser.parse_args()
+
+    if args.incremental:
+        import_csv_incremental(csv_path=Path(args.csv))
+    elif args.bulk:
+        import_csv_bulk(reset_stats=not args.keep_stats, csv_path=Path(args.csv))
+    else:
+        # 先看看 CSV 到底读到了什么
+        debug_preview_csv(n=5)
+
+        # 再真正导入（确认没问题后）
+        import_csv(reset_stats=not args.keep_stats)
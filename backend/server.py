@@ -2,89 +2,114 @@
 import secrets
 import os
 import json
+import functools
 from pathlib import Path
 from datetime import datetime
 
 from flask import Flask, jsonify, request, session, redirect, url_for, render_template
+from flask import g, has_app_context
 from flask import send_from_directory
-from sqlalchemy import or_, func
+from sqlalchemy import event, or_, func
 from sqlalchemy.exc import IntegrityError
 from werkzeug.security import generate_password_hash, check_password_hash
-
-from core.db import SessionLocal
+from werkzeug.serving import is_running_from_reloader
+
+from core.db import (
+    SessionLocal,
+    engine,
+    bump_data_version,
+    current_data_version,
+    data_version_updated_at,
+    ensure_indexes,
+    search_player_ids,
+    search_team_ids,
+)
 from core.db.models import User, Season, Team, TeamSeasonStats, Player
+from core.auth import UserCache, create_token_store
+from core.cache import NameIndexStore, RenderCache, STANDINGS_SORT_TYPES, StandingsStore, TEAM_SERIES
 
 BASE_DIR = Path(__file__).resolve().parent
 app = Flask(__name__, template_folder=str(BASE_DIR / "templates"))
 app.secret_key = os.environ.get("SOCCER_SEEKER_SECRET", secrets.token_hex(16))
 
-# Matplotlib球队历年数据图片API
+# Matplotlib球队历年数据图片API：渲染在独立进程池中完成，请求线程只等待结果
 import io
-import matplotlib
-matplotlib.rcParams['font.sans-serif'] = ['SimHei']  # 指定为黑体
-matplotlib.rcParams['axes.unicode_minus'] = False    # 负号正常显示
-matplotlib.use('Agg')
-import matplotlib.pyplot as plt
-from matplotlib.ticker import MaxNLocator
 from flask import send_file
+from core.charts import RenderPool, RenderTimeout, TEAM_HISTORY_FIGSIZE, render_team_history_png
+
+
+@functools.lru_cache(maxsize=None)
+def get_render_pool() -> RenderPool:
+    """Created on first use, so importing this module never starts render workers."""
+    return RenderPool(
+        workers=int(os.environ.get("SOCCER_SEEKER_RENDER_WORKERS", min(4, os.cpu_count() or 1))),
+        timeout=float(os.environ.get("SOCCER_SEEKER_RENDER_TIMEOUT", 10)),
+    )
+
+
+# 渲染结果缓存：内存 LRU + 磁盘，键为 (球队, 数据版本, 图表参数)
+@functools.lru_cache(maxsize=None)
+def get_plot_cache() -> RenderCache:
+    return RenderCache(
+        BASE_DIR / "cache" / "plots",
+        max_items=int(os.environ.get("SOCCER_SEEKER_PLOT_CACHE_ITEMS", 64)),
+        max_disk_bytes=int(os.environ.get("SOCCER_SEEKER_PLOT_CACHE_BYTES", 64 * 1024 * 1024)),
+    )
+
+TEAM_STATS_PLOT_PARAMS = {"chart": "team_history", "figsize": TEAM_HISTORY_FIGSIZE, "format": "png"}
+
+# 积分榜快照：所有赛季一次载入内存，数据版本变化时整体替换
+STANDINGS = StandingsStore(SessionLocal)
+# typo/accent tolerant matcher behind ?fuzzy=1 on the search APIs
+NAME_INDEX = NameIndexStore(SessionLocal)
+
+
+def _mark_data_changed(team_id=None):
+    """Call after an admin write commits: bump the data version and drop stale renders."""
+    version = bump_data_version()
+    TEAM_SERIES.apply_change(version, team_id)
+    if team_id is not None:
+        get_plot_cache().invalidate(f"team{team_id}")
+
+
 @app.route('/api/team_stats_plot')
 def team_stats_plot():
     token = request.args.get('token') or request.headers.get('Authorization', '').replace('Bearer ', '')
-    user = get_auth_user()
-    user_id = TOKENS.get(token) if token else None
-    if not user_id and user:
-        user_id = user.id
+    user_id = (TOKENS.get(token) if token else None) or _auth_user_id()
     if not user_id:
         return {'error': 'missing or invalid token'}, 401
-    session = SessionLocal()
-    try:
-        user = session.query(User).get(user_id)
-        if not user or user.role not in ("vip_user", "admin"):
-            return {'error': 'vip access required'}, 403
-        team_name = request.args.get('team_name')
-        if not team_name:
-            return {'error': 'team_name required'}, 400
-        team = session.query(Team).filter_by(name=team_name).first()
-        if not team:
-            return {'error': 'team not found'}, 404
-        stats = (
-            session.query(TeamSeasonStats, Season)
-            .join(Season, TeamSeasonStats.season_id == Season.id)
-            .filter(TeamSeasonStats.team_id == team.id)
-            .order_by(Season.end_year.asc())
-            .all()
-        )
-        if not stats:
+    user = USER_CACHE.get(user_id, _load_user)
+    if not user or user.role not in ("vip_user", "admin"):
+        return {'error': 'vip access required'}, 403
+    team_name = request.args.get('team_name')
+    if not team_name:
+        return {'error': 'team_name required'}, 400
+    series = TEAM_SERIES.get_by_name(team_name)
+    if not series:
+        return {'error': 'team not found'}, 404
+    cache_key = RenderCache.make_key(
+        f"team{series.team_id}",
+        current_data_version(),
+        dict(TEAM_STATS_PLOT_PARAMS, team_name=series.team_name),
+    )
+    png = get_plot_cache().get(cache_key)
+    if png is None:
+        if not len(series):
             return {'error': 'no data'}, 404
-        seasons = [season.end_year for _, season in stats]
-        ranks = [st.position for st, _ in stats]
-        gf = [st.gf for st, _ in stats]
-        ga = [st.ga for st, _ in stats]
-        gd = [st.gd for st, _ in stats]
-        fig, (ax1, ax2) = plt.subplots(2, 1, figsize=(8, 8))
-        ax1.plot(seasons, ranks, marker='o', color='#1976d2', linewidth=2, label='排名')
-        ax1.set_title(f'{team_name} 历年排名')
-        ax1.set_xlabel('赛季')
-        ax1.set_ylabel('排名')
-        ax1.invert_yaxis()
-        ax1.yaxis.set_major_locator(MaxNLocator(integer=True))
-        ax1.grid(True, linestyle='--', alpha=0.5)
-        ax2.plot(seasons, gf, marker='o', color='#43a047', label='进球')
-        ax2.plot(seasons, ga, marker='o', color='#e53935', label='失球')
-        ax2.plot(seasons, gd, marker='o', color='#fbc02d', label='净胜球')
-        ax2.set_title(f'{team_name} 历年进球/失球/净胜球')
-        ax2.set_xlabel('赛季')
-        ax2.set_ylabel('数量')
-        ax2.legend()
-        ax2.grid(True, linestyle='--', alpha=0.5)
-        plt.tight_layout()
-        buf = io.BytesIO()
-        plt.savefig(buf, format='png')
-        plt.close(fig)
-        buf.seek(0)
-        return send_file(buf, mimetype='image/png')
-    finally:
-        session.close()
+        try:
+            png = get_render_pool().submit(
+                render_team_history_png,
+                series.team_name,
+                series.season_years.tolist(),
+                series.position.tolist(),
+                series.gf.tolist(),
+                series.ga.tolist(),
+                series.gd.tolist(),
+            )
+        except RenderTimeout:
+            return {'error': 'chart rendering timed out'}, 503
+        get_plot_cache().put(cache_key, png)
+    return send_file(io.BytesIO(png), mimetype='image/png')
 BASE_DIR = Path(__file__).resolve().parent
 AVATAR_DIR = BASE_DIR / "uploads" / "avatars"
 AVATAR_DIR.mkdir(parents=True, exist_ok=True)
@@ -107,6 +132,57 @@ def get_players_for_team(session, team_id: int):
     return result
 
 
+def search_players(session, keyword: str, limit=None, fuzzy: bool = False):
+    """
+    (Player, Team) rows whose name contains keyword; FTS-ranked, ILIKE for short
+    keywords. fuzzy=True ranks by the in-memory typo/accent tolerant matcher instead.
+    """
+    if fuzzy:
+        ids = [pid for pid, _ in NAME_INDEX.players().search(keyword, limit or 50)]
+    else:
+        ids = search_player_ids(session, keyword, limit)
+    q = session.query(Player, Team).join(Team, Player.team_id == Team.id)
+    if ids is None:
+        like = f"%{keyword}%"
+        q = q.filter(
+            or_(
+                Player.first_name.ilike(like),
+                Player.last_name.ilike(like),
+                (Player.first_name + " " + Player.last_name).ilike(like),
+            )
+        ).order_by(Player.last_name.asc(), Player.first_name.asc())
+        return (q.limit(limit) if limit else q).all()
+    rank = {pid: i for i, pid in enumerate(ids)}
+    return sorted(q.filter(Player.id.in_(ids)).all(), key=lambda r: rank[r[0].id])
+
+
+def search_teams(session, keyword: str, season_id=None, limit=None, fuzzy: bool = False):
+    """
+    Teams whose name contains keyword, best match first. With season_id, returns
+    (TeamSeasonStats, Team) rows limited to teams that played that season.
+    """
+    if fuzzy:
+        index = NAME_INDEX.teams()
+        ids = [tid for tid, _ in index.search(keyword, len(index))]
+    else:
+        ids = search_team_ids(session, keyword)
+    if season_id is None:
+        q = session.query(Team)
+    else:
+        q = (
+            session.query(TeamSeasonStats, Team)
+            .join(Team, TeamSeasonStats.team_id == Team.id)
+            .filter(TeamSeasonStats.season_id == season_id)
+        )
+    if ids is None:
+        q = q.filter(Team.name.ilike(f"%{keyword}%")).order_by(Team.name.asc())
+        return (q.limit(limit) if limit else q).all()
+    rank = {tid: i for i, tid in enumerate(ids)}
+    team_of = (lambda r: r) if season_id is None else (lambda r: r[1])
+    rows = sorted(q.filter(Team.id.in_(ids)).all(), key=lambda r: rank[team_of(r).id])
+    return rows[:limit] if limit else rows
+
+
 def serialize_player(p: Player):
     """Serialize a Player ORM object to dict."""
     return {
@@ -185,38 +261,124 @@ def build_narrative(team_name: str, season_year: int, metrics: dict) -> str:
         f"{tendency}模型 {abs(delta)} 分；{tone}"
     )
 
-# Simple in-memory token store: token -> user_id
-TOKENS = {}
-
-
-def get_auth_user(return_session: bool = False):
+def _conditional_get(private: bool = False):
     """
-    Resolve current user from session or Authorization header.
-    Returns None if missing/invalid.
-    When return_session=True, returns (user, session) and caller must close.
+    Conditional GET against the global data version.
+    Returns (304 response or None, header-setter for the eventual 200 response).
+    """
+    version = current_data_version()
+    etag = f"dv-{version}"
+    last_modified = data_version_updated_at()
+    cache_control = "private, no-cache" if private else "no-cache"
+
+    def add_headers(resp):
+        if resp.status_code in (200, 304):
+            resp.set_etag(etag)
+            resp.last_modified = last_modified
+            resp.headers["Cache-Control"] = cache_control
+        return resp
+
+    fresh = False
+    if request.if_none_match:
+        fresh = request.if_none_match.contains_weak(etag)
+    elif request.if_modified_since and last_modified:
+        fresh = request.if_modified_since.replace(tzinfo=None) >= last_modified
+    if fresh:
+        return add_headers(app.response_class(status=304)), add_headers
+    return None, add_headers
+
+
+def data_versioned(view):
+    """Read-only views whose body only changes through admin writes: ETag / 304 support."""
+    @functools.wraps(view)
+    def wrapper(*args, **kwargs):
+        not_modified, add_headers = _conditional_get()
+        if not_modified is not None:
+            return not_modified
+        return add_headers(app.make_response(view(*args, **kwargs)))
+    return wrapper
+
+
+# Token store: token -> user_id, with expiry + LRU bound; memory or shared SQLite backend
+TOKENS = create_token_store(BASE_DIR / "soccer_seeker_tokens.db")
+
+# 已登录用户的身份缓存 (id, role, name)：角色变更 / 删号 / 改密码时显式失效
+USER_CACHE = UserCache(ttl=float(os.environ.get("SOCCER_SEEKER_USER_CACHE_TTL", 30)))
+
+
+def get_db():
+    """
+    Request-scoped SQLAlchemy session: created lazily on first use, shared by every
+    helper that runs during the request, and closed in teardown.
     """
+    if "db" not in g:
+        g.db = SessionLocal()
+    return g.db
+
+
+@app.teardown_appcontext
+def _close_db(exc):
+    db = g.pop("db", None)
+    if db is not None:
+        if exc is not None:
+            db.rollback()
+        db.close()
+
+
+@event.listens_for(engine, "checkout")
+def _count_db_checkout(dbapi_conn, conn_record, conn_proxy):
+    """Per-request count of pool checkouts (exposed as X-DB-Checkouts)."""
+    if has_app_context():
+        g.db_checkouts = g.get("db_checkouts", 0) + 1
+
+
+@app.after_request
+def _report_db_checkouts(resp):
+    resp.headers["X-DB-Checkouts"] = str(g.get("db_checkouts", 0))
+    return resp
+
+
+def _auth_user_id():
+    """User id from the form-login session or the Bearer token, else None."""
     # Session-based auth (server-rendered forms)
     if session.get("user_id"):
-        db = SessionLocal()
-        user = db.query(User).get(session["user_id"])
-        if return_session:
-            return user, db
-        db.close()
-        return user
+        return session["user_id"]
     # Token-based auth (API)
     auth = request.headers.get("Authorization", "")
     if not auth.startswith("Bearer "):
         return None
     token = auth.split(None, 1)[1]
-    user_id = TOKENS.get(token)
+    return TOKENS.get(token)
+
+
+def _load_user(user_id):
+    return get_db().get(User, user_id)
+
+
+def get_auth_identity():
+    """
+    Cached (id, role, name) of the current user, or None.
+    Enough for role gating and templates; served without a DB hit in the common case.
+    """
+    user_id = _auth_user_id()
+    if not user_id:
+        return None
+    return USER_CACHE.get(user_id, _load_user)
+
+
+def get_auth_user(return_session: bool = False):
+    """
+    Resolve current user (ORM object) from session or Authorization header.
+    Returns None if missing/invalid.
+    When return_session=True, returns (user, session); the session is the
+    request-scoped one and is closed in teardown.
+    """
+    user_id = _auth_user_id()
     if not user_id:
         return None
-    db = SessionLocal()
-    user = db.query(User).get(user_id)
-    if return_session:
-        return user, db
-    db.close()
-    return user
+    db = get_db()
+    user = db.get(User, user_id)
+    return (user, db) if return_session else user
 
 
 def verify_password(stored: str, provided: str) -> bool:
@@ -238,62 +400,46 @@ def verify_password(stored: str, provided: str) -> bool:
 def require_admin_session():
     """
     Ensure the requester is an admin.
-    Returns (user, session, error_response_or_None).
-    Caller must close session when error_response is None.
+    Returns (identity, session, error_response_or_None); session is request-scoped.
     """
-    auth = get_auth_user(return_session=True)
-    if not auth:
+    if not _auth_user_id():
         return None, None, (jsonify({"error": "missing or invalid token"}), 401)
-    user, session = auth
+    user = get_auth_identity()
     if not user or user.role != "admin":
-        session.close()
         return None, None, (jsonify({"error": "admin access required"}), 403)
-    return user, session, None
+    return user, get_db(), None
 
 
 @app.route("/api/search/player", methods=["GET"])
 def api_search_player():
-    """Fuzzy search player by name (case-insensitive)."""
+    """
+    Fuzzy search player by name (case-insensitive, ranked by FTS relevance).
+    fuzzy=1 tolerates typos and accents ("Odegard" -> "Ødegaard").
+    """
     keyword = (request.args.get("q") or "").strip()
     limit = request.args.get("limit", type=int) or 10
     limit = max(1, min(limit, 50))
     if not keyword:
         return jsonify({"error": "missing q"}), 400
 
-    pattern = f"%{keyword}%"
-    session = SessionLocal()
-    try:
-        rows = (
-            session.query(Player, Team)
-            .join(Team, Player.team_id == Team.id)
-            .filter(
-                or_(
-                    Player.first_name.ilike(pattern),
-                    Player.last_name.ilike(pattern),
-                    (Player.first_name + " " + Player.last_name).ilike(pattern),
-                )
-            )
-            .order_by(Player.last_name.asc(), Player.first_name.asc())
-            .limit(limit)
-            .all()
+    fuzzy = request.args.get("fuzzy") == "1"
+    session = get_db()
+    rows = search_players(session, keyword, limit, fuzzy=fuzzy)
+    results = []
+    for player, team in rows:
+        results.append(
+            {
+                "id": player.id,
+                "first_name": player.first_name,
+                "last_name": player.last_name,
+                "shirt_no": player.shirt_no,
+                "birth_date": player.birth_date.isoformat() if player.birth_date else None,
+                "position": player.position,
+                "team_id": team.id,
+                "team_name": team.name,
+            }
         )
-        results = []
-        for player, team in rows:
-            results.append(
-                {
-                    "id": player.id,
-                    "first_name": player.first_name,
-                    "last_name": player.last_name,
-                    "shirt_no": player.shirt_no,
-                    "birth_date": player.birth_date.isoformat() if player.birth_date else None,
-                    "position": player.position,
-                    "team_id": team.id,
-                    "team_name": team.name,
-                }
-            )
-        return jsonify({"count": len(results), "results": results})
-    finally:
-        session.close()
+    return jsonify({"count": len(results), "results": results})
 
 
 @app.route("/api/player_profile", methods=["GET"])
@@ -306,20 +452,17 @@ def api_player_profile():
     player_id = request.args.get("player_id", type=int)
     if not player_id:
         return jsonify({"error": "missing player_id"}), 400
-    session = SessionLocal()
-    try:
-        player = session.query(Player).get(player_id)
-        if not player:
-            return jsonify({"error": "player not found"}), 404
-        team = session.query(Team).get(player.team_id) if player.team_id else None
-        payload = serialize_player(player)
-        payload.update({
-            "team_name": team.name if team else None,
-            "team_badge": f"/badges/{team.id}.png" if team else None,
-        })
-        return jsonify(payload)
-    finally:
-        session.close()
+    session = get_db()
+    player = session.query(Player).get(player_id)
+    if not player:
+        return jsonify({"error": "player not found"}), 404
+    team = session.query(Team).get(player.team_id) if player.team_id else None
+    payload = serialize_player(player)
+    payload.update({
+        "team_name": team.name if team else None,
+        "team_badge": f"/badges/{team.id}.png" if team else None,
+    })
+    return jsonify(payload)
 
 
 @app.route("/api/admin/users/role", methods=["POST"])
@@ -332,17 +475,14 @@ def api_admin_update_user_role():
     user_id = data.get("user_id")
     new_role = data.get("role")
     if not user_id or new_role not in ("user", "vip_user", "admin"):
-        session.close()
         return jsonify({"error": "user_id and valid role required"}), 400
-    try:
-        target = session.query(User).get(user_id)
-        if not target:
-            return jsonify({"error": "user not found"}), 404
-        target.role = new_role
-        session.commit()
-        return jsonify({"msg": "role updated", "user": {"id": target.id, "name": target.name, "role": target.role}})
-    finally:
-        session.close()
+    target = session.query(User).get(user_id)
+    if not target:
+        return jsonify({"error": "user not found"}), 404
+    target.role = new_role
+    session.commit()
+    USER_CACHE.invalidate(target.id)
+    return jsonify({"msg": "role updated", "user": {"id": target.id, "name": target.name, "role": target.role}})
 
 @app.route("/login", methods=["POST"])
 def login_form():
@@ -350,15 +490,12 @@ def login_form():
     password = request.form.get("password", "")
     if not email or not password:
         return redirect(url_for("home", error="邮箱和密码必填"))
-    db = SessionLocal()
-    try:
-        user = db.query(User).filter_by(email=email).first()
-        if not user or not verify_password(user.password, password):
-            return redirect(url_for("home", error="账号或密码错误"))
-        session["user_id"] = user.id
-        return redirect(url_for("home", msg="登录成功"))
-    finally:
-        db.close()
+    db = get_db()
+    user = db.query(User).filter_by(email=email).first()
+    if not user or not verify_password(user.password, password):
+        return redirect(url_for("home", error="账号或密码错误"))
+    session["user_id"] = user.id
+    return redirect(url_for("home", msg="登录成功"))
 
 
 @app.route("/register", methods=["POST"])
@@ -368,18 +505,15 @@ def register_form():
     password = request.form.get("password", "")
     if not (name and email and password):
         return redirect(url_for("home", error="姓名/邮箱/密码必填"))
-    db = SessionLocal()
-    try:
-        existing = db.query(User).filter_by(email=email).first()
-        if existing:
-            return redirect(url_for("home", error="邮箱已注册"))
-        user = User(name=name, email=email, password=generate_password_hash(password), role="user")
-        db.add(user)
-        db.commit()
-        session["user_id"] = user.id
-        return redirect(url_for("home", msg="注册并登录成功"))
-    finally:
-        db.close()
+    db = get_db()
+    existing = db.query(User).filter_by(email=email).first()
+    if existing:
+        return redirect(url_for("home", error="邮箱已注册"))
+    user = User(name=name, email=email, password=generate_password_hash(password), role="user")
+    db.add(user)
+    db.commit()
+    session["user_id"] = user.id
+    return redirect(url_for("home", msg="注册并登录成功"))
 
 
 @app.route("/logout", methods=["POST"])
@@ -390,123 +524,126 @@ def logout_form():
 
 @app.route("/admin", methods=["GET", "POST"])
 def admin_panel():
-    user = get_auth_user()
+    user = get_auth_identity()
     if not user or user.role != "admin":
         return redirect(url_for("home", error="需要管理员权限"))
-    db = SessionLocal()
+    db = get_db()
     msg = None
     error = None
-    try:
-        if request.method == "POST":
-            action = request.form.get("action")
-            try:
-                if action == "update_role":
-                    uid = request.form.get("user_id", type=int)
-                    role = request.form.get("role")
-                    if not uid or role not in ("user", "vip_user", "admin"):
-                        raise ValueError("user_id 和合法角色必填")
-                    target = db.query(User).get(uid)
-                    if not target:
-                        raise ValueError("用户不存在")
-                    target.role = role
-                    db.commit()
-                    msg = "角色已更新"
-                elif action == "create_team":
-                    name = (request.form.get("team_name") or "").strip()
-                    season_year = request.form.get("team_season", type=int)
-                    if not name:
-                        raise ValueError("球队名称必填")
-                    team = Team(name=name)
-                    db.add(team)
-                    db.commit()
-                    db.refresh(team)
-                    _create_default_stats_for_latest_season(db, team.id, season_year_override=season_year)
-                    db.commit()
-                    msg = "球队已创建"
-                elif action == "create_player":
-                    first = (request.form.get("player_first") or "").strip()
-                    last = (request.form.get("player_last") or "").strip()
-                    team_id = request.form.get("player_team", type=int)
-                    pos = (request.form.get("player_pos") or "").strip() or None
-                    shirt_no = _coerce_shirt_no(request.form.get("player_no"))
-                    if not (first and last and team_id):
-                        raise ValueError("球员信息不完整")
-                    team = db.query(Team).get(team_id)
-                    if not team:
-                        raise ValueError("球队不存在")
-                    conflict = _ensure_no_player_conflicts(db, team.id, first, last, shirt_no)
-                    if conflict:
-                        raise ValueError(conflict.get("error"))
-                    player = Player(
-                        first_name=first,
-                        last_name=last,
-                        team_id=team.id,
-                        position=pos,
-                        shirt_no=shirt_no,
-                        birth_date=None,
-                    )
-                    db.add(player)
-                    db.commit()
-                    msg = "球员已创建"
-                elif action == "update_stats":
-                    team_id = request.form.get("stats_team", type=int)
-                    season_year = request.form.get("stats_season", type=int)
-                    if not team_id or not season_year:
-                        raise ValueError("球队与赛季必填")
-                    team = db.query(Team).get(team_id)
-                    if not team:
-                        raise ValueError("球队不存在")
-                    season = _get_or_create_season(db, season_year)
-                    stats = db.query(TeamSeasonStats).filter_by(team_id=team.id, season_id=season.id).first()
-                    parsed = _parse_stats_payload(db, season.id, {
-                        "played": request.form.get("stats_played"),
-                        "won": request.form.get("stats_won"),
-                        "drawn": request.form.get("stats_drawn"),
-                        "lost": request.form.get("stats_lost"),
-                        "gf": request.form.get("stats_gf"),
-                        "ga": request.form.get("stats_ga"),
-                        "points": request.form.get("stats_points"),
-                        "position": request.form.get("stats_position"),
-                    })
-                    if not stats:
-                        stats = TeamSeasonStats(team_id=team.id, season_id=season.id, **parsed)
-                        db.add(stats)
-                    else:
-                        for k, v in parsed.items():
-                            setattr(stats, k, v)
-                    db.commit()
-                    msg = "赛季数据已更新"
-                elif action == "delete_team":
-                    team_id = request.form.get("delete_team", type=int)
-                    if not team_id:
-                        raise ValueError("请选择球队")
-                    team = db.query(Team).get(team_id)
-                    if not team:
-                        raise ValueError("球队不存在")
-                    db.delete(team)
-                    db.commit()
-                    msg = "球队已删除"
-                elif action == "delete_player":
-                    pid = request.form.get("delete_player_id", type=int)
-                    if not pid:
-                        raise ValueError("请输入球员ID")
-                    player = db.query(Player).get(pid)
-                    if not player:
-                        raise ValueError("球员不存在")
-                    db.delete(player)
-                    db.commit()
-                    msg = "球员已删除"
+    if request.method == "POST":
+        action = request.form.get("action")
+        try:
+            if action == "update_role":
+                uid = request.form.get("user_id", type=int)
+                role = request.form.get("role")
+                if not uid or role not in ("user", "vip_user", "admin"):
+                    raise ValueError("user_id 和合法角色必填")
+                target = db.query(User).get(uid)
+                if not target:
+                    raise ValueError("用户不存在")
+                target.role = role
+                db.commit()
+                USER_CACHE.invalidate(target.id)
+                msg = "角色已更新"
+            elif action == "create_team":
+                name = (request.form.get("team_name") or "").strip()
+                season_year = request.form.get("team_season", type=int)
+                if not name:
+                    raise ValueError("球队名称必填")
+                team = Team(name=name)
+                db.add(team)
+                db.commit()
+                db.refresh(team)
+                _create_default_stats_for_latest_season(db, team.id, season_year_override=season_year)
+                db.commit()
+                _mark_data_changed(team.id)
+                msg = "球队已创建"
+            elif action == "create_player":
+                first = (request.form.get("player_first") or "").strip()
+                last = (request.form.get("player_last") or "").strip()
+                team_id = request.form.get("player_team", type=int)
+                pos = (request.form.get("player_pos") or "").strip() or None
+                shirt_no = _coerce_shirt_no(request.form.get("player_no"))
+                if not (first and last and team_id):
+                    raise ValueError("球员信息不完整")
+                team = db.query(Team).get(team_id)
+                if not team:
+                    raise ValueError("球队不存在")
+                conflict = _ensure_no_player_conflicts(db, team.id, first, last, shirt_no)
+                if conflict:
+                    raise ValueError(conflict.get("error"))
+                player = Player(
+                    first_name=first,
+                    last_name=last,
+                    team_id=team.id,
+                    position=pos,
+                    shirt_no=shirt_no,
+                    birth_date=None,
+                )
+                db.add(player)
+                db.commit()
+                _mark_data_changed()
+                msg = "球员已创建"
+            elif action == "update_stats":
+                team_id = request.form.get("stats_team", type=int)
+                season_year = request.form.get("stats_season", type=int)
+                if not team_id or not season_year:
+                    raise ValueError("球队与赛季必填")
+                team = db.query(Team).get(team_id)
+                if not team:
+                    raise ValueError("球队不存在")
+                season = _get_or_create_season(db, season_year)
+                stats = db.query(TeamSeasonStats).filter_by(team_id=team.id, season_id=season.id).first()
+                parsed = _parse_stats_payload(db, season.id, {
+                    "played": request.form.get("stats_played"),
+                    "won": request.form.get("stats_won"),
+                    "drawn": request.form.get("stats_drawn"),
+                    "lost": request.form.get("stats_lost"),
+                    "gf": request.form.get("stats_gf"),
+                    "ga": request.form.get("stats_ga"),
+                    "points": request.form.get("stats_points"),
+                    "position": request.form.get("stats_position"),
+                })
+                if not stats:
+                    stats = TeamSeasonStats(team_id=team.id, season_id=season.id, **parsed)
+                    db.add(stats)
                 else:
-                    error = "未知操作"
-            except Exception as exc:
-                db.rollback()
-                error = str(exc)
-        users = db.query(User).order_by(User.id.asc()).all()
-        teams = db.query(Team).order_by(Team.name.asc()).all()
-        seasons = [s.end_year for s in db.query(Season).order_by(Season.end_year.desc()).all()]
-        return render_template("admin.html", user=user, users=users, teams=teams, seasons=seasons, msg=msg, error=error)
-    finally:
-        db.close()
+                    for k, v in parsed.items():
+                        setattr(stats, k, v)
+                db.commit()
+                _mark_data_changed(team.id)
+                msg = "赛季数据已更新"
+            elif action == "delete_team":
+                team_id = request.form.get("delete_team", type=int)
+                if not team_id:
+                    raise ValueError("请选择球队")
+                team = db.query(Team).get(team_id)
+                if not team:
+                    raise ValueError("球队不存在")
+                db.delete(team)
+                db.commit()
+                _mark_data_changed(team_id)
+                msg = "球队已删除"
+            elif action == "delete_player":
+                pid = request.form.get("delete_player_id", type=int)
+                if not pid:
+                    raise ValueError("请输入球员ID")
+                player = db.query(Player).get(pid)
+                if not player:
+                    raise ValueError("球员不存在")
+                db.delete(player)
+                db.commit()
+                _mark_data_changed()
+                msg = "球员已删除"
+            else:
+                error = "未知操作"
+        except Exception as exc:
+            db.rollback()
+            error = str(exc)
+    users = db.query(User).order_by(User.id.asc()).all()
+    teams = db.query(Team).order_by(Team.name.asc()).all()
+    seasons = [s.end_year for s in db.query(Season).order_by(Season.end_year.desc()).all()]
+    return render_template("admin.html", user=user, users=users, teams=teams, seasons=seasons, msg=msg, error=error)
 
 @app.route("/api/search/team", methods=["GET"])
 def api_search_team():
@@ -515,6 +652,7 @@ def api_search_team():
     Query params:
       - q: team name keyword (required)
       - season: end year (required)
+      - fuzzy: 1 to tolerate typos / abbreviations ("Man Utd")
     """
     keyword = (request.args.get("q") or "").strip()
     season_year = request.args.get("season", type=int)
@@ -525,36 +663,25 @@ def api_search_team():
     if not season_year:
         return jsonify({"error": "missing season"}), 400
 
-    session = SessionLocal()
-    try:
-        season = session.query(Season).filter_by(end_year=season_year).first()
-        if not season:
-            return jsonify({"error": f"season {season_year} not found"}), 404
-
-        pattern = f"%{keyword}%"
-        rows = (
-            session.query(TeamSeasonStats, Team)
-            .join(Team, TeamSeasonStats.team_id == Team.id)
-            .filter(TeamSeasonStats.season_id == season.id)
-            .filter(Team.name.ilike(pattern))
-            .order_by(Team.name.asc())
-            .limit(limit)
-            .all()
+    session = get_db()
+    season = session.query(Season).filter_by(end_year=season_year).first()
+    if not season:
+        return jsonify({"error": f"season {season_year} not found"}), 404
+
+    fuzzy = request.args.get("fuzzy") == "1"
+    rows = search_teams(session, keyword, season_id=season.id, limit=limit, fuzzy=fuzzy)
+    results = []
+    for stats_row, team in rows:
+        results.append(
+            {
+                "team_id": team.id,
+                "team": team.name,
+                "season": season_year,
+                "position": stats_row.position,
+                "points": stats_row.points,
+            }
         )
-        results = []
-        for stats_row, team in rows:
-            results.append(
-                {
-                    "team_id": team.id,
-                    "team": team.name,
-                    "season": season_year,
-                    "position": stats_row.position,
-                    "points": stats_row.points,
-                }
-            )
-        return jsonify({"season": season_year, "count": len(results), "results": results})
-    finally:
-        session.close()
+    return jsonify({"season": season_year, "count": len(results), "results": results})
 
 
 # 新增：球队历年数据API
@@ -564,7 +691,7 @@ def api_team_stats():
     查询参数：team_id 或 team_name（二选一，推荐用 team_id）
     返回该队所有赛季的排名、进球、失球、净胜球数据，按赛季升序排列
     """
-    user = get_auth_user()
+    user = get_auth_identity()
     if not user:
         return jsonify({"error": "missing or invalid token"}), 401
     if user.role not in ("vip_user", "admin"):
@@ -575,38 +702,25 @@ def api_team_stats():
     if not team_id and not team_name:
         return jsonify({"error": "missing team_id or team_name"}), 400
 
-    session = SessionLocal()
-    try:
-        if team_id:
-            team = session.query(Team).filter_by(id=team_id).first()
-        else:
-            team = session.query(Team).filter_by(name=team_name).first()
-        if not team:
-            return jsonify({"error": "team not found"}), 404
+    not_modified, add_headers = _conditional_get(private=True)
+    if not_modified is not None:
+        return not_modified
 
-        # 查找该队所有赛季的统计
-        stats = (
-            session.query(TeamSeasonStats, Season)
-            .join(Season, TeamSeasonStats.season_id == Season.id)
-            .filter(TeamSeasonStats.team_id == team.id)
-            .order_by(Season.end_year.asc())
-            .all()
+    # 球队时间序列常驻内存，无需 join 查询
+    series = TEAM_SERIES.get(team_id) if team_id else TEAM_SERIES.get_by_name(team_name)
+    if not series:
+        return jsonify({"error": "team not found"}), 404
+
+    result = [
+        {"season": season, "position": position, "gf": gf, "ga": ga, "gd": gd}
+        for season, position, gf, ga, gd in zip(
+            series.season_years, series.position, series.gf, series.ga, series.gd
         )
-        result = []
-        for st, season in stats:
-            result.append({
-                "season": season.end_year,
-                "position": st.position,
-                "gf": st.gf,
-                "ga": st.ga,
-                "gd": st.gd
-            })
-        return jsonify({
-            "team": team.name,
-            "stats": result
-        })
-    finally:
-        session.close()
+    ]
+    return add_headers(jsonify({
+        "team": series.team_name,
+        "stats": result
+    }))
 
 
 @app.route("/api/pro_metrics", methods=["GET"])
@@ -616,7 +730,7 @@ def api_pro_metrics():
     and return both metrics and a human-friendly step log.
     Query params: season (end_year, required) + team_id or team_name (one required).
     """
-    user = get_auth_user()
+    user = get_auth_identity()
     if not user:
         return jsonify({"error": "missing or invalid token"}), 401
     if user.role not in ("vip_user", "admin"):
@@ -630,58 +744,56 @@ def api_pro_metrics():
     if not team_id and not team_name:
         return jsonify({"error": "missing team_id or team_name"}), 400
 
-    session = SessionLocal()
-    try:
-        season = session.query(Season).filter_by(end_year=season_year).first()
-        if not season:
-            return jsonify({"error": f"season {season_year} not found"}), 404
+    session = get_db()
+    season = session.query(Season).filter_by(end_year=season_year).first()
+    if not season:
+        return jsonify({"error": f"season {season_year} not found"}), 404
 
-        team = (
-            session.query(Team).filter_by(id=team_id).first()
-            if team_id else session.query(Team).filter_by(name=team_name).first()
-        )
-        if not team:
-            return jsonify({"error": "team not found"}), 404
+    team = (
+        session.query(Team).filter_by(id=team_id).first()
+        if team_id else session.query(Team).filter_by(name=team_name).first()
+    )
+    if not team:
+        return jsonify({"error": "team not found"}), 404
 
-        stats_row = (
-            session.query(TeamSeasonStats)
-            .filter_by(team_id=team.id, season_id=season.id)
-            .first()
-        )
-        if not stats_row:
-            return jsonify({"error": "no stats for this team in the selected season"}), 404
-
-        metrics, log = calculate_pythagorean_metrics(
-            gf=stats_row.gf,
-            ga=stats_row.ga,
-            played=stats_row.played,
-            points=stats_row.points,
-        )
-        if not metrics:
-            return jsonify({"error": "unable to compute metrics"}), 400
-
-        narrative = build_narrative(team.name, season_year, metrics)
-
-        return jsonify({
-            "team": team.name,
-            "team_id": team.id,
-            "season": season_year,
-            "metrics": metrics,
-            "log": log,
-            "narrative": narrative,
-        })
-    finally:
-        session.close()
+    stats_row = (
+        session.query(TeamSeasonStats)
+        .filter_by(team_id=team.id, season_id=season.id)
+        .first()
+    )
+    if not stats_row:
+        return jsonify({"error": "no stats for this team in the selected season"}), 404
+
+    metrics, log = calculate_pythagorean_metrics(
+        gf=stats_row.gf,
+        ga=stats_row.ga,
+        played=stats_row.played,
+        points=stats_row.points,
+    )
+    if not metrics:
+        return jsonify({"error": "unable to compute metrics"}), 400
+
+    narrative = build_narrative(team.name, season_year, metrics)
+
+    return jsonify({
+        "team": team.name,
+        "team_id": team.id,
+        "season": season_year,
+        "metrics": metrics,
+        "log": log,
+        "narrative": narrative,
+    })
 
 @app.route("/")
 def home():
-    db = SessionLocal()
-    user = get_auth_user()
+    db = get_db()
+    user = get_auth_identity()
     msg = request.args.get("msg")
     error = request.args.get("error")
 
     # seasons and teams
-    seasons = [row[0] for row in db.query(Season.end_year).order_by(Season.end_year.desc()).all()]
+    snapshot = STANDINGS.snapshot()
+    seasons = snapshot.season_years[::-1]
     teams = db.query(Team).order_by(Team.name.asc()).all()
 
     # standings
@@ -689,39 +801,9 @@ def home():
     sort_type = request.args.get("sort", default="points", type=str)
     standings = []
     if selected_season:
-        season_obj = db.query(Season).filter_by(end_year=selected_season).first()
-        if season_obj:
-            q = (
-                db.query(TeamSeasonStats, Team)
-                .join(Team, Team.id == TeamSeasonStats.team_id)
-                .filter(TeamSeasonStats.season_id == season_obj.id)
-            )
-            if sort_type == "points":
-                q = q.order_by(TeamSeasonStats.points.desc(), TeamSeasonStats.gd.desc(), TeamSeasonStats.gf.desc(), Team.name.asc())
-            elif sort_type == "goals_for":
-                q = q.order_by(TeamSeasonStats.gf.desc(), TeamSeasonStats.points.desc(), Team.name.asc())
-            elif sort_type == "goals_against":
-                q = q.order_by(TeamSeasonStats.ga.asc(), TeamSeasonStats.points.desc(), Team.name.asc())
-            elif sort_type == "goal_diff":
-                q = q.order_by(TeamSeasonStats.gd.desc(), TeamSeasonStats.points.desc(), Team.name.asc())
-            else:
-                q = q.order_by(Team.name.asc())
-            standings = [
-                {
-                    "team_id": t.id,
-                    "team": t.name,
-                    "position": st.position,
-                    "played": st.played,
-                    "won": st.won,
-                    "drawn": st.drawn,
-                    "lost": st.lost,
-                    "gf": st.gf,
-                    "ga": st.ga,
-                    "gd": st.gd,
-                    "points": st.points,
-                }
-                for st, t in q.all()
-            ]
+        table = snapshot.season(selected_season)
+        if table:
+            standings = table.rows(sort_type if sort_type in STANDINGS_SORT_TYPES else "name")
 
     # unified search
     search_type = request.args.get("search_type", default="player")
@@ -732,12 +814,7 @@ def home():
     team_season = request.args.get("search_season", type=int) or request.args.get("team_season", type=int) or selected_season
     team_results = []
     if team_q:
-        team_results = (
-            db.query(Team)
-            .filter(Team.name.ilike(f"%{team_q}%"))
-            .order_by(Team.name.asc())
-            .all()
-        )
+        team_results = search_teams(db, team_q)
 
     team_detail = None
     team_id = request.args.get("team_id", type=int)
@@ -758,20 +835,7 @@ def home():
     # player search
     player_results = []
     if player_q:
-        like = f"%{player_q}%"
-        player_results = (
-            db.query(Player, Team)
-            .join(Team, Player.team_id == Team.id)
-            .filter(
-                or_(
-                    Player.first_name.ilike(like),
-                    Player.last_name.ilike(like),
-                    (Player.first_name + " " + Player.last_name).ilike(like),
-                )
-            )
-            .order_by(Player.last_name.asc(), Player.first_name.asc())
-            .all()
-        )
+        player_results = search_players(db, player_q)
 
     # VIP metrics (if submitted)
     pro_metrics = None
@@ -835,7 +899,6 @@ def home():
         error=error,
         wallpapers=wallpapers,
     )
-    db.close()
     return resp
 
 @app.route("/avatars/<path:filename>")
@@ -873,17 +936,15 @@ def api_wallpapers():
 
 
 @app.route("/api/teams", methods=["GET"])
+@data_versioned
 def api_list_teams():
     """Return all teams (id + name), sorted by name."""
-    session = SessionLocal()
-    try:
-        teams = session.query(Team).order_by(Team.name.asc()).all()
-        return jsonify({
-            "count": len(teams),
-            "teams": [{"id": t.id, "name": t.name} for t in teams],
-        })
-    finally:
-        session.close()
+    session = get_db()
+    teams = session.query(Team).order_by(Team.name.asc()).all()
+    return jsonify({
+        "count": len(teams),
+        "teams": [{"id": t.id, "name": t.name} for t in teams],
+    })
 
 
 # ä¸Šä¼ å¤´åƒ
@@ -893,36 +954,33 @@ def api_update_avatar():
     if not auth:
         return jsonify({"error": "missing or invalid token"}), 401
     user, session = auth
-    try:
-        if not user:
-            return jsonify({"error": "user not found"}), 404
-        if "avatar" not in request.files:
-            return jsonify({"error": "missing file field 'avatar'"}), 400
-        file = request.files["avatar"]
-        if file.filename == "":
-            return jsonify({"error": "empty filename"}), 400
-        ext = os.path.splitext(file.filename)[1].lower()
-        if ext not in (".png", ".jpg", ".jpeg", ".gif", ".webp"):
-            return jsonify({"error": "unsupported file type"}), 400
-        filename = f"{user.id}_{secrets.token_hex(8)}{ext}"
-        filepath = AVATAR_DIR / filename
-        file.save(filepath)
-
-        # 删除旧头像文件（仅限本目录）
-        if user.avatar_url and user.avatar_url.startswith("/avatars/"):
-            old_name = user.avatar_url.split("/avatars/", 1)[-1]
-            old_path = AVATAR_DIR / old_name
-            if old_path.exists():
-                try:
-                    old_path.unlink()
-                except OSError:
-                    pass
-
-        user.avatar_url = f"/avatars/{filename}"
-        session.commit()
-        return jsonify({"msg": "avatar updated", "avatar_url": user.avatar_url})
-    finally:
-        session.close()
+    if not user:
+        return jsonify({"error": "user not found"}), 404
+    if "avatar" not in request.files:
+        return jsonify({"error": "missing file field 'avatar'"}), 400
+    file = request.files["avatar"]
+    if file.filename == "":
+        return jsonify({"error": "empty filename"}), 400
+    ext = os.path.splitext(file.filename)[1].lower()
+    if ext not in (".png", ".jpg", ".jpeg", ".gif", ".webp"):
+        return jsonify({"error": "unsupported file type"}), 400
+    filename = f"{user.id}_{secrets.token_hex(8)}{ext}"
+    filepath = AVATAR_DIR / filename
+    file.save(filepath)
+
+    # 删除旧头像文件（仅限本目录）
+    if user.avatar_url and user.avatar_url.startswith("/avatars/"):
+        old_name = user.avatar_url.split("/avatars/", 1)[-1]
+        old_path = AVATAR_DIR / old_name
+        if old_path.exists():
+            try:
+                old_path.unlink()
+            except OSError:
+                pass
+
+    user.avatar_url = f"/avatars/{filename}"
+    session.commit()
+    return jsonify({"msg": "avatar updated", "avatar_url": user.avatar_url})
 
 
 # 修改密码
@@ -939,12 +997,10 @@ def api_update_password():
         return jsonify({"error": "old_password and new_password required"}), 400
     if not verify_password(user.password, old_password):
         return jsonify({"error": "old password mismatch"}), 403
-    try:
-        user.password = generate_password_hash(new_password)
-        session.commit()
-        return jsonify({"msg": "password updated"})
-    finally:
-        session.close()
+    user.password = generate_password_hash(new_password)
+    session.commit()
+    USER_CACHE.invalidate(user.id)
+    return jsonify({"msg": "password updated"})
 
 # 测试用：检查服务器是否正常
 @app.route("/ping")
@@ -953,15 +1009,14 @@ def ping():
 
 # 返回所有赛季列表
 @app.route("/api/seasons", methods=["GET"])
+@data_versioned
 def api_seasons():
-    session = SessionLocal()
-    try:
-        years = [s.end_year for s in session.query(Season).order_by(Season.end_year.asc()).all()]
-        return jsonify({"seasons": years})
-    finally:
-        session.close()
+    session = get_db()
+    years = [s.end_year for s in session.query(Season).order_by(Season.end_year.asc()).all()]
+    return jsonify({"seasons": years})
     
 @app.route("/api/standings", methods=["GET"])
+@data_versioned
 def api_standings():
     """
     请求参数：
@@ -974,75 +1029,23 @@ def api_standings():
     if season_year is None:
         return jsonify({"error": "missing season"}), 400
 
-    session = SessionLocal()
-    try:
-        season = session.query(Season).filter_by(end_year=season_year).first()
-        if not season:
-            return jsonify({"error": f"season {season_year} not found"}), 404
+    table = STANDINGS.snapshot().season(season_year)
+    if table is None:
+        return jsonify({"error": f"season {season_year} not found"}), 404
+    if sort_type not in STANDINGS_SORT_TYPES:
+        return jsonify({"error": f"invalid type: {sort_type}"}), 400
 
-        # 关联 team_season_stats + teams
-        q = (
-            session.query(TeamSeasonStats, Team)
-            .join(Team, Team.id == TeamSeasonStats.team_id)
-            .filter(TeamSeasonStats.season_id == season.id)
-        )
-
-        # 排序
-        if sort_type == "points":
-            q = q.order_by(
-                TeamSeasonStats.points.desc(),
-                TeamSeasonStats.gd.desc(),
-                TeamSeasonStats.gf.desc(),
-                Team.name.asc(),
-            )
-        elif sort_type == "goals_for":
-            q = q.order_by(
-                TeamSeasonStats.gf.desc(),
-                TeamSeasonStats.points.desc(),
-                Team.name.asc(),
-            )
-        elif sort_type == "goals_against":
-            q = q.order_by(
-                TeamSeasonStats.ga.asc(),
-                TeamSeasonStats.points.desc(),
-                Team.name.asc(),
-            )
-        elif sort_type == "goal_diff":
-            q = q.order_by(
-                TeamSeasonStats.gd.desc(),
-                TeamSeasonStats.points.desc(),
-                Team.name.asc(),
-            )
-        else:
-            return jsonify({"error": f"invalid type: {sort_type}"}), 400
-
-        rows = []
-        for st, team in q.all():
-            rows.append({
-                "team_id": team.id,
-                "team": team.name,
-                "position": st.position,
-                "played": st.played,
-                "won": st.won,
-                "drawn": st.drawn,
-                "lost": st.lost,
-                "gf": st.gf,
-                "ga": st.ga,
-                "gd": st.gd,
-                "points": st.points,
-            })
-
-        return jsonify({
-            "season": season_year,
-            "type": sort_type,
-            "count": len(rows),
-            "rows": rows,
-        })
-    finally:
-        session.close()
+    rows = table.rows(sort_type)
+    return jsonify({
+        "season": season_year,
+        "type": sort_type,
+        "count": len(rows),
+        "rows": rows,
+    })
 
 
 @app.route("/api/team_profile", methods=["GET"])
+@data_versioned
 def api_team_profile():
     """
     Team homepage info:
@@ -1056,55 +1059,52 @@ def api_team_profile():
     if not team_id and not team_name:
         return jsonify({"error": "missing team_id or team_name"}), 400
 
-    session = SessionLocal()
-    try:
-        team = session.query(Team).filter_by(id=team_id).first() if team_id else session.query(Team).filter_by(name=team_name).first()
-        if not team:
-            return jsonify({"error": "team not found"}), 404
+    session = get_db()
+    team = session.query(Team).filter_by(id=team_id).first() if team_id else session.query(Team).filter_by(name=team_name).first()
+    if not team:
+        return jsonify({"error": "team not found"}), 404
 
-        stats_row = None
-        season = None
-        if season_year:
-            season = session.query(Season).filter_by(end_year=season_year).first()
-        else:
-            season = session.query(Season).order_by(Season.end_year.desc()).first()
+    stats_row = None
+    season = None
+    if season_year:
+        season = session.query(Season).filter_by(end_year=season_year).first()
+    else:
+        season = session.query(Season).order_by(Season.end_year.desc()).first()
 
-        if season:
-            stats_row = (
-                session.query(TeamSeasonStats)
-                .filter_by(team_id=team.id, season_id=season.id)
-                .first()
-            )
+    if season:
+        stats_row = (
+            session.query(TeamSeasonStats)
+            .filter_by(team_id=team.id, season_id=season.id)
+            .first()
+        )
 
-        players = get_players_for_team(session, team.id)
+    players = get_players_for_team(session, team.id)
 
-        if not stats_row and not players:
-            # Provide a friendly message when no data is available at all
-            return jsonify({"error": "no data found for this team"}), 404
+    if not stats_row and not players:
+        # Provide a friendly message when no data is available at all
+        return jsonify({"error": "no data found for this team"}), 404
 
-        payload = {
-            "team_id": team.id,
-            "team": team.name,
-            "season": season.end_year if season else None,
-            "players": players,
-            "player_count": len(players),
-        }
-        if stats_row:
-            payload.update({
-                "played": stats_row.played,
-                "won": stats_row.won,
-                "drawn": stats_row.drawn,
-                "lost": stats_row.lost,
-                "gf": stats_row.gf,
-                "ga": stats_row.ga,
-                "gd": stats_row.gd,
-                "points": stats_row.points,
-                "position": stats_row.position,
-            })
+    payload = {
+        "team_id": team.id,
+        "team": team.name,
+        "season": season.end_year if season else None,
+        "players": players,
+        "player_count": len(players),
+    }
+    if stats_row:
+        payload.update({
+            "played": stats_row.played,
+            "won": stats_row.won,
+            "drawn": stats_row.drawn,
+            "lost": stats_row.lost,
+            "gf": stats_row.gf,
+            "ga": stats_row.ga,
+            "gd": stats_row.gd,
+            "points": stats_row.points,
+            "position": stats_row.position,
+        })
 
-        return jsonify(payload)
-    finally:
-        session.close()
+    return jsonify(payload)
 
 
 @app.route("/api/admin/teams", methods=["POST"])
@@ -1131,6 +1131,7 @@ def api_admin_create_team():
             season_year_override=season_override
         )
         session.commit()
+        _mark_data_changed(team.id)
         response = {"id": team.id, "name": team.name}
         if stats:
             response["default_stats"] = {
@@ -1149,8 +1150,6 @@ def api_admin_create_team():
     except IntegrityError:
         session.rollback()
         return jsonify({"error": "team name already exists"}), 409
-    finally:
-        session.close()
 
 
 @app.route("/api/admin/teams/<int:team_id>", methods=["PUT"])
@@ -1169,12 +1168,11 @@ def api_admin_update_team(team_id: int):
             return jsonify({"error": "team not found"}), 404
         team.name = new_name
         session.commit()
+        _mark_data_changed(team_id)
         return jsonify({"msg": "team updated", "team": {"id": team.id, "name": team.name}})
     except IntegrityError:
         session.rollback()
         return jsonify({"error": "team name already exists"}), 409
-    finally:
-        session.close()
 
 
 @app.route("/api/admin/teams/<int:team_id>", methods=["DELETE"])
@@ -1183,15 +1181,13 @@ def api_admin_delete_team(team_id: int):
     _, session, error = require_admin_session()
     if error:
         return error
-    try:
-        team = session.query(Team).get(team_id)
-        if not team:
-            return jsonify({"error": "team not found"}), 404
-        session.delete(team)
-        session.commit()
-        return jsonify({"msg": "team deleted", "id": team_id, "name": team.name})
-    finally:
-        session.close()
+    team = session.query(Team).get(team_id)
+    if not team:
+        return jsonify({"error": "team not found"}), 404
+    session.delete(team)
+    session.commit()
+    _mark_data_changed(team_id)
+    return jsonify({"msg": "team deleted", "id": team_id, "name": team.name})
 
 
 @app.route("/api/admin/players", methods=["GET"])
@@ -1203,14 +1199,11 @@ def api_admin_list_players():
     team_id = request.args.get("team_id", type=int)
     if not team_id:
         return jsonify({"error": "team_id required"}), 400
-    try:
-        team = session.query(Team).get(team_id)
-        if not team:
-            return jsonify({"error": "team not found"}), 404
-        players = get_players_for_team(session, team_id)
-        return jsonify({"team": {"id": team.id, "name": team.name}, "count": len(players), "players": players})
-    finally:
-        session.close()
+    team = session.query(Team).get(team_id)
+    if not team:
+        return jsonify({"error": "team not found"}), 404
+    players = get_players_for_team(session, team_id)
+    return jsonify({"team": {"id": team.id, "name": team.name}, "count": len(players), "players": players})
 
 
 def _load_team(session, team_id: int):
@@ -1407,13 +1400,12 @@ def api_admin_create_player():
     try:
         session.add(player)
         session.commit()
+        _mark_data_changed()
         session.refresh(player)
         return jsonify({"msg": "player created", "player": serialize_player(player)}), 201
     except IntegrityError:
         session.rollback()
         return jsonify({"error": "player already exists for this team (name/number)"}), 409
-    finally:
-        session.close()
 
 
 @app.route("/api/admin/players/<int:player_id>", methods=["PUT"])
@@ -1455,12 +1447,11 @@ def api_admin_update_player(player_id: int):
         player.team_id = new_team_id
 
         session.commit()
+        _mark_data_changed()
         return jsonify({"msg": "player updated", "player": serialize_player(player)})
     except IntegrityError:
         session.rollback()
         return jsonify({"error": "player already exists for this team (name/number)"}), 409
-    finally:
-        session.close()
 
 
 @app.route("/api/admin/players/<int:player_id>", methods=["DELETE"])
@@ -1469,15 +1460,13 @@ def api_admin_delete_player(player_id: int):
     _, session, error = require_admin_session()
     if error:
         return error
-    try:
-        player = session.query(Player).get(player_id)
-        if not player:
-            return jsonify({"error": "player not found"}), 404
-        session.delete(player)
-        session.commit()
-        return jsonify({"msg": "player deleted", "id": player_id})
-    finally:
-        session.close()
+    player = session.query(Player).get(player_id)
+    if not player:
+        return jsonify({"error": "player not found"}), 404
+    session.delete(player)
+    session.commit()
+    _mark_data_changed()
+    return jsonify({"msg": "player deleted", "id": player_id})
 
 
 @app.route("/api/admin/team_stats", methods=["POST"])
@@ -1543,6 +1532,7 @@ def api_admin_upsert_team_stats():
         created = True
 
     session.commit()
+    _mark_data_changed(team.id)
     return jsonify({
         "msg": "created" if created else "updated",
         "team": {"id": team.id, "name": team.name},
@@ -1619,72 +1609,64 @@ def api_register():
     if not (name and email and password):
         return jsonify({"error": "missing required fields (name,email,password)"}), 400
 
-    session = SessionLocal()
-    try:
-        # check existing email
-        existing = session.query(User).filter_by(email=email).first()
-        if existing:
-            return jsonify({"error": "email already registered"}), 409
-
-        # create user
-        user = User(name=name, email=email, password=generate_password_hash(password), role=role)
-        if birthday:
-            from datetime import datetime
-            try:
-                user.birthday = datetime.strptime(birthday, "%Y-%m-%d").date()
-            except Exception:
-                pass
+    session = get_db()
+    # check existing email
+    existing = session.query(User).filter_by(email=email).first()
+    if existing:
+        return jsonify({"error": "email already registered"}), 409
 
-        session.add(user)
-        session.commit()
-        session.refresh(user)
-
-        return jsonify({
-            "msg": "注册成功",
-            "user": {
-                "id": user.id,
-                "name": user.name,
-                "email": user.email,
-                "role": user.role,
-                "avatar_url": user.avatar_url,
-            }
-        }), 201
-    finally:
-        session.close()
+    # create user
+    user = User(name=name, email=email, password=generate_password_hash(password), role=role)
+    if birthday:
+        from datetime import datetime
+        try:
+            user.birthday = datetime.strptime(birthday, "%Y-%m-%d").date()
+        except Exception:
+            pass
+
+    session.add(user)
+    session.commit()
+    session.refresh(user)
+
+    return jsonify({
+        "msg": "注册成功",
+        "user": {
+            "id": user.id,
+            "name": user.name,
+            "email": user.email,
+            "role": user.role,
+            "avatar_url": user.avatar_url,
+        }
+    }), 201
 
 
 @app.route("/api/users", methods=["GET"])
 def api_users():
     """返回已注册用户列表（不包含密码）。可用查询参数：role（可选）"""
-    auth = get_auth_user(return_session=True)
-    if not auth:
+    if not _auth_user_id():
         return jsonify({"error": "missing or invalid token"}), 401
-    user, session = auth
+    user = get_auth_identity()
     if not user or user.role != "admin":
-        session.close()
         return jsonify({"error": "admin access required"}), 403
 
+    session = get_db()
     role = request.args.get("role")
-    session = SessionLocal()
-    try:
-        query = session.query(User)
-        if role:
-            query = query.filter_by(role=role)
-
-        users = query.all()
-        result = []
-        for u in users:
-            result.append({
-                "id": u.id,
-                "name": u.name,
-                "email": u.email,
-                "role": u.role,
-                "birthday": u.birthday.isoformat() if getattr(u, "birthday", None) else None,
-            })
-
-        return jsonify({"count": len(result), "users": result})
-    finally:
-        session.close()
+    query = session.query(User)
+    if role:
+        query = query.filter_by(role=role)
+
+    users = query.all()
+    result = []
+    for u in users:
+        result.append({
+            "id": u.id,
+            "name": u.name,
+            "email": u.email,
+            "role": u.role,
+            "birthday": u.birthday.isoformat() if getattr(u, "birthday", None) else None,
+        })
+
+    return jsonify({"count": len(result), "users": result})
 
 
 @app.route("/api/login", methods=["POST"])
@@ -1697,29 +1679,25 @@ def api_login():
     if not (email and password):
         return jsonify({"error": "missing email or password"}), 400
 
-    session = SessionLocal()
-    try:
-        user = session.query(User).filter_by(email=email).first()
-        if not user or not verify_password(user.password, password):
-            return jsonify({"error": "invalid credentials"}), 401
-
-        # create token
-        token = secrets.token_hex(16)
-        TOKENS[token] = user.id
-
-        return jsonify({
-            "msg": "login successful",
-            "token": token,
-            "user": {
-                "id": user.id,
-                "name": user.name,
-                "email": user.email,
-                "role": user.role,
-                "avatar_url": user.avatar_url,
-            }
-        })
-    finally:
-        session.close()
+    session = get_db()
+    user = session.query(User).filter_by(email=email).first()
+    if not user or not verify_password(user.password, password):
+        return jsonify({"error": "invalid credentials"}), 401
+
+    # create token
+    token = TOKENS.issue(user.id)
+
+    return jsonify({
+        "msg": "login successful",
+        "token": token,
+        "user": {
+            "id": user.id,
+            "name": user.name,
+            "email": user.email,
+            "role": user.role,
+            "avatar_url": user.avatar_url,
+        }
+    })
 
 
 @app.route("/api/me", methods=["GET"])
@@ -1731,24 +1709,21 @@ def api_me():
     else:
         token = None
 
-    if not token or token not in TOKENS:
+    user_id = TOKENS.get(token) if token else None
+    if not user_id:
         return jsonify({"error": "missing or invalid token"}), 401
 
-    user_id = TOKENS[token]
-    session = SessionLocal()
-    try:
-        user = session.query(User).get(user_id)
-        if not user:
-            return jsonify({"error": "user not found"}), 404
-        return jsonify({
-            "id": user.id,
-            "name": user.name,
-            "email": user.email,
-            "role": user.role,
-            "avatar_url": user.avatar_url,
-        })
-    finally:
-        session.close()
+    session = get_db()
+    user = session.query(User).get(user_id)
+    if not user:
+        return jsonify({"error": "user not found"}), 404
+    return jsonify({
+        "id": user.id,
+        "name": user.name,
+        "email": user.email,
+        "role": user.role,
+        "avatar_url": user.avatar_url,
+    })
 
 @app.route("/api/users/me", methods=["DELETE"])
 def api_delete_me():
@@ -1759,29 +1734,35 @@ def api_delete_me():
     else:
         token = None
 
-    if not token or token not in TOKENS:
+    user_id = TOKENS.get(token) if token else None
+    if not user_id:
         return jsonify({"error": "missing or invalid token"}), 401
 
-    user_id = TOKENS[token]
-    session = SessionLocal()
-    try:
-        user = session.query(User).get(user_id)
-        if not user:
-            return jsonify({"error": "user not found"}), 404
+    session = get_db()
+    user = session.query(User).get(user_id)
+    if not user:
+        return jsonify({"error": "user not found"}), 404
 
-        session.delete(user)
-        session.commit()
+    session.delete(user)
+    session.commit()
 
-        # remove any tokens that map to this user
-        remove = [t for t, uid in list(TOKENS.items()) if uid == user_id]
-        for t in remove:
-            TOKENS.pop(t, None)
+    # remove any tokens that map to this user
+    TOKENS.revoke_user(user_id)
+    USER_CACHE.invalidate(user_id)
 
-        return jsonify({"msg": "account deleted", "id": user_id})
-    finally:
-        session.close()
+    return jsonify({"msg": "account deleted", "id": user_id})
 
 
 if __name__ == "__main__":
+    # 已有数据库不会由 create_all 补建新索引
+    ensure_indexes(engine)
+    # 启动时预先载入内存中的积分榜快照和球队时间序列
+    STANDINGS.snapshot()
+    TEAM_SERIES.load()
+    NAME_INDEX.players()
+    debug = True
+    # 渲染进程池也在启动时预热（字体、Agg）；debug 重载器的监视进程不需要它
+    if not debug or is_running_from_reloader():
+        get_render_pool().warm_up()
     # host 设成 0.0.0.0 方便以后远程访问
-    app.run(host="0.0.0.0", port=5000, debug=True)
+    app.run(host="0.0.0.0", port=5000, debug=debug)
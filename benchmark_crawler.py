@@ -0,0 +1,155 @@
+"""
+End-to-end crawler benchmark against the local mock APIs (crawler/mockserver.py).
+
+Starts a MockServer in-process, points premier_league_player_crawler at it, runs
+crawl_players once per --concurrency value and reports throughput from the
+crawl telemetry: records/s, requests/s, retries, 429s and p95 latency.
+Optionally times a Sina standings backfill (fetch_seasons) as well.
+
+Run example:
+    python benchmark_crawler.py --players 600 --latency 0.05 --concurrency 1,4,8 --rate 200
+    python benchmark_crawler.py --error-rate 0.02 --burst-every 5 --burst-length 0.5 --json data/bench.json
+    python benchmark_crawler.py --players 0 --sina-seasons 1993 2025
+"""
+from __future__ import annotations
+
+import argparse
+import json
+import os
+import tempfile
+import time
+import typing as t
+
+import premier_league_player_crawler as players_crawler
+import sina_epl_crawler
+from crawler import CircuitBreakers, CrawlTelemetry, format_summary
+from crawler.mockserver import MockServer, add_arguments, config_from_args
+
+
+def bench_players(
+    server: MockServer,
+    concurrency: int,
+    *,
+    rate: float | None,
+    page_size: int,
+    sleep: float,
+    cache: bool,
+    verbose: bool = False,
+) -> dict[str, t.Any]:
+    """One crawl_players run; returns the telemetry summary plus a correctness check."""
+    server.reset_counts()
+    # fresh breakers, so one run's failures do not open circuits for the next
+    breakers = players_crawler.BREAKERS
+    players_crawler.BREAKERS = CircuitBreakers(breakers.failure_threshold, breakers.reset_timeout)
+    telemetry = CrawlTelemetry(f"players-c{concurrency}")
+    with tempfile.TemporaryDirectory(prefix="bench_cache_") as cache_dir:
+        records = players_crawler.crawl_players(
+            1,
+            2025,
+            comps_code="PL",
+            page_size=page_size,
+            sleep=sleep,
+            concurrency=concurrency,
+            rate=rate if concurrency > 1 else None,
+            cache_dir=cache_dir if cache else None,
+            telemetry=telemetry,
+        )
+    summary = telemetry.summary()
+    expected = server.config.expected_records()
+    summary["concurrency"] = concurrency
+    summary["expected_records"] = expected
+    summary["complete"] = len(records) == expected
+    summary["server"] = dict(sorted(server.counts.items()))
+    if verbose:
+        print(format_summary(summary))
+    return summary
+
+
+def bench_sina(server: MockServer, first: int, last: int, workers: int) -> dict[str, t.Any]:
+    server.reset_counts()
+    sina_epl_crawler.API_URL = server.sina_url
+    telemetry = CrawlTelemetry("sina")
+    session = sina_epl_crawler.make_sina_session(cache_dir=None, pool_size=max(10, workers), telemetry=telemetry)
+    standings, errors = sina_epl_crawler.fetch_seasons(range(first, last + 1), workers=workers, session=session)
+    summary = telemetry.summary()
+    summary["seasons"] = len(standings)
+    summary["errors"] = {str(season): error for season, error in sorted(errors.items())}
+    return summary
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description="Benchmark the crawlers against the local mock APIs.")
+    add_arguments(parser)
+    parser.add_argument(
+        "--concurrency",
+        type=str,
+        default="1,8",
+        help="Comma-separated concurrency levels to run (1 = sequential mode).",
+    )
+    parser.add_argument(
+        "--rate",
+        type=float,
+        default=200.0,
+        help="Concurrent mode: requests/second budget (the crawler's default of 5 would dominate).",
+    )
+    parser.add_argument("--page-size", type=int, default=40, help="Page size for the directory.")
+    parser.add_argument("--sleep", type=float, default=0.0, help="Sequential mode: delay between requests.")
+    parser.add_argument("--cache", action="store_true", help="Use a (fresh, temporary) response cache.")
+    parser.add_argument(
+        "--sina-seasons",
+        type=int,
+        nargs=2,
+        metavar=("FIRST", "LAST"),
+        default=None,
+        help="Also time a Sina standings backfill of these seasons.",
+    )
+    parser.add_argument("--sina-workers", type=int, default=sina_epl_crawler.BACKFILL_WORKERS)
+    parser.add_argument("--json", type=str, default=None, help="Write all results to this JSON file.")
+    parser.add_argument("--verbose", action="store_true", help="Print the per-endpoint table of every run.")
+    args = parser.parse_args()
+
+    config = config_from_args(args)
+    results: dict[str, t.Any] = {"config": vars(config), "players": [], "sina": None}
+    with MockServer(config) as server:
+        players_crawler.set_api_base(server.football_base)
+        print(f"[BENCH] mock APIs at {server.url} · {config.players} players · latency {config.latency}s")
+        if config.players > 0:
+            print(f"  {'conc':>4} {'records':>8} {'secs':>7} {'rec/s':>8} {'req/s':>8} {'retry':>6} {'429':>5} {'p95 ms':>7}  ok")
+            for level in [int(value) for value in args.concurrency.split(",") if value]:
+                started = time.perf_counter()
+                summary = bench_players(
+                    server,
+                    level,
+                    rate=args.rate,
+                    page_size=args.page_size,
+                    sleep=args.sleep,
+                    cache=args.cache,
+                    verbose=args.verbose,
+                )
+                summary["wall_s"] = round(time.perf_counter() - started, 2)
+                results["players"].append(summary)
+                p95 = max((stats["latency_ms_p95"] or 0 for stats in summary["endpoints"].values()), default=0)
+                print(
+                    f"  {level:>4} {summary['records']:>8} {summary['elapsed_s']:>7} {summary['records_per_s']:>8} "
+                    f"{summary['requests_per_s']:>8} {summary['totals']['retries']:>6} "
+                    f"{summary['totals']['throttled']:>5} {p95:>7}  {'yes' if summary['complete'] else 'NO'}"
+                )
+        if args.sina_seasons:
+            first, last = args.sina_seasons
+            summary = bench_sina(server, first, last, args.sina_workers)
+            results["sina"] = summary
+            print(
+                f"[BENCH] Sina {summary['seasons']} seasons in {summary['elapsed_s']}s "
+                f"({summary['requests_per_s']} req/s, {summary['totals']['retries']} retries, "
+                f"{len(summary['errors'])} failed)"
+            )
+
+    if args.json:
+        os.makedirs(os.path.dirname(args.json) or ".", exist_ok=True)
+        with open(args.json, "w", encoding="utf-8") as f:
+            json.dump(results, f, ensure_ascii=False, indent=2)
+        print(f"[BENCH] Results written to {args.json}")
+
+
+if __name__ == "__main__":
+    main()
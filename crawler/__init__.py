@@ -0,0 +1,39 @@
+"""Shared plumbing for the data crawlers (premier_league_player_crawler.py, sina_epl_crawler.py)."""
+
+from .httpcache import ResponseCache, TTLPolicy
+from .images import ImageDownloader, attach_images
+from .journal import CrawlJournal, JournalMismatch
+from .ratelimit import HostRateLimiter, TokenBucket
+from .retry import CircuitBreakers, CircuitOpen, RequestFailed, RetryPolicy, get_with_retry
+from .session import CrawlerSession, make_session
+from .sinks import CSVSink, JSONArraySink, MultiSink, NDJSONSink, RecordSink, open_sinks
+from .telemetry import CrawlTelemetry, format_summary, merge_summaries
+from .workqueue import WorkQueue
+
+__all__ = [
+    "CSVSink",
+    "CircuitBreakers",
+    "CircuitOpen",
+    "CrawlJournal",
+    "CrawlTelemetry",
+    "CrawlerSession",
+    "HostRateLimiter",
+    "ImageDownloader",
+    "JSONArraySink",
+    "JournalMismatch",
+    "MultiSink",
+    "NDJSONSink",
+    "RecordSink",
+    "RequestFailed",
+    "ResponseCache",
+    "RetryPolicy",
+    "TTLPolicy",
+    "TokenBucket",
+    "WorkQueue",
+    "attach_images",
+    "format_summary",
+    "get_with_retry",
+    "make_session",
+    "merge_summaries",
+    "open_sinks",
+]
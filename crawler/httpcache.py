@@ -0,0 +1,170 @@
+"""
+Size-bounded on-disk cache for crawler GET responses.
+
+Entries are keyed by the full request URL (query included) and keep the body plus
+ETag / Last-Modified. A TTLPolicy decides how long an entry is served without
+touching the network; after that it is revalidated with If-None-Match /
+If-Modified-Since, and a 304 just refreshes the entry.
+"""
+from __future__ import annotations
+
+import hashlib
+import json
+import os
+import re
+import threading
+import time
+from pathlib import Path
+
+import requests
+from requests.structures import CaseInsensitiveDict
+
+# response headers worth replaying from cache. The body is stored as requests decoded
+# it, so Content-Encoding / Content-Length of the wire response no longer describe it.
+_KEPT_HEADERS = ("Content-Type", "ETag", "Last-Modified", "Date", "Cache-Control")
+
+
+class TTLPolicy:
+    """
+    First matching (regex, seconds) rule wins; patterns are searched in
+    scheme://host/path. A TTL of None means the URL is not cached at all, which is
+    the default for anything no rule covers (e.g. headshot images).
+    """
+
+    def __init__(self, rules: list[tuple[str, float | None]] | None = None, default: float | None = None):
+        self.rules = [(re.compile(pattern), ttl) for pattern, ttl in (rules or [])]
+        self.default = default
+
+    def ttl_for(self, url: str) -> float | None:
+        base = url.split("?", 1)[0]
+        for pattern, ttl in self.rules:
+            if pattern.search(base):
+                return ttl
+        return self.default
+
+
+class CacheEntry:
+    __slots__ = ("url", "stored_at", "etag", "last_modified", "headers", "body")
+
+    def __init__(self, url, stored_at, etag, last_modified, headers, body):
+        self.url = url
+        self.stored_at = stored_at
+        self.etag = etag
+        self.last_modified = last_modified
+        self.headers = headers
+        self.body = body
+
+    def to_response(self) -> requests.Response:
+        resp = requests.Response()
+        resp.status_code = 200
+        resp.url = self.url
+        resp.headers = CaseInsensitiveDict(self.headers)
+        resp._content = self.body
+        resp.encoding = requests.utils.get_encoding_from_headers(resp.headers)
+        resp.from_cache = True
+        return resp
+
+
+class ResponseCache:
+    """
+    One file per URL: a JSON metadata line followed by the raw body. Writes are
+    atomic (temp file + os.replace) and the oldest files are evicted once the
+    directory grows past max_bytes.
+    """
+
+    def __init__(self, cache_dir, policy: TTLPolicy | None = None, max_bytes: int = 256 * 1024 * 1024):
+        self.cache_dir = Path(cache_dir)
+        self.cache_dir.mkdir(parents=True, exist_ok=True)
+        self.policy = policy or TTLPolicy()
+        self.max_bytes = max_bytes
+        self._lock = threading.Lock()
+        self._bytes = sum(p.stat().st_size for p in self.cache_dir.glob("*.resp"))
+
+    @staticmethod
+    def key_for(url: str) -> str:
+        return hashlib.sha256(url.encode("utf-8")).hexdigest()[:40]
+
+    def _path(self, url: str) -> Path:
+        return self.cache_dir / f"{self.key_for(url)}.resp"
+
+    def load(self, url: str) -> CacheEntry | None:
+        path = self._path(url)
+        try:
+            with path.open("rb") as f:
+                meta = json.loads(f.readline())
+                body = f.read()
+        except (OSError, ValueError):
+            return None
+        if meta.get("url") != url:  # hash collision / foreign file
+            return None
+        # entries written before the headers above were trimmed may still carry the rest
+        headers = {k: v for k, v in (meta.get("headers") or {}).items() if k in _KEPT_HEADERS}
+        return CacheEntry(url, meta["stored_at"], meta.get("etag"), meta.get("last_modified"), headers, body)
+
+    def cacheable(self, url: str) -> bool:
+        return self.policy.ttl_for(url) is not None
+
+    def is_fresh(self, entry: CacheEntry) -> bool:
+        ttl = self.policy.ttl_for(entry.url)
+        return ttl is not None and time.time() - entry.stored_at < ttl
+
+    def store(self, url: str, resp: requests.Response) -> None:
+        headers = {k: resp.headers[k] for k in _KEPT_HEADERS if k in resp.headers}
+        self._write(CacheEntry(url, time.time(), resp.headers.get("ETag"), resp.headers.get("Last-Modified"),
+                               headers, resp.content))
+
+    def touch(self, entry: CacheEntry, resp: requests.Response | None = None) -> None:
+        """Record a successful revalidation (304): the entry is fresh again."""
+        entry.stored_at = time.time()
+        if resp is not None:
+            entry.etag = resp.headers.get("ETag") or entry.etag
+            entry.last_modified = resp.headers.get("Last-Modified") or entry.last_modified
+        self._write(entry)
+
+    def _write(self, entry: CacheEntry) -> None:
+        meta = {
+            "url": entry.url,
+            "stored_at": entry.stored_at,
+            "etag": entry.etag,
+            "last_modified": entry.last_modified,
+            "headers": entry.headers,
+        }
+        data = json.dumps(meta).encode("utf-8") + b"\n" + entry.body
+        path = self._path(entry.url)
+        tmp = path.with_suffix(f".{os.getpid()}.{threading.get_ident()}.tmp")  # unique across worker processes
+        try:
+            old_size = path.stat().st_size if path.exists() else 0
+            tmp.write_bytes(data)
+            os.replace(tmp, path)
+        except OSError:
+            tmp.unlink(missing_ok=True)
+            return
+        with self._lock:
+            self._bytes += len(data) - old_size
+            if self._bytes > self.max_bytes:
+                self._trim()
+
+    def _trim(self) -> None:
+        """Evict least recently written entries until the directory fits its budget."""
+        files = []
+        for path in self.cache_dir.glob("*.resp"):
+            try:
+                files.append((path.stat().st_mtime, path))
+            except OSError:
+                continue
+        files.sort()
+        for _, path in files:
+            if self._bytes <= self.max_bytes:
+                break
+            try:
+                size = path.stat().st_size
+                path.unlink()
+            except OSError:
+                continue
+            self._bytes -= size
+
+    def clear(self) -> None:
+        with self._lock:
+            for path in self.cache_dir.glob("*.resp"):
+                path.unlink(missing_ok=True)
+            self._bytes = 0
@@ -0,0 +1,179 @@
+"""
+Parallel image download stage.
+
+Downloads run on their own worker pool, stream to disk in chunks, skip files that
+already exist (or revalidate them with the ETag recorded in the manifest) and
+store byte-identical images once: later copies become hard links to the first.
+A manifest.json next to the images maps each file to its URL, size and sha256.
+"""
+from __future__ import annotations
+
+import hashlib
+import json
+import os
+import threading
+import typing as t
+from collections import deque
+from concurrent.futures import Future, ThreadPoolExecutor
+
+import requests
+
+CHUNK_SIZE = 64 * 1024
+MANIFEST_NAME = "manifest.json"
+
+
+def file_sha256(path: str) -> str:
+    digest = hashlib.sha256()
+    with open(path, "rb") as f:
+        for chunk in iter(lambda: f.read(CHUNK_SIZE), b""):
+            digest.update(chunk)
+    return digest.hexdigest()
+
+
+class ImageDownloader:
+    def __init__(
+        self,
+        session: requests.Session,
+        dest_dir: str,
+        *,
+        workers: int = 4,
+        revalidate: bool = False,
+    ):
+        self.session = session
+        self.dest_dir = dest_dir
+        self.revalidate = revalidate
+        self.manifest_path = os.path.join(dest_dir, MANIFEST_NAME)
+        self.counts = {"downloaded": 0, "skipped": 0, "not_modified": 0, "deduped": 0, "failed": 0}
+        self._lock = threading.Lock()
+        self._pool = ThreadPoolExecutor(workers, thread_name_prefix="image")
+        self._manifest: dict[str, dict[str, t.Any]] = {}
+        os.makedirs(dest_dir, exist_ok=True)
+        if os.path.exists(self.manifest_path):
+            with open(self.manifest_path, encoding="utf-8") as f:
+                self._manifest = json.load(f)
+        self._by_hash = {entry["sha256"]: name for name, entry in self._manifest.items() if entry.get("sha256")}
+
+    def submit(self, url: str, filename: str) -> Future:
+        """Queue a download; the future resolves to the local path, or None on failure."""
+        return self._pool.submit(self._download, url, filename)
+
+    def _count(self, key: str) -> None:
+        with self._lock:
+            self.counts[key] += 1
+
+    def _remember(self, filename: str, entry: dict[str, t.Any]) -> None:
+        with self._lock:
+            self._manifest[filename] = entry
+            self._by_hash.setdefault(entry["sha256"], filename)
+
+    def _download(self, url: str, filename: str) -> str | None:
+        path = os.path.join(self.dest_dir, filename)
+        with self._lock:
+            entry = self._manifest.get(filename)
+        exists = os.path.exists(path)
+        if exists and not self.revalidate:
+            if entry is None or entry.get("url") != url:
+                self._remember(filename, {"url": url, "bytes": os.path.getsize(path), "sha256": file_sha256(path)})
+            self._count("skipped")
+            return path
+
+        headers = {}
+        if exists and entry:
+            if entry.get("etag"):
+                headers["If-None-Match"] = entry["etag"]
+            if entry.get("last_modified"):
+                headers["If-Modified-Since"] = entry["last_modified"]
+        part_path = f"{path}.part"
+        try:
+            with self.session.get(url, headers=headers, stream=True, timeout=15) as resp:
+                if resp.status_code == 304:
+                    self._count("not_modified")
+                    return path
+                resp.raise_for_status()
+                digest = hashlib.sha256()
+                size = 0
+                with open(part_path, "wb") as f:
+                    for chunk in resp.iter_content(CHUNK_SIZE):
+                        f.write(chunk)
+                        digest.update(chunk)
+                        size += len(chunk)
+                etag = resp.headers.get("ETag")
+                last_modified = resp.headers.get("Last-Modified")
+        except Exception:  # noqa: BLE001
+            if os.path.exists(part_path):
+                os.remove(part_path)
+            self._count("failed")
+            return None
+
+        sha256 = digest.hexdigest()
+        with self._lock:
+            original = self._by_hash.get(sha256)
+        entry = {"url": url, "bytes": size, "sha256": sha256, "etag": etag, "last_modified": last_modified}
+        original_path = os.path.join(self.dest_dir, original) if original else None
+        if original_path and original != filename and os.path.exists(original_path):
+            # e.g. the placeholder silhouette: keep one copy on disk
+            link_path = f"{path}.link"
+            try:
+                if os.path.exists(link_path):
+                    os.remove(link_path)
+                os.link(original_path, link_path)
+            except OSError:
+                pass  # no hard links here; keep the downloaded copy
+            else:
+                os.remove(part_path)
+                part_path = link_path
+                entry["same_as"] = original
+        os.replace(part_path, path)
+        self._count("deduped" if "same_as" in entry else "downloaded")
+        self._remember(filename, entry)
+        return path
+
+    def close(self) -> None:
+        """Wait for queued downloads and write the manifest."""
+        self._pool.shutdown(wait=True)
+        with self._lock:
+            data = json.dumps(self._manifest, ensure_ascii=False, indent=2, sort_keys=True)
+        tmp = f"{self.manifest_path}.{os.getpid()}.tmp"
+        with open(tmp, "w", encoding="utf-8") as f:
+            f.write(data)
+        os.replace(tmp, self.manifest_path)
+
+    def summary(self) -> str:
+        return ", ".join(f"{key}={value}" for key, value in self.counts.items())
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, exc_type, exc, tb):
+        if exc_type is not None:
+            self._pool.shutdown(wait=True, cancel_futures=True)
+        self.close()
+
+
+def attach_images(
+    records: t.Iterable[dict[str, t.Any]],
+    downloader: ImageDownloader,
+    filename: t.Callable[[dict[str, t.Any]], str],
+    *,
+    url_field: str = "headshot_url",
+    path_field: str = "local_image_path",
+    window: int = 64,
+) -> t.Iterator[dict[str, t.Any]]:
+    """
+    Download each record's image on the downloader's pool and yield the records in
+    their original order, with path_field set, keeping at most `window` in flight.
+    """
+    pending: deque[tuple[dict[str, t.Any], Future | None]] = deque()
+    for record in records:
+        url = record.get(url_field)
+        pending.append((record, downloader.submit(url, filename(record)) if url else None))
+        while pending and (len(pending) > window or pending[0][1] is None or pending[0][1].done()):
+            record, image = pending.popleft()
+            if image is not None:
+                record[path_field] = image.result()
+            yield record
+    while pending:
+        record, image = pending.popleft()
+        if image is not None:
+            record[path_field] = image.result()
+        yield record
@@ -0,0 +1,121 @@
+"""
+Append-only crawl journal so an interrupted crawl can resume where it stopped.
+
+One JSON object per line:
+    {"t": "start", ...crawl parameters...}
+    {"t": "player", "page": 3, "id": 1234, "record": {...} | null}
+    {"t": "page", "page": 3, "num_pages": 20, "ids": [...]}
+
+A player line carries the normalized record (null when the player was skipped), so
+a resumed crawl replays finished work from the journal instead of the API. Lines
+are flushed as they are written and fsync'd in batches; a torn last line from a
+crash is ignored on load.
+"""
+from __future__ import annotations
+
+import json
+import os
+import time
+import typing as t
+
+
+class JournalMismatch(ValueError):
+    """The journal on disk belongs to a crawl with different parameters."""
+
+
+class CrawlJournal:
+    def __init__(
+        self,
+        path: str,
+        params: dict[str, t.Any],
+        *,
+        resume: bool = False,
+        fsync_every: int = 50,
+        fsync_interval: float = 2.0,
+    ):
+        self.path = path
+        self.params = params
+        self.fsync_every = fsync_every
+        self.fsync_interval = fsync_interval
+        self.pages: dict[int, dict[str, t.Any]] = {}
+        self.players: dict[int, dict[str, t.Any] | None] = {}  # loaded from a previous run
+
+        resuming = resume and os.path.exists(path)
+        if resuming:
+            self._load()
+        os.makedirs(os.path.dirname(path) or ".", exist_ok=True)
+        self._file = open(path, "a" if resuming else "w", encoding="utf-8")
+        self._unsynced = 0
+        self._synced_at = time.monotonic()
+        if not resuming:
+            self._append({"t": "start", **params})
+            self.sync()
+
+    def _load(self) -> None:
+        with open(self.path, encoding="utf-8") as f:
+            lines = f.read().splitlines()
+        for lineno, line in enumerate(lines):
+            try:
+                entry = json.loads(line)
+            except ValueError:
+                if lineno == len(lines) - 1:
+                    break  # torn write at the end
+                raise
+            kind = entry.pop("t", None)
+            if kind == "start":
+                if entry != self.params:
+                    raise JournalMismatch(f"{self.path} was written for {entry}, not {self.params}")
+            elif kind == "player":
+                self.players[entry["id"]] = entry.get("record")
+            elif kind == "page":
+                self.pages[entry["page"]] = entry
+        # rewrite without a torn tail so new lines start on a fresh line
+        with open(self.path, "w", encoding="utf-8") as f:
+            f.write("".join(line + "\n" for line in lines if _is_json(line)))
+
+    @property
+    def resumed(self) -> bool:
+        return bool(self.pages or self.players)
+
+    def _append(self, entry: dict[str, t.Any]) -> None:
+        self._file.write(json.dumps(entry, ensure_ascii=False) + "\n")
+        self._file.flush()
+        self._unsynced += 1
+        if self._unsynced >= self.fsync_every or time.monotonic() - self._synced_at >= self.fsync_interval:
+            self.sync()
+
+    def sync(self) -> None:
+        self._file.flush()
+        os.fsync(self._file.fileno())
+        self._unsynced = 0
+        self._synced_at = time.monotonic()
+
+    def record_player(self, page: int, player_id: int, record: dict[str, t.Any] | None) -> None:
+        # only journaled lines loaded on resume are kept in memory; new ones live on disk
+        self._append({"t": "player", "page": page, "id": player_id, "record": record})
+
+    def record_page(self, page: int, num_pages: int, ids: list[int]) -> None:
+        entry = {"page": page, "num_pages": num_pages, "ids": ids}
+        self.pages[page] = entry
+        self._append({"t": "page", **entry})
+
+    def close(self) -> None:
+        if not self._file.closed:
+            self.sync()
+            self._file.close()
+
+    def discard(self) -> None:
+        """Remove the journal once the crawl's outputs are safely written."""
+        self.close()
+        try:
+            os.remove(self.path)
+        except FileNotFoundError:
+            pass
+
+
+def _is_json(line: str) -> bool:
+    try:
+        json.loads(line)
+        return True
+    except ValueError:
+        return False
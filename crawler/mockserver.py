@@ -0,0 +1,348 @@
+"""
+Local mock of the Premier League player API and the Sina standings API, for
+repeatable crawler benchmarks (see benchmark_crawler.py).
+
+Payloads follow the shapes normalize_player_record / fetch_epl_standings parse
+and are generated deterministically from `seed`. Latency, random 5xx errors,
+missing players (404) and 429 bursts are configurable:
+
+    /football/players                   directory (page, pageSize)
+    /football/players/{id}              profile (404 for every `missing_every`-th id)
+    /football/players/{id}/history      appearances / goals / assists
+    /football/players/{id}/stats        {"stats": [{"name": ..., "value": ...}]}
+    /sina/?_sport_a_=teamOrder&season=  standings grouped as {"A": [...]}
+
+Run standalone and point the crawler at it:
+    python -m crawler.mockserver --port 8765 --players 600 --latency 0.05
+    python premier_league_player_crawler.py --api-base http://127.0.0.1:8765/football
+"""
+from __future__ import annotations
+
+import argparse
+import hashlib
+import json
+import random
+import re
+import threading
+import time
+import typing as t
+from collections import Counter
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+from urllib.parse import parse_qs, urlsplit
+
+CLUBS = [
+    "Arsenal", "Aston Villa", "Bournemouth", "Brentford", "Brighton", "Burnley", "Chelsea",
+    "Crystal Palace", "Everton", "Fulham", "Leeds United", "Liverpool", "Manchester City",
+    "Manchester United", "Newcastle United", "Nottingham Forest", "Sunderland", "Tottenham Hotspur",
+    "West Ham United", "Wolverhampton Wanderers",
+]
+CLUBS_CN = [
+    "阿森纳", "阿斯顿维拉", "伯恩茅斯", "布伦特福德", "布莱顿", "伯恩利", "切尔西", "水晶宫", "埃弗顿", "富勒姆",
+    "利兹联", "利物浦", "曼城", "曼联", "纽卡斯尔联", "诺丁汉森林", "桑德兰", "热刺", "西汉姆联", "狼队",
+]
+COUNTRIES = [("England", "GB-ENG"), ("France", "FR"), ("Brazil", "BR"), ("Spain", "ES"), ("Norway", "NO")]
+POSITIONS = ["G", "D", "M", "F"]
+FREE_AGENT_EVERY = 20  # every 20th player has no club (dropped by require_club)
+
+
+class MockConfig:
+    def __init__(
+        self,
+        *,
+        players: int = 600,
+        latency: float = 0.05,
+        jitter: float = 0.5,
+        error_rate: float = 0.0,
+        missing_every: int = 17,
+        burst_every: float = 0.0,
+        burst_length: float = 1.0,
+        retry_after: float = 1.0,
+        seed: int = 0,
+    ):
+        self.players = players  # directory size
+        self.latency = latency  # seconds per response, +- jitter * latency
+        self.jitter = jitter
+        self.error_rate = error_rate  # share of requests answered with a 500
+        self.missing_every = missing_every  # profile 404 for ids divisible by this; 0: none
+        self.burst_every = burst_every  # every N seconds ...
+        self.burst_length = burst_length  # ... all requests get 429 for this long; 0: never
+        self.retry_after = retry_after  # Retry-After sent with the 429s
+        self.seed = seed
+
+    def expected_records(self, require_club: bool = True) -> int:
+        """How many records a complete crawl should produce."""
+        count = 0
+        for player_id in range(1, self.players + 1):
+            if self.missing_every and player_id % self.missing_every == 0:
+                continue
+            if require_club and player_id % FREE_AGENT_EVERY == 0:
+                continue
+            count += 1
+        return count
+
+
+def player_profile(player_id: int, seed: int = 0) -> dict[str, t.Any]:
+    rng = random.Random(seed * 1_000_003 + player_id)
+    first = rng.choice(["James", "Lucas", "Bukayo", "Erling", "Mohamed", "Kai", "Martin", "Rodrigo"])
+    last = f"{rng.choice(['Smith', 'Silva', 'Haaland', 'Saka', 'Odegaard', 'Diaz', 'Rice'])}{player_id}"
+    country, alpha2 = rng.choice(COUNTRIES)
+    club = None if player_id % FREE_AGENT_EVERY == 0 else CLUBS[player_id % len(CLUBS)]
+    return {
+        "id": player_id,
+        "name": {"display": f"{first} {last}", "first": first, "last": last},
+        "currentTeam": {"name": club, "club": {"name": club}} if club else None,
+        "info": {
+            "position": rng.choice(POSITIONS),
+            "shirtNum": rng.randint(1, 99),
+            "foot": rng.choice(["left", "right"]),
+        },
+        "birth": {
+            "date": {"label": f"{rng.randint(1, 28)} {rng.choice(['March', 'July', 'October'])} {rng.randint(1990, 2007)}"},
+            "country": {"country": country, "alpha2": alpha2},
+        },
+        "altIds": {"opta": f"{100000 + player_id}"},
+    }
+
+
+def player_totals(player_id: int, seed: int = 0) -> dict[str, int]:
+    rng = random.Random(seed * 1_000_033 + player_id)
+    appearances = rng.randint(0, 300)
+    return {
+        "appearances": appearances,
+        "goals": rng.randint(0, appearances // 3),
+        "assists": rng.randint(0, appearances // 4),
+    }
+
+
+def standings_table(season: int, seed: int = 0) -> list[dict[str, t.Any]]:
+    rng = random.Random(seed * 1_000_037 + season)
+    rows = []
+    for team_id, (cn, en) in enumerate(zip(CLUBS_CN, CLUBS), start=1):
+        win = rng.randint(3, 30)
+        draw = rng.randint(0, 38 - win)
+        goal, losegoal = rng.randint(20, 100), rng.randint(20, 90)
+        rows.append(
+            {
+                "team_id": str(team_id),
+                "team_cn": cn,
+                "team_en": en,
+                "count": 38,
+                "win": win,
+                "draw": draw,
+                "lose": 38 - win - draw,
+                "goal": goal,
+                "losegoal": losegoal,
+                "truegoal": goal - losegoal,
+                "score": win * 3 + draw,
+            }
+        )
+    return rows
+
+
+class MockServer:
+    """ThreadingHTTPServer on 127.0.0.1 serving MockConfig's synthetic data from a background thread."""
+
+    def __init__(self, config: MockConfig | None = None, *, host: str = "127.0.0.1", port: int = 0):
+        self.config = config or MockConfig()
+        self.counts: Counter[str] = Counter()  # "<kind> <status>" -> responses
+        self._lock = threading.Lock()
+        self._started = time.monotonic()
+        self._rng = random.Random(self.config.seed)
+        self._httpd = ThreadingHTTPServer((host, port), _make_handler(self))
+        self._httpd.daemon_threads = True
+        self._thread: threading.Thread | None = None
+
+    @property
+    def url(self) -> str:
+        host, port = self._httpd.server_address[:2]
+        return f"http://{host}:{port}"
+
+    @property
+    def football_base(self) -> str:
+        """For set_api_base() / --api-base."""
+        return f"{self.url}/football"
+
+    @property
+    def sina_url(self) -> str:
+        """For sina_epl_crawler.API_URL."""
+        return f"{self.url}/sina/"
+
+    def start(self) -> "MockServer":
+        self._started = time.monotonic()
+        self._thread = threading.Thread(target=self._httpd.serve_forever, name="mockserver", daemon=True)
+        self._thread.start()
+        return self
+
+    def stop(self) -> None:
+        self._httpd.shutdown()
+        self._httpd.server_close()
+        if self._thread is not None:
+            self._thread.join()
+
+    def reset_counts(self) -> None:
+        with self._lock:
+            self.counts.clear()
+            self._started = time.monotonic()
+
+    def __enter__(self) -> "MockServer":
+        return self.start()
+
+    def __exit__(self, exc_type, exc, tb) -> None:
+        self.stop()
+
+    def _count(self, kind: str, status: int) -> None:
+        with self._lock:
+            self.counts[f"{kind} {status}"] += 1
+
+    def _fault(self) -> tuple[int, float | None] | None:
+        """(status, retry_after) when this request should fail, else None."""
+        config = self.config
+        if config.burst_every > 0 and config.burst_length > 0:
+            if (time.monotonic() - self._started) % config.burst_every >= config.burst_every - config.burst_length:
+                return 429, config.retry_after
+        with self._lock:
+            failed = config.error_rate > 0 and self._rng.random() < config.error_rate
+        return (500, None) if failed else None
+
+    def _delay(self) -> float:
+        config = self.config
+        with self._lock:
+            spread = self._rng.uniform(-config.jitter, config.jitter)
+        return max(0.0, config.latency * (1 + spread))
+
+    def respond(self, path: str, query: dict[str, list[str]]) -> tuple[str, int, t.Any]:
+        """(kind, status, body) for a GET, before faults are applied."""
+        config = self.config
+        if path.rstrip("/") == "/sina":
+            if query.get("_sport_a_") != ["teamOrder"] or "season" not in query:
+                return "sina", 404, None
+            table = standings_table(int(query["season"][0]), config.seed)
+            return "sina", 200, {"result": {"status": {"code": 0, "msg": ""}, "data": {"A": table}}}
+        if path == "/football/players":
+            page = int((query.get("page") or ["0"])[0])
+            size = max(1, int((query.get("pageSize") or ["30"])[0]))
+            ids = range(page * size + 1, min((page + 1) * size, config.players) + 1)
+            content = []
+            for player_id in ids:
+                profile = player_profile(player_id, config.seed)
+                content.append({key: profile[key] for key in ("id", "name", "currentTeam", "info", "altIds")})
+            num_pages = (config.players + size - 1) // size
+            page_info = {"page": page, "numPages": num_pages, "pageSize": size, "numEntries": config.players}
+            return "list", 200, {"pageInfo": page_info, "content": content}
+        match = re.fullmatch(r"/football/players/(\d+)(/history|/stats)?", path)
+        if not match:
+            return "other", 404, None
+        player_id, sub = int(match[1]), match[2]
+        if not 1 <= player_id <= config.players:
+            return (sub or "/detail")[1:], 404, None
+        if sub == "/history":
+            return "history", 200, {"id": player_id, **player_totals(player_id, config.seed)}
+        if sub == "/stats":
+            totals = player_totals(player_id, config.seed)
+            stats = [
+                {"name": "appearances", "value": totals["appearances"]},
+                {"name": "goals", "value": totals["goals"]},
+                {"name": "goal_assist", "value": totals["assists"]},
+            ]
+            return "stats", 200, {"entity": {"id": player_id}, "stats": stats}
+        if config.missing_every and player_id % config.missing_every == 0:
+            return "detail", 404, None
+        return "detail", 200, player_profile(player_id, config.seed)
+
+
+def _make_handler(server: MockServer) -> type[BaseHTTPRequestHandler]:
+    class Handler(BaseHTTPRequestHandler):
+        protocol_version = "HTTP/1.1"  # keep-alive, like the real APIs
+        disable_nagle_algorithm = True  # headers and body go out in separate writes
+
+        def log_message(self, format: str, *args: t.Any) -> None:
+            pass
+
+        def do_GET(self) -> None:
+            time.sleep(server._delay())
+            parts = urlsplit(self.path)
+            kind, status, body = server.respond(parts.path, parse_qs(parts.query))
+            fault = server._fault() if status == 200 else None
+            if fault is not None:
+                status, retry_after = fault
+                self.send_response(status)
+                if retry_after is not None:
+                    self.send_header("Retry-After", f"{retry_after:g}")
+                self.send_header("Content-Length", "0")
+                self.end_headers()
+                server._count(kind, status)
+                return
+            if status != 200:
+                self.send_response(status)
+                self.send_header("Content-Length", "0")
+                self.end_headers()
+                server._count(kind, status)
+                return
+            data = json.dumps(body, ensure_ascii=False).encode("utf-8")
+            etag = '"%s"' % hashlib.md5(data).hexdigest()
+            if self.headers.get("If-None-Match") == etag:
+                self.send_response(304)
+                self.send_header("ETag", etag)
+                self.send_header("Content-Length", "0")
+                self.end_headers()
+                server._count(kind, 304)
+                return
+            self.send_response(200)
+            self.send_header("Content-Type", "application/json; charset=utf-8")
+            self.send_header("Content-Length", str(len(data)))
+            self.send_header("ETag", etag)
+            self.end_headers()
+            self.wfile.write(data)
+            server._count(kind, 200)
+
+    return Handler
+
+
+def add_arguments(parser: argparse.ArgumentParser) -> None:
+    """The MockConfig options, shared with benchmark_crawler.py."""
+    parser.add_argument("--players", type=int, default=600, help="Directory size.")
+    parser.add_argument("--latency", type=float, default=0.05, help="Seconds per response.")
+    parser.add_argument("--jitter", type=float, default=0.5, help="Latency varies by +- this fraction.")
+    parser.add_argument("--error-rate", type=float, default=0.0, help="Share of requests answered with a 500.")
+    parser.add_argument("--missing-every", type=int, default=17, help="Profile 404 for ids divisible by N (0: none).")
+    parser.add_argument("--burst-every", type=float, default=0.0, help="Start a 429 burst every N seconds (0: never).")
+    parser.add_argument("--burst-length", type=float, default=1.0, help="Seconds each 429 burst lasts.")
+    parser.add_argument("--retry-after", type=float, default=1.0, help="Retry-After sent with 429s.")
+    parser.add_argument("--seed", type=int, default=0, help="Seed for the generated data and faults.")
+
+
+def config_from_args(args: argparse.Namespace) -> MockConfig:
+    return MockConfig(
+        players=args.players,
+        latency=args.latency,
+        jitter=args.jitter,
+        error_rate=args.error_rate,
+        missing_every=args.missing_every,
+        burst_every=args.burst_every,
+        burst_length=args.burst_length,
+        retry_after=args.retry_after,
+        seed=args.seed,
+    )
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description="Serve the mock Premier League / Sina APIs locally.")
+    parser.add_argument("--host", default="127.0.0.1")
+    parser.add_argument("--port", type=int, default=8765)
+    add_arguments(parser)
+    args = parser.parse_args()
+    server = MockServer(config_from_args(args), host=args.host, port=args.port).start()
+    print(f"[MOCK] players API: {server.football_base}")
+    print(f"[MOCK] Sina API:    {server.sina_url}")
+    try:
+        while True:
+            time.sleep(3600)
+    except KeyboardInterrupt:
+        pass
+    finally:
+        server.stop()
+        print(f"[MOCK] {dict(sorted(server.counts.items()))}")
+
+
+if __name__ == "__main__":
+    main()
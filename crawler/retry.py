@@ -0,0 +1,225 @@
+"""
+Retry policy and per-endpoint circuit breakers for crawler GETs.
+
+- exponential backoff with full jitter: sleep uniform(0, min(cap, base * 2**attempt))
+- Retry-After (seconds or HTTP date) is honoured for 429/503
+- errors are classified: 429, 408, 5xx and connection problems are retried;
+  404 and other 4xx are permanent and fail on the first attempt
+- each endpoint ("/players/{id}/stats") has a breaker: after `failure_threshold`
+  transient failures in a row it opens and requests fail fast (without touching
+  the network) until `reset_timeout` has passed; one probe then decides whether
+  it closes again
+"""
+from __future__ import annotations
+
+import random
+import re
+import threading
+import time
+import typing as t
+from email.utils import parsedate_to_datetime
+from urllib.parse import urlsplit
+
+import requests
+
+RETRY_STATUSES = frozenset({408, 429, 500, 502, 503, 504})
+
+
+class RequestFailed(RuntimeError):
+    """A GET that did not succeed; `status` is the HTTP status if there was a response."""
+
+    def __init__(self, url: str, message: str, status: int | None = None, attempts: int = 0):
+        super().__init__(f"Failed to request {url}: {message}")
+        self.url = url
+        self.status = status
+        self.attempts = attempts
+
+
+class CircuitOpen(RequestFailed):
+    """The endpoint's breaker is open; `retry_in` seconds until the next probe."""
+
+    def __init__(self, url: str, endpoint: str, retry_in: float):
+        super().__init__(url, f"circuit open for {endpoint} (retry in {retry_in:.1f}s)")
+        self.retry_in = retry_in
+
+
+def endpoint_key(url: str) -> str:
+    """
+    host + path with id-like segments collapsed: .../players/1234/stats -> .../players/{id}/stats,
+    .../photos/players/250x250/p1234.png -> .../photos/players/{id}/{id}.png
+    """
+    parts = urlsplit(url)
+    return parts.netloc + re.sub(r"/[^/.]*\d[^/.]*(\.[A-Za-z]+)?(?=/|$)", r"/{id}\1", parts.path)
+
+
+def retry_after_seconds(resp: requests.Response | None) -> float | None:
+    value = resp.headers.get("Retry-After") if resp is not None else None
+    if not value:
+        return None
+    try:
+        return max(0.0, float(value))
+    except ValueError:
+        pass
+    try:
+        return max(0.0, parsedate_to_datetime(value).timestamp() - time.time())
+    except (TypeError, ValueError):
+        return None
+
+
+class RetryPolicy:
+    def __init__(
+        self,
+        max_attempts: int = 4,
+        base: float = 0.5,
+        cap: float = 30.0,
+        max_retry_after: float = 120.0,
+        retry_statuses: t.Collection[int] = RETRY_STATUSES,
+    ):
+        self.max_attempts = max_attempts
+        self.base = base
+        self.cap = cap
+        self.max_retry_after = max_retry_after
+        self.retry_statuses = frozenset(retry_statuses)
+
+    def backoff(self, attempt: int) -> float:
+        """Full jitter for the given (0-based) retry."""
+        return random.uniform(0, min(self.cap, self.base * (2 ** attempt)))
+
+    def delay(self, attempt: int, resp: requests.Response | None = None) -> float:
+        retry_after = retry_after_seconds(resp)
+        if retry_after is not None:
+            return min(retry_after, self.max_retry_after)
+        return self.backoff(attempt)
+
+    def is_retryable(self, status: int | None = None, exc: Exception | None = None) -> bool:
+        if status is not None:
+            return status in self.retry_statuses
+        # no response: connection reset, timeout, truncated body, invalid JSON
+        return isinstance(exc, (requests.ConnectionError, requests.Timeout, requests.exceptions.ChunkedEncodingError, ValueError))
+
+
+class CircuitBreaker:
+    def __init__(self, failure_threshold: int = 5, reset_timeout: float = 30.0):
+        self.failure_threshold = failure_threshold
+        self.reset_timeout = reset_timeout
+        self.failures = 0
+        self.opened_at: float | None = None
+        self._probing = False
+        self._lock = threading.Lock()
+
+    @property
+    def state(self) -> str:
+        if self.opened_at is None:
+            return "closed"
+        return "half-open" if time.monotonic() - self.opened_at >= self.reset_timeout else "open"
+
+    def before_request(self) -> float:
+        """0 if the request may go out, otherwise seconds until the breaker lets a probe through."""
+        with self._lock:
+            if self.opened_at is None:
+                return 0.0
+            remaining = self.reset_timeout - (time.monotonic() - self.opened_at)
+            if remaining > 0:
+                return remaining
+            if self._probing:
+                return min(1.0, self.reset_timeout)
+            self._probing = True
+            return 0.0
+
+    def record_success(self) -> None:
+        with self._lock:
+            self.failures = 0
+            self.opened_at = None
+            self._probing = False
+
+    def record_failure(self) -> None:
+        with self._lock:
+            self.failures += 1
+            if self._probing or self.failures >= self.failure_threshold:
+                self.opened_at = time.monotonic()
+            self._probing = False
+
+
+class CircuitBreakers:
+    """One CircuitBreaker per endpoint_key, created on first use."""
+
+    def __init__(self, failure_threshold: int = 5, reset_timeout: float = 30.0):
+        self.failure_threshold = failure_threshold
+        self.reset_timeout = reset_timeout
+        self._breakers: dict[str, CircuitBreaker] = {}
+        self._lock = threading.Lock()
+
+    def for_url(self, url: str) -> tuple[str, CircuitBreaker]:
+        key = endpoint_key(url)
+        with self._lock:
+            breaker = self._breakers.get(key)
+            if breaker is None:
+                breaker = self._breakers[key] = CircuitBreaker(self.failure_threshold, self.reset_timeout)
+            return key, breaker
+
+    def states(self) -> dict[str, str]:
+        with self._lock:
+            return {key: breaker.state for key, breaker in self._breakers.items()}
+
+
+T = t.TypeVar("T")
+
+
+def get_with_retry(
+    session: requests.Session,
+    url: str,
+    params: dict[str, t.Any] | None = None,
+    *,
+    policy: RetryPolicy | None = None,
+    breakers: CircuitBreakers | None = None,
+    parse: t.Callable[[requests.Response], T] = lambda resp: resp,
+    timeout: float = 15,
+    sleep: t.Callable[[float], None] = time.sleep,
+) -> T:
+    """
+    GET `url` under `policy` and return parse(response) for a 2xx response.
+    Raises RequestFailed (status set for HTTP errors) once the error is permanent
+    or the attempts are used up. While the endpoint's breaker is open (or another
+    caller is running the half-open probe) CircuitOpen is raised at once instead
+    of waiting for the breaker. Retries are recorded on the session's telemetry,
+    if it has one.
+    """
+    policy = policy or RetryPolicy()
+    endpoint, breaker = breakers.for_url(url) if breakers is not None else (None, None)
+    telemetry = getattr(session, "telemetry", None)
+    error: RequestFailed | None = None
+    for attempt in range(policy.max_attempts):
+        if attempt:
+            if telemetry is not None:
+                telemetry.record_retry(endpoint or endpoint_key(url), delay)
+            sleep(delay)
+        if breaker is not None:
+            wait = breaker.before_request()
+            if wait > 0:
+                # fail fast; only the half-open probe waits out the outage
+                error = CircuitOpen(url, endpoint, wait)
+                error.attempts = attempt
+                raise error
+        resp = None
+        try:
+            resp = session.get(url, params=params, timeout=timeout)
+            if resp.ok:
+                result = parse(resp)
+                if breaker is not None:
+                    breaker.record_success()
+                return result
+            status, exc = resp.status_code, None
+        except Exception as caught:  # noqa: BLE001
+            status, exc = None, caught
+        retryable = policy.is_retryable(status, exc)
+        if breaker is not None:
+            if retryable:
+                breaker.record_failure()
+            else:
+                breaker.record_success()  # the endpoint answered; a 404 is not an outage
+        error = RequestFailed(url, f"HTTP {status}" if status is not None else repr(exc), status, attempt + 1)
+        if not retryable:
+            raise error
+        delay = policy.delay(attempt, resp)
+    assert error is not None
+    raise error
@@ -0,0 +1,109 @@
+"""The requests.Session shared by crawler threads: rate limiting, the response cache and telemetry."""
+from __future__ import annotations
+
+import time
+
+import requests
+from requests.adapters import HTTPAdapter
+
+from .httpcache import ResponseCache
+from .ratelimit import HostRateLimiter
+from .retry import endpoint_key
+from .telemetry import CrawlTelemetry
+
+
+class CrawlerSession(requests.Session):
+    """
+    GETs go through the response cache first: a fresh entry is answered locally
+    (without spending a rate-limit token), a stale one is revalidated with
+    If-None-Match / If-Modified-Since. Every request that reaches the network takes
+    a token from the host's bucket. With `telemetry` set, every request (cache hits
+    included) is recorded against its endpoint.
+    """
+
+    def __init__(
+        self,
+        limiter: HostRateLimiter | None = None,
+        cache: ResponseCache | None = None,
+        telemetry: CrawlTelemetry | None = None,
+    ):
+        super().__init__()
+        self.limiter = limiter
+        self.cache = cache
+        self.telemetry = telemetry
+        self.network_requests = 0  # requests that actually left the process
+
+    def request(self, method, url, *args, **kwargs):
+        if self.cache is None or method.upper() != "GET" or args:
+            return self._send(method, url, *args, **kwargs)
+
+        # cache key: the final URL with the query string requests would send
+        key = requests.Request("GET", url, params=kwargs.get("params")).prepare().url
+        if not self.cache.cacheable(key):
+            return self._send(method, url, **kwargs)
+        entry = self.cache.load(key)
+        if entry is not None and self.cache.is_fresh(entry):
+            resp = entry.to_response()
+            if self.telemetry is not None:
+                self.telemetry.record_request(endpoint_key(key), resp.status_code, 0, len(resp.content), from_cache=True)
+            return resp
+
+        if entry is not None:
+            headers = dict(kwargs.get("headers") or {})
+            if entry.etag:
+                headers["If-None-Match"] = entry.etag
+            if entry.last_modified:
+                headers["If-Modified-Since"] = entry.last_modified
+            kwargs["headers"] = headers
+        resp = self._send(method, url, **kwargs)
+        if resp.status_code == 304 and entry is not None:
+            self.cache.touch(entry, resp)
+            return entry.to_response()
+        if resp.status_code == 200:
+            self.cache.store(key, resp)
+        return resp
+
+    def _send(self, method, url, *args, **kwargs):
+        self.network_requests += 1
+        if self.limiter is not None:
+            self.limiter.acquire(url)
+        if self.telemetry is None:
+            return super().request(method, url, *args, **kwargs)
+        started = time.monotonic()
+        try:
+            resp = super().request(method, url, *args, **kwargs)
+        except Exception:
+            self.telemetry.record_request(endpoint_key(url), None, time.monotonic() - started)
+            raise
+        elapsed = time.monotonic() - started
+        if kwargs.get("stream"):
+            # the body has not been read yet; count what the server announced
+            nbytes = int(resp.headers.get("Content-Length") or 0)
+        else:
+            nbytes = len(resp.content)
+        self.telemetry.record_request(endpoint_key(url), resp.status_code, elapsed, nbytes)
+        return resp
+
+
+def make_session(
+    headers: dict[str, str] | None = None,
+    *,
+    rate: float | None = None,
+    burst: float | None = None,
+    pool_size: int = 10,
+    cache: ResponseCache | None = None,
+    telemetry: CrawlTelemetry | None = None,
+) -> requests.Session:
+    """
+    Build a session shared by worker threads: connection pool sized for the
+    concurrency, a per-host token bucket when `rate` (requests/second) is set,
+    the on-disk response cache when `cache` is given and request telemetry when
+    `telemetry` is given.
+    """
+    session = CrawlerSession(HostRateLimiter(rate, burst) if rate else None, cache, telemetry)
+    adapter = HTTPAdapter(pool_connections=pool_size, pool_maxsize=pool_size)
+    session.mount("http://", adapter)
+    session.mount("https://", adapter)
+    if headers:
+        session.headers.update(headers)
+    return session
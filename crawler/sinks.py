@@ -0,0 +1,170 @@
+"""
+Streaming output sinks for crawler records.
+
+Each sink appends records to `<path>.part` as they arrive (so a downstream reader
+can tail it) and renames it onto `<path>` only when the crawl finishes cleanly; an
+aborted crawl leaves the previous output untouched. Memory use does not depend on
+how many records are written.
+"""
+from __future__ import annotations
+
+import csv
+import gzip
+import json
+import os
+import typing as t
+from abc import ABC, abstractmethod
+
+FLUSH_EVERY = 100  # records between flushes of the .part file
+
+
+class RecordSink(ABC):
+    def __init__(self, path: str, *, compress: bool = False):
+        if compress and not path.endswith(".gz"):
+            path += ".gz"
+        self.path = path
+        self.part_path = f"{path}.part"
+        self.count = 0
+        os.makedirs(os.path.dirname(path) or ".", exist_ok=True)
+        if compress:
+            self._file = gzip.open(self.part_path, "wt", encoding="utf-8", newline="")
+        else:
+            self._file = open(self.part_path, "w", encoding="utf-8", newline="")
+        self._start()
+
+    def _start(self) -> None:
+        pass
+
+    @abstractmethod
+    def _write(self, record: dict[str, t.Any]) -> None:
+        ...
+
+    def _finish(self) -> None:
+        pass
+
+    def write(self, record: dict[str, t.Any]) -> None:
+        self._write(record)
+        self.count += 1
+        if self.count % FLUSH_EVERY == 0:
+            self._file.flush()
+
+    def close(self) -> None:
+        """Finish the file and atomically move it into place."""
+        if self._file.closed:
+            return
+        self._finish()
+        self._file.close()
+        os.replace(self.part_path, self.path)
+
+    def abort(self) -> None:
+        """Drop the partial output, keeping whatever was at `path` before."""
+        if not self._file.closed:
+            self._file.close()
+        try:
+            os.remove(self.part_path)
+        except FileNotFoundError:
+            pass
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, exc_type, exc, tb):
+        if exc_type is None:
+            self.close()
+        else:
+            self.abort()
+
+
+class JSONArraySink(RecordSink):
+    """A JSON array, byte-identical to json.dump(records, f, ensure_ascii=False, indent=2)."""
+
+    def _write(self, record):
+        text = json.dumps(record, ensure_ascii=False, indent=2).replace("\n", "\n  ")
+        self._file.write(("[\n  " if self.count == 0 else ",\n  ") + text)
+
+    def _finish(self):
+        self._file.write("[]" if self.count == 0 else "\n]")
+
+
+class NDJSONSink(RecordSink):
+    """One JSON object per line."""
+
+    def _write(self, record):
+        self._file.write(json.dumps(record, ensure_ascii=False) + "\n")
+
+
+class CSVSink(RecordSink):
+    def __init__(self, path: str, fieldnames: t.Sequence[str], *, compress: bool = False):
+        self.fieldnames = list(fieldnames)
+        super().__init__(path, compress=compress)
+
+    def _start(self):
+        self._writer = csv.DictWriter(self._file, fieldnames=self.fieldnames, extrasaction="ignore")
+        self._writer.writeheader()
+
+    def _write(self, record):
+        self._writer.writerow(record)
+
+
+class MultiSink:
+    """Fan records out to several sinks that are committed or aborted together."""
+
+    def __init__(self, sinks: t.Iterable[RecordSink]):
+        self.sinks = list(sinks)
+
+    @property
+    def count(self) -> int:
+        return self.sinks[0].count if self.sinks else 0
+
+    @property
+    def paths(self) -> list[str]:
+        return [sink.path for sink in self.sinks]
+
+    def write(self, record: dict[str, t.Any]) -> None:
+        for sink in self.sinks:
+            sink.write(record)
+
+    def close(self) -> None:
+        for sink in self.sinks:
+            sink.close()
+
+    def abort(self) -> None:
+        for sink in self.sinks:
+            sink.abort()
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, exc_type, exc, tb):
+        if exc_type is None:
+            self.close()
+        else:
+            self.abort()
+
+
+SINK_EXTENSIONS = {"json": ".json", "ndjson": ".ndjson", "csv": ".csv"}
+
+
+def open_sinks(
+    base_path: str,
+    formats: t.Iterable[str],
+    fieldnames: t.Sequence[str],
+    *,
+    compress: bool = False,
+) -> MultiSink:
+    """Open one sink per format at `base_path` + extension (e.g. data/epl_players_2025.csv)."""
+    sinks: list[RecordSink] = []
+    try:
+        for fmt in formats:
+            path = base_path + SINK_EXTENSIONS[fmt]
+            if fmt == "csv":
+                sinks.append(CSVSink(path, fieldnames, compress=compress))
+            elif fmt == "ndjson":
+                sinks.append(NDJSONSink(path, compress=compress))
+            else:
+                sinks.append(JSONArraySink(path, compress=compress))
+    except Exception:
+        for sink in sinks:
+            sink.abort()
+        raise
+    return MultiSink(sinks)
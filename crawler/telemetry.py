@@ -0,0 +1,253 @@
+"""
+Crawl telemetry: per-endpoint request counts, latency histograms, bytes, retries
+and 429s, plus records/sec. CrawlerSession feeds it every request (cache hits
+included), get_with_retry every retry; summary() is the JSON written at the end
+of a crawl and progress_line() what the periodic reporter prints.
+"""
+from __future__ import annotations
+
+import copy
+import json
+import os
+import sys
+import threading
+import time
+import typing as t
+
+# upper bounds (ms) of the latency histogram buckets; the last bucket is open-ended
+LATENCY_BUCKETS_MS = (10, 25, 50, 100, 250, 500, 1000, 2500, 5000, 10000)
+TIME_FORMAT = "%Y-%m-%dT%H:%M:%S"
+# per-endpoint counters that add up across processes
+_SUMMED = (
+    "requests", "cache_hits", "not_modified", "errors", "retries", "throttled", "bytes",
+    "latency_ms_total", "retry_wait_s",
+)
+
+
+def _new_endpoint() -> dict[str, t.Any]:
+    return {
+        "requests": 0,
+        "cache_hits": 0,
+        "not_modified": 0,
+        "errors": 0,
+        "status": {},
+        "retries": 0,
+        "throttled": 0,
+        "retry_wait_s": 0.0,
+        "bytes": 0,
+        "latency_ms_total": 0.0,
+        "latency_ms_max": 0.0,
+        "latency_hist": [0] * (len(LATENCY_BUCKETS_MS) + 1),
+    }
+
+
+def histogram_percentile(hist: t.Sequence[int], q: float) -> float | None:
+    """Upper bound (ms) of the bucket holding the q-quantile; inf for the open bucket."""
+    total = sum(hist)
+    if not total:
+        return None
+    rank = q * total
+    seen = 0
+    for bound, count in zip(LATENCY_BUCKETS_MS + (float("inf"),), hist):
+        seen += count
+        if seen >= rank:
+            return bound
+    return float("inf")
+
+
+def _percentile(stats: dict[str, t.Any], q: float) -> float | None:
+    value = histogram_percentile(stats["latency_hist"], q)
+    # past the last bucket the slowest request is the best bound we have
+    return round(stats["latency_ms_max"], 1) if value == float("inf") else value
+
+
+class CrawlTelemetry:
+    def __init__(self, name: str = "crawl"):
+        self.name = name
+        self.started = time.time()
+        self._clock = time.monotonic()
+        self.records = 0
+        self.endpoints: dict[str, dict[str, t.Any]] = {}
+        self._lock = threading.Lock()
+        self._stop = threading.Event()
+        self._reporter: threading.Thread | None = None
+
+    def _endpoint(self, endpoint: str) -> dict[str, t.Any]:
+        stats = self.endpoints.get(endpoint)
+        if stats is None:
+            stats = self.endpoints[endpoint] = _new_endpoint()
+        return stats
+
+    def record_request(
+        self,
+        endpoint: str,
+        status: int | None,
+        seconds: float,
+        nbytes: int = 0,
+        *,
+        from_cache: bool = False,
+    ) -> None:
+        """One request; status None means it failed without a response."""
+        ms = seconds * 1000
+        with self._lock:
+            stats = self._endpoint(endpoint)
+            stats["requests"] += 1
+            if from_cache:
+                stats["cache_hits"] += 1
+            key = str(status) if status is not None else "error"
+            stats["status"][key] = stats["status"].get(key, 0) + 1
+            if status == 304:
+                stats["not_modified"] += 1
+            elif status == 429:
+                stats["throttled"] += 1
+            if status is None or status >= 400:
+                stats["errors"] += 1
+            stats["bytes"] += nbytes
+            if not from_cache:
+                stats["latency_ms_total"] += ms
+                stats["latency_ms_max"] = max(stats["latency_ms_max"], ms)
+                index = next((i for i, bound in enumerate(LATENCY_BUCKETS_MS) if ms <= bound), len(LATENCY_BUCKETS_MS))
+                stats["latency_hist"][index] += 1
+
+    def record_retry(self, endpoint: str, delay: float) -> None:
+        with self._lock:
+            stats = self._endpoint(endpoint)
+            stats["retries"] += 1
+            stats["retry_wait_s"] += delay
+
+    def record_records(self, n: int = 1) -> None:
+        with self._lock:
+            self.records += n
+
+    @property
+    def elapsed(self) -> float:
+        return time.monotonic() - self._clock
+
+    def summary(self) -> dict[str, t.Any]:
+        with self._lock:
+            endpoints = copy.deepcopy(self.endpoints)
+            records = self.records
+        return summarize(self.name, self.started, self.elapsed, records, endpoints)
+
+    def progress_line(self) -> str:
+        return progress_line(self.summary())
+
+    def absorb(self, summary: dict[str, t.Any]) -> None:
+        """Add another process's summary() (e.g. a shard worker's) to these counters."""
+        with self._lock:
+            for endpoint, stats in summary["endpoints"].items():
+                _add_endpoint(self._endpoint(endpoint), stats)
+
+    def start_reporter(self, interval: float, report: t.Callable[[], None] | None = None) -> None:
+        """Call `report` (default: print progress_line()) every `interval` seconds until stop()."""
+        if interval <= 0 or self._reporter is not None:
+            return
+        report = report or (lambda: print(self.progress_line(), file=sys.stdout, flush=True))
+
+        def run() -> None:
+            while not self._stop.wait(interval):
+                report()
+
+        self._reporter = threading.Thread(target=run, name="telemetry", daemon=True)
+        self._reporter.start()
+
+    def stop(self) -> None:
+        self._stop.set()
+        if self._reporter is not None:
+            self._reporter.join()
+            self._reporter = None
+
+    def write_json(self, path: str, summary: dict[str, t.Any] | None = None) -> dict[str, t.Any]:
+        summary = summary or self.summary()
+        os.makedirs(os.path.dirname(path) or ".", exist_ok=True)
+        tmp = f"{path}.{os.getpid()}.tmp"
+        with open(tmp, "w", encoding="utf-8") as f:
+            json.dump(summary, f, ensure_ascii=False, indent=2)
+        os.replace(tmp, path)
+        return summary
+
+
+def summarize(
+    name: str,
+    started: float,
+    elapsed: float,
+    records: int,
+    endpoints: dict[str, dict[str, t.Any]],
+) -> dict[str, t.Any]:
+    """Build the JSON summary (derived rates and percentiles included) from raw counters."""
+    elapsed = max(elapsed, 1e-9)
+    out_endpoints = {}
+    for endpoint, stats in sorted(endpoints.items()):
+        timed = sum(stats["latency_hist"])
+        out_endpoints[endpoint] = dict(
+            stats,
+            latency_ms_avg=round(stats["latency_ms_total"] / timed, 1) if timed else None,
+            latency_ms_p50=_percentile(stats, 0.5),
+            latency_ms_p95=_percentile(stats, 0.95),
+            latency_ms_total=round(stats["latency_ms_total"], 1),
+            latency_ms_max=round(stats["latency_ms_max"], 1),
+            retry_wait_s=round(stats["retry_wait_s"], 2),
+        )
+    totals = {
+        key: sum(s[key] for s in endpoints.values())
+        for key in ("requests", "cache_hits", "not_modified", "errors", "retries", "throttled", "bytes")
+    }
+    return {
+        "name": name,
+        "started": time.strftime(TIME_FORMAT, time.localtime(started)),
+        "elapsed_s": round(elapsed, 2),
+        "records": records,
+        "records_per_s": round(records / elapsed, 2),
+        "requests_per_s": round(totals["requests"] / elapsed, 2),
+        "totals": totals,
+        "latency_buckets_ms": list(LATENCY_BUCKETS_MS),
+        "endpoints": out_endpoints,
+    }
+
+
+def _add_endpoint(into: dict[str, t.Any], stats: dict[str, t.Any]) -> None:
+    for key in _SUMMED:
+        into[key] += stats[key]
+    into["latency_ms_max"] = max(into["latency_ms_max"], stats["latency_ms_max"])
+    into["latency_hist"] = [a + b for a, b in zip(into["latency_hist"], stats["latency_hist"])]
+    for status, n in stats["status"].items():
+        into["status"][status] = into["status"].get(status, 0) + n
+
+
+def merge_summaries(name: str, summaries: t.Iterable[dict[str, t.Any]], elapsed: float, records: int) -> dict[str, t.Any]:
+    """Combine per-process summaries (e.g. shard workers) into one, over the caller's wall time."""
+    merged = CrawlTelemetry(name)
+    merged.started = time.time()
+    for summary in summaries:
+        merged.started = min(merged.started, time.mktime(time.strptime(summary["started"], TIME_FORMAT)))
+        merged.absorb(summary)
+    return summarize(name, merged.started, elapsed, records, merged.endpoints)
+
+
+def progress_line(summary: dict[str, t.Any]) -> str:
+    totals = summary["totals"]
+    return (
+        f"[PROGRESS] {summary['elapsed_s']:.0f}s · {summary['records']} records ({summary['records_per_s']:.1f}/s) · "
+        f"{totals['requests']} requests ({summary['requests_per_s']:.1f}/s, {totals['cache_hits']} cached) · "
+        f"{totals['retries']} retries · {totals['throttled']}x429 · {totals['bytes'] / 1e6:.1f} MB"
+    )
+
+
+def format_summary(summary: dict[str, t.Any]) -> str:
+    """Human-readable table of a summary()."""
+    lines = [
+        f"[TELEMETRY] {summary['records']} records in {summary['elapsed_s']}s "
+        f"({summary['records_per_s']}/s), {summary['totals']['requests']} requests "
+        f"({summary['requests_per_s']}/s)",
+        f"  {'endpoint':<48} {'req':>6} {'cache':>6} {'err':>5} {'retry':>5} {'429':>4} "
+        f"{'avg ms':>7} {'p95 ms':>7} {'MB':>7}",
+    ]
+    for endpoint, stats in summary["endpoints"].items():
+        avg = stats["latency_ms_avg"]
+        p95 = stats["latency_ms_p95"]
+        lines.append(
+            f"  {endpoint[-48:]:<48} {stats['requests']:>6} {stats['cache_hits']:>6} {stats['errors']:>5} "
+            f"{stats['retries']:>5} {stats['throttled']:>4} {'-' if avg is None else avg:>7} "
+            f"{'-' if p95 is None else p95:>7} {stats['bytes'] / 1e6:>7.2f}"
+        )
+    return "\n".join(lines)
@@ -0,0 +1,147 @@
+"""
+SQLite-backed work queue shared by crawl worker processes.
+
+A unit is claimed under a lease that its worker keeps renewing; a unit whose lease
+runs out (the worker died or hung) becomes claimable again. A unit that has been
+claimed max_attempts times without finishing is parked as "failed".
+"""
+from __future__ import annotations
+
+import json
+import sqlite3
+import time
+import typing as t
+
+SCHEMA = """
+CREATE TABLE IF NOT EXISTS units (
+    id          INTEGER PRIMARY KEY,
+    payload     TEXT    NOT NULL,
+    state       TEXT    NOT NULL DEFAULT 'pending',  -- pending / leased / done / failed
+    worker      TEXT,
+    lease_until REAL,
+    attempts    INTEGER NOT NULL DEFAULT 0,
+    output      TEXT,
+    error       TEXT
+);
+CREATE INDEX IF NOT EXISTS ix_units_state ON units (state, lease_until);
+"""
+
+
+class WorkQueue:
+    def __init__(self, path: str, *, max_attempts: int = 3):
+        self.path = path
+        self.max_attempts = max_attempts
+        self._conn = sqlite3.connect(path, timeout=30, isolation_level=None)
+        self._conn.execute("PRAGMA journal_mode=WAL")
+        self._conn.executescript(SCHEMA)
+
+    def close(self) -> None:
+        self._conn.close()
+
+    def _write(self, sql: str, params: t.Sequence[t.Any] = ()) -> int:
+        cur = self._conn.execute(sql, params)
+        return cur.rowcount
+
+    def add(self, payloads: t.Iterable[dict[str, t.Any]]) -> int:
+        rows = [(json.dumps(payload, sort_keys=True),) for payload in payloads]
+        self._conn.execute("BEGIN IMMEDIATE")
+        try:
+            self._conn.executemany("INSERT INTO units (payload) VALUES (?)", rows)
+        except BaseException:
+            self._conn.execute("ROLLBACK")
+            raise
+        self._conn.execute("COMMIT")
+        return len(rows)
+
+    def claim(self, worker: str, lease_seconds: float) -> tuple[int, dict[str, t.Any]] | None:
+        """Lease the next pending (or abandoned) unit; None when nothing is claimable right now."""
+        self._conn.execute("BEGIN IMMEDIATE")
+        try:
+            while True:
+                now = time.time()
+                row = self._conn.execute(
+                    """
+                    SELECT id, payload, attempts FROM units
+                    WHERE state = 'pending' OR (state = 'leased' AND lease_until < ?)
+                    ORDER BY id LIMIT 1
+                    """,
+                    (now,),
+                ).fetchone()
+                if row is None:
+                    claimed = None
+                    break
+                unit_id, payload, attempts = row
+                if attempts >= self.max_attempts:
+                    self._write(
+                        "UPDATE units SET state = 'failed', error = COALESCE(error, 'lease expired') WHERE id = ?",
+                        (unit_id,),
+                    )
+                    continue
+                self._write(
+                    "UPDATE units SET state = 'leased', worker = ?, lease_until = ?, attempts = attempts + 1 "
+                    "WHERE id = ?",
+                    (worker, now + lease_seconds, unit_id),
+                )
+                claimed = (unit_id, json.loads(payload))
+                break
+        except BaseException:
+            self._conn.execute("ROLLBACK")
+            raise
+        self._conn.execute("COMMIT")
+        return claimed
+
+    def renew(self, unit_id: int, worker: str, lease_seconds: float) -> bool:
+        """Extend a lease; False means the unit was taken over and the worker should stop."""
+        return self._write(
+            "UPDATE units SET lease_until = ? WHERE id = ? AND worker = ? AND state = 'leased'",
+            (time.time() + lease_seconds, unit_id, worker),
+        ) == 1
+
+    def complete(self, unit_id: int, worker: str, output: str | None = None) -> bool:
+        return self._write(
+            "UPDATE units SET state = 'done', output = ?, error = NULL WHERE id = ? AND worker = ? AND state = 'leased'",
+            (output, unit_id, worker),
+        ) == 1
+
+    def fail(self, unit_id: int, worker: str, error: str) -> None:
+        """Give a unit back after an error; it is retried until max_attempts."""
+        self._write(
+            "UPDATE units SET state = CASE WHEN attempts >= ? THEN 'failed' ELSE 'pending' END, "
+            "error = ?, lease_until = NULL WHERE id = ? AND worker = ? AND state = 'leased'",
+            (self.max_attempts, error, unit_id, worker),
+        )
+
+    def release(self, worker: str) -> int:
+        """Hand back everything a (dead) worker still holds without waiting for its leases to expire."""
+        return self._write(
+            "UPDATE units SET state = 'pending', lease_until = NULL WHERE worker = ? AND state = 'leased'",
+            (worker,),
+        )
+
+    def retry_failed(self) -> int:
+        """Make failed units claimable again (e.g. when a crawl is resumed)."""
+        return self._write("UPDATE units SET state = 'pending', attempts = 0 WHERE state = 'failed'")
+
+    def counts(self) -> dict[str, int]:
+        counts = {"pending": 0, "leased": 0, "done": 0, "failed": 0}
+        for state, n in self._conn.execute("SELECT state, COUNT(*) FROM units GROUP BY state"):
+            counts[state] = n
+        return counts
+
+    def has_claimable(self) -> bool:
+        row = self._conn.execute(
+            "SELECT 1 FROM units WHERE state = 'pending' OR (state = 'leased' AND lease_until < ?) LIMIT 1",
+            (time.time(),),
+        ).fetchone()
+        return row is not None
+
+    def units(self, state: str | None = None) -> list[dict[str, t.Any]]:
+        sql = "SELECT id, payload, state, output, error, attempts FROM units"
+        params: tuple = ()
+        if state:
+            sql += " WHERE state = ?"
+            params = (state,)
+        return [
+            {"id": uid, "payload": json.loads(payload), "state": st, "output": output, "error": error, "attempts": n}
+            for uid, payload, st, output, error, n in self._conn.execute(sql + " ORDER BY id", params)
+        ]
@@ -9,30 +9,91 @@ Collected fields:
     nationality, country_code, preferred_foot, date_of_birth, appearances,
     goals, assists, detail_url, headshot_url, local_image_path (if downloaded).
 
-Outputs:
+Outputs (streamed while crawling, renamed into place when done):
     data/epl_players_{season}.json
     data/epl_players_{season}.csv
+    data/epl_players_{season}.ndjson (with --format ndjson; --gzip adds .gz)
     data/player_photos/ (optional, when --download-images is set)
 
 Run example:
     python premier_league_player_crawler.py --season 2025 --competition 8 --download-images
+    python premier_league_player_crawler.py --concurrency 8 --rate 6   # concurrent mode
+
+API responses are cached under data/http_cache (see CACHE_TTLS); re-runs within
+the TTL are served from disk and older entries are revalidated with ETags.
 """
 from __future__ import annotations
 
 import argparse
-import csv
+import contextlib
+import gzip
 import json
+import multiprocessing
 import os
+import shutil
+import threading
 import time
 import typing as t
+from collections import deque
+from concurrent.futures import Future, ThreadPoolExecutor
 
 import requests
 
+from crawler import (
+    CircuitBreakers,
+    CrawlJournal,
+    CrawlTelemetry,
+    ImageDownloader,
+    MultiSink,
+    NDJSONSink,
+    RequestFailed,
+    ResponseCache,
+    RetryPolicy,
+    TTLPolicy,
+    WorkQueue,
+    attach_images,
+    format_summary,
+    get_with_retry,
+    make_session,
+    merge_summaries,
+    open_sinks,
+)
+from crawler.sinks import SINK_EXTENSIONS
+from crawler.telemetry import progress_line
+
 BASE_API = "https://footballapi.pulselive.com/football"
 LIST_API = f"{BASE_API}/players"
 DETAIL_API = f"{BASE_API}/players/{{player_id}}"
 STATS_API = f"{BASE_API}/players/{{player_id}}/stats"
 
+PHOTO_DIR = os.path.join("data", "player_photos")
+
+RETRY_POLICY = RetryPolicy(max_attempts=4, base=0.5, cap=30.0)
+BREAKERS = CircuitBreakers(failure_threshold=8, reset_timeout=20.0)
+PAGE_LOOKAHEAD = 2  # concurrent mode: directory pages queued ahead of the one being emitted
+PROGRESS_EVERY = 30.0  # seconds between [PROGRESS] lines
+
+CACHE_DIR = os.path.join("data", "http_cache")
+CACHE_MAX_MB = 256
+# Seconds a cached response is used without asking the API (matched on the URL path).
+# Stats move every matchday; profiles and history rarely change; the directory is
+# what reveals transfers, so it is kept short. Images are not cached.
+CACHE_TTLS = [
+    (r"/players/\d+/stats$", 6 * 3600),
+    (r"/players/\d+/history$", 24 * 3600),
+    (r"/players/\d+$", 24 * 3600),
+    (r"/players$", 3600),
+]
+
+
+def set_api_base(base: str) -> None:
+    """Point every endpoint at another host, e.g. a local stub server for tests."""
+    global BASE_API, LIST_API, DETAIL_API, STATS_API
+    BASE_API = base.rstrip("/")
+    LIST_API = f"{BASE_API}/players"
+    DETAIL_API = f"{BASE_API}/players/{{player_id}}"
+    STATS_API = f"{BASE_API}/players/{{player_id}}/stats"
+
 # Headers mimic the site so we are treated as a normal browser.
 DEFAULT_HEADERS = {
     "User-Agent": (
@@ -51,24 +112,17 @@ def request_json(
     url: str,
     params: dict[str, t.Any] | None = None,
     *,
-    max_retries: int = 3,
-    retry_backoff: float = 1.5,
+    policy: RetryPolicy | None = None,
 ) -> dict[str, t.Any]:
-    """GET a URL and return JSON with minimal retry handling."""
-    last_error: Exception | None = None
-    for attempt in range(max_retries):
-        try:
-            resp = session.get(url, params=params, timeout=15)
-            if resp.status_code == 429 and attempt < max_retries - 1:
-                # Simple backoff on rate limit.
-                time.sleep(retry_backoff * (attempt + 1))
-                continue
-            resp.raise_for_status()
-            return resp.json()
-        except Exception as exc:  # noqa: BLE001
-            last_error = exc
-            time.sleep(retry_backoff * (attempt + 1))
-    raise RuntimeError(f"Failed to request {url} after retries: {last_error}")
+    """
+    GET a URL and return JSON. Transient errors (429, 5xx, timeouts) are retried
+    with jittered exponential backoff or the server's Retry-After; 404 and other
+    client errors raise RequestFailed at once. Each endpoint has a circuit
+    breaker (BREAKERS) so a degraded API is not hammered by every worker.
+    """
+    return get_with_retry(
+        session, url, params, policy=policy or RETRY_POLICY, breakers=BREAKERS, parse=lambda resp: resp.json()
+    )
 
 
 def fetch_player_list_page(
@@ -116,8 +170,11 @@ def fetch_player_history(
     url = f"{BASE_API}/players/{player_id}/history"
     try:
         return request_json(session, url)
-    except RuntimeError:
-        return {}
+    except RequestFailed as exc:
+        # No history for this player; anything else (5xx, timeout, open circuit) is not a "no".
+        if exc.status == 404:
+            return {}
+        raise
 
 
 def fetch_player_stats(
@@ -135,13 +192,68 @@ def fetch_player_stats(
             session, STATS_API.format(player_id=player_id), params=params
         )
         return data.get("stats") or []
-    except RuntimeError as exc:
+    except RequestFailed as exc:
         # Some players (youth/new signings) return 404 for stats; treat as empty.
-        if "404" in str(exc):
+        if exc.status == 404:
             return []
         raise
 
 
+def fetch_player_bundle(
+    session: requests.Session,
+    competition_id: int,
+    player_id: int,
+    comps_code: str | None = None,
+    *,
+    pool: ThreadPoolExecutor | None = None,
+    verbose: bool = False,
+) -> tuple[dict[str, t.Any], dict[str, t.Any], list[dict[str, t.Any]]] | None:
+    """
+    Fetch (detail, history, stats) for one player, or None when the detail is missing
+    (404). Any other failure (5xx / timeouts after retries, an open circuit) raises
+    RequestFailed, so the player is not journaled as skipped and a --resume fetches
+    it again.
+
+    With a pool the three requests run in parallel; stats are requested for
+    player_id up front and only re-fetched if the detail reports another stats id.
+    """
+    futures: list[Future] = []
+    if pool is not None:
+        futures = [
+            pool.submit(fetch_player_detail, session, competition_id, player_id, comps_code),
+            pool.submit(fetch_player_history, session, player_id),
+            pool.submit(fetch_player_stats, session, competition_id, player_id, comps_code),
+        ]
+    try:
+        detail = futures[0].result() if futures else fetch_player_detail(
+            session, competition_id, player_id, comps_code
+        )
+    except RequestFailed as exc:
+        for future in futures[1:]:
+            future.cancel()
+        if exc.status != 404:
+            raise
+        # Some historic/placeholder entries return 404 on detail; skip them.
+        if verbose:
+            print(f"[SKIP] detail missing for player_id={player_id}: {exc}", flush=True)
+        return None
+    stats_id = (
+        detail.get("playerId")
+        or detail.get("id")
+        or player_id
+    )
+    try:
+        stats_id_int = int(stats_id)
+    except Exception:
+        stats_id_int = player_id
+    history = futures[1].result() if futures else fetch_player_history(session, player_id)
+    if futures and stats_id_int == player_id:
+        stats = futures[2].result()
+    else:
+        stats = fetch_player_stats(session, competition_id, stats_id_int, comps_code)
+    return detail, history, stats
+
+
 def build_headshot_url(opta_id: str | int | None, size: str = "250x250") -> str | None:
     """Return the standard Premier League headshot URL."""
     if not opta_id:
@@ -171,23 +283,9 @@ def slugify(text: str) -> str:
     return slug or "player"
 
 
-def download_image(
-    session: requests.Session,
-    url: str,
-    dest_dir: str,
-    filename: str,
-) -> str | None:
-    """Download an image to disk; returns the saved path on success."""
-    os.makedirs(dest_dir, exist_ok=True)
-    dest_path = os.path.join(dest_dir, filename)
-    try:
-        resp = session.get(url, timeout=15)
-        resp.raise_for_status()
-        with open(dest_path, "wb") as f:
-            f.write(resp.content)
-        return dest_path
-    except Exception:
-        return None
+def image_filename(record: dict[str, t.Any]) -> str:
+    """data/player_photos/{player_id}_{slug}.png"""
+    return f"{record['player_id']}_{slugify(record.get('name') or '')}.png"
 
 
 def normalize_player_record(
@@ -196,11 +294,11 @@ def normalize_player_record(
     history: dict[str, t.Any],
     stats: list[dict[str, t.Any]],
     competition_id: int,
-    download_images: bool,
-    session: requests.Session,
-    photo_dir: str,
 ) -> dict[str, t.Any]:
-    """Merge list item + detail + stats into one flattened record."""
+    """
+    Merge list item + detail + stats into one flattened record. local_image_path is
+    filled in later by the image stage (see iter_players).
+    """
     info = detail.get("info") or {}
     list_info = list_item.get("info") or {}
     name_obj = detail.get("name") or list_item.get("name") or {}
@@ -304,11 +402,6 @@ def normalize_player_record(
         list_info.get("assists"),
     )
 
-    local_image_path = None
-    if download_images and headshot_url:
-        filename = f"{player_id}_{slugify(display_name)}.png"
-        local_image_path = download_image(session, headshot_url, photo_dir, filename)
-
     return {
         "player_id": player_id,
         "name": display_name,
@@ -338,156 +431,591 @@ def normalize_player_record(
         "assists": assists,
         "detail_url": f"https://www.premierleague.com/players/{player_id}",
         "headshot_url": headshot_url,
-        "local_image_path": local_image_path,
+        "local_image_path": None,
         "competition_id": competition_id,
     }
 
 
-def crawl_players(
+def list_entry_changed(item: dict[str, t.Any], previous: dict[str, t.Any]) -> bool:
+    """
+    Whether a directory entry disagrees with the player's record from the last
+    crawl on club, shirt number or appearances. Only fields the entry actually
+    carries are compared.
+    """
+    info = item.get("info") or {}
+    team = item.get("currentTeam") or {}
+    listed = {
+        "club": team.get("name") or team.get("clubName"),
+        "shirt_number": info.get("shirtNum") or info.get("shirtNumber") or item.get("shirtNumber"),
+        "appearances": item.get("appearances") or info.get("appearances"),
+    }
+    return any(
+        value not in (None, "") and str(value) != str(previous.get(field))
+        for field, value in listed.items()
+    )
+
+
+def load_previous_players(season: int, out_dir: str = "data") -> dict[int, dict[str, t.Any]]:
+    """Records from the last saved crawl output (ndjson or json, optionally gzipped), keyed by player_id."""
+    base = os.path.join(out_dir, f"epl_players_{season}")
+    for ext in (".ndjson", ".ndjson.gz", ".json", ".json.gz"):
+        path = base + ext
+        if not os.path.exists(path):
+            continue
+        opener = gzip.open if ext.endswith(".gz") else open
+        with opener(path, "rt", encoding="utf-8") as f:
+            if ext.startswith(".ndjson"):
+                records = [json.loads(line) for line in f if line.strip()]
+            else:
+                records = json.load(f)
+        return {int(r["player_id"]): r for r in records if r.get("player_id") is not None}
+    return {}
+
+
+def iter_players(
     competition_id: int,
     season: int,
     *,
     page_size: int = 30,
     sleep: float = 0.4,
     download_images: bool = False,
+    image_workers: int = 4,
     limit: int | None = None,
     verbose: bool = False,
     max_pages: int | None = None,
     comps_code: str | None = None,
     require_club: bool = True,
-) -> list[dict[str, t.Any]]:
-    """Crawl every player in the directory for the given competition/season."""
-    session = requests.Session()
-    session.headers.update(DEFAULT_HEADERS)
-
-    results: list[dict[str, t.Any]] = []
-    page = 0
-    num_pages = 1
-    photo_dir = os.path.join("data", "player_photos")
+    concurrency: int = 1,
+    rate: float | None = None,
+    burst: float | None = None,
+    cache_dir: str | None = CACHE_DIR,
+    cache_max_mb: float = CACHE_MAX_MB,
+    journal: CrawlJournal | None = None,
+    previous: dict[int, dict[str, t.Any]] | None = None,
+    start_page: int = 0,
+    end_page: int | None = None,
+    telemetry: CrawlTelemetry | None = None,
+) -> t.Iterator[dict[str, t.Any]]:
+    """
+    Crawl every player in the directory for the given competition/season, yielding
+    each normalized record as soon as it is ready. start_page / end_page restrict
+    the crawl to directory pages [start_page, end_page) (one shard's work unit).
+
+    concurrency > 1 (or a `rate`) switches to concurrent mode: up to `concurrency`
+    players are fetched at once, each with detail/history/stats in parallel, and a
+    per-host token bucket (`rate` requests/second, `burst`) replaces the fixed
+    sleeps. Output order is the directory order either way.
+
+    API responses go through the on-disk cache in `cache_dir` (None disables it).
+
+    With a `journal`, every finished player and page is logged as it completes;
+    players and pages already in it (a resumed crawl) are replayed from the journal
+    instead of being fetched again.
+
+    previous (incremental mode) maps player_id -> record from the last crawl; a
+    player whose directory entry still matches it (see list_entry_changed) is
+    carried over without requesting detail/history/stats.
+
+    download_images hands headshots to a separate ImageDownloader pool
+    (`image_workers` threads) while the crawl goes on; a record is yielded once its
+    image is on disk, still in directory order.
+
+    telemetry, when given, records every request (per endpoint) and each accepted player.
+    """
+    concurrent = concurrency > 1 or rate is not None
+    if concurrent and rate is None:
+        rate = 5.0
+    cache = None
+    if cache_dir:
+        cache = ResponseCache(cache_dir, TTLPolicy(CACHE_TTLS), max_bytes=int(cache_max_mb * 1024 * 1024))
+    session = make_session(
+        DEFAULT_HEADERS,
+        rate=rate if concurrent else None,
+        burst=burst,
+        pool_size=max(10, concurrency * 3, image_workers if download_images else 0),
+        cache=cache,
+        telemetry=telemetry,
+    )
+    player_pool = ThreadPoolExecutor(concurrency, thread_name_prefix="player") if concurrent else None
+    request_pool = ThreadPoolExecutor(concurrency * 3, thread_name_prefix="request") if concurrent else None
+
+    images = ImageDownloader(session, PHOTO_DIR, workers=image_workers) if download_images else None
+
+    accepted = 0
+    page = start_page
+    num_pages = start_page + 1
     if verbose:
         print(
             f"[START] comps={competition_id} compsCode={comps_code or '-'} "
-            f"season={season} page_size={page_size} limit={limit} max_pages={max_pages}",
+            f"season={season} page_size={page_size} limit={limit} max_pages={max_pages}"
+            + (f" concurrency={concurrency} rate={rate}/s" if concurrent else ""),
             flush=True,
         )
 
-    while page < num_pages:
-        if max_pages is not None and page >= max_pages:
-            break
-        content, num_pages = fetch_player_list_page(
-            session, competition_id, season, page, page_size, comps_code
-        )
-        if not content:
-            break
-        if verbose:
-            print(
-                f"[PAGE] page {page+1}/{num_pages} · received {len(content)} rows",
-                flush=True,
-            )
+    # Concurrent mode keeps this many directory pages in flight, so one slow player
+    # (e.g. a 404 being retried) does not stall the next page.
+    lookahead = PAGE_LOOKAHEAD if concurrent else 1
+    pending: deque[tuple[int, list[tuple[dict[str, t.Any] | None, int]], dict[int, Future]]] = deque()
+    exhausted = False
+    done_players = journal.players if journal else {}
+    done_pages = journal.pages if journal else {}
+    carried: dict[int, dict[str, t.Any]] = {}  # unchanged since `previous`, not refetched
+    fetched = reused = 0
+    # accepted records waiting for their headshot, in output order
+    ready: deque[tuple[dict[str, t.Any], Future | None]] = deque()
 
-        for item in content:
-            raw_id = item.get("id")
-            try:
-                player_id = int(raw_id)
-            except Exception:
-                # Skip entries that do not have a valid numeric ID.
-                continue
-            if player_id <= 0:
-                continue
-            try:
-                detail = fetch_player_detail(session, competition_id, player_id, comps_code)
-            except RuntimeError as exc:
-                # Some historic/placeholder entries return 404 on detail; skip them.
+    def drain(wait: bool) -> t.Iterator[dict[str, t.Any]]:
+        while ready and (wait or ready[0][1] is None or ready[0][1].done()):
+            record, image = ready.popleft()
+            if image is not None:
+                record["local_image_path"] = image.result()
+            yield record
+
+    if verbose and journal and journal.resumed:
+        print(f"[RESUME] {len(done_pages)} pages, {len(done_players)} players from {journal.path}", flush=True)
+
+    try:
+        while True:
+            while not exhausted and len(pending) < lookahead:
+                if (
+                    page >= num_pages
+                    or (max_pages is not None and page >= start_page + max_pages)
+                    or (end_page is not None and page >= end_page)
+                ):
+                    exhausted = True
+                    break
+                if page in done_pages:
+                    # finished before the restart: replay without touching the API
+                    num_pages = done_pages[page]["num_pages"]
+                    pending.append((page, [(None, player_id) for player_id in done_pages[page]["ids"]], {}))
+                    page += 1
+                    continue
+                content, num_pages = fetch_player_list_page(
+                    session, competition_id, season, page, page_size, comps_code
+                )
+                if not content:
+                    exhausted = True
+                    break
                 if verbose:
-                    print(f"[SKIP] detail missing for player_id={player_id}: {exc}", flush=True)
-                continue
-            stats_id = (
-                detail.get("playerId")
-                or detail.get("id")
-                or player_id
-            )
-            history = fetch_player_history(session, player_id)
-            try:
-                stats_id_int = int(stats_id)
-            except Exception:
-                stats_id_int = player_id
-            try:
-                stats = fetch_player_stats(session, competition_id, stats_id_int, comps_code)
-            except RuntimeError as exc:
-                # Network/proxy/404 issues on stats should not stop the crawl.
+                    print(
+                        f"[PAGE] page {page+1}/{num_pages} · received {len(content)} rows",
+                        flush=True,
+                    )
+                entries: list[tuple[dict[str, t.Any], int]] = []
+                for item in content:
+                    raw_id = item.get("id")
+                    try:
+                        player_id = int(raw_id)
+                    except Exception:
+                        # Skip entries that do not have a valid numeric ID.
+                        continue
+                    if player_id <= 0:
+                        continue
+                    entries.append((item, player_id))
+                    if previous and player_id in previous and player_id not in done_players:
+                        if not list_entry_changed(item, previous[player_id]):
+                            carried[player_id] = previous[player_id]
+                bundles: dict[int, Future] = {}
+                if concurrent:
+                    bundles = {
+                        player_id: player_pool.submit(
+                            fetch_player_bundle, session, competition_id, player_id, comps_code,
+                            pool=request_pool, verbose=verbose,
+                        )
+                        for _, player_id in entries
+                        if player_id not in done_players and player_id not in carried
+                    }
+                pending.append((page, entries, bundles))
+                page += 1
+            if not pending:
+                break
+
+            entries_page, entries, bundles = pending.popleft()
+            replayed = entries_page in done_pages
+            for item, player_id in entries:
+                sent = session.network_requests
+                if player_id in done_players:
+                    record = done_players[player_id]
+                elif player_id in carried:
+                    record = dict(carried.pop(player_id))
+                    reused += 1
+                    if journal:
+                        journal.record_player(entries_page, player_id, record)
+                else:
+                    fetched += 1
+                    if concurrent:
+                        bundle = bundles[player_id].result()
+                    else:
+                        bundle = fetch_player_bundle(session, competition_id, player_id, comps_code, verbose=verbose)
+                    record = None
+                    if bundle is not None:
+                        detail, history, stats = bundle
+                        record = normalize_player_record(item, detail, history, stats, competition_id)
+                    if journal:
+                        journal.record_player(entries_page, player_id, record)
+                if record is None:
+                    continue
+                if require_club and not record.get("club"):
+                    # Skip free agents / retired entries when a club is required.
+                    continue
+                accepted += 1
+                if telemetry is not None:
+                    telemetry.record_records()
+                image = None
+                if images is not None and record.get("headshot_url"):
+                    image = images.submit(record["headshot_url"], image_filename(record))
+                ready.append((record, image))
                 if verbose:
                     print(
-                        f"[SKIP] stats missing for player_id={player_id} stats_id={stats_id_int}: {exc}",
+                        f"[PLAYER] #{accepted:03d} {record.get('name','')} "
+                        f"({record.get('club','-')})",
                         flush=True,
                     )
-                stats = []
-            record = normalize_player_record(
-                item, detail, history, stats, competition_id, download_images, session, photo_dir
+                yield from drain(False)
+                if limit and accepted >= limit:
+                    yield from drain(True)
+                    return
+                if not concurrent and session.network_requests != sent:
+                    # no need to be polite when everything came from the cache
+                    time.sleep(sleep)
+
+            if not replayed:
+                if journal:
+                    journal.record_page(entries_page, num_pages, [player_id for _, player_id in entries])
+                if not concurrent:
+                    time.sleep(sleep)
+        yield from drain(True)
+        if verbose and previous is not None:
+            print(f"[INCREMENTAL] fetched {fetched} players, carried over {reused}", flush=True)
+    finally:
+        if journal:
+            journal.sync()
+        if images is not None:
+            images.close()
+            if verbose:
+                print(f"[IMAGES] {images.summary()}", flush=True)
+        for pool in (player_pool, request_pool):
+            if pool is not None:
+                pool.shutdown(wait=True, cancel_futures=True)
+
+
+def crawl_players(competition_id: int, season: int, **kwargs: t.Any) -> list[dict[str, t.Any]]:
+    """iter_players() collected into a list (same keyword arguments)."""
+    return list(iter_players(competition_id, season, **kwargs))
+
+
+# CSV column order (stable across runs).
+CSV_FIELDS = [
+    "player_id",
+    "name",
+    "first_name",
+    "last_name",
+    "club",
+    "position",
+    "shirt_number",
+    "nationality",
+    "country_code",
+    "preferred_foot",
+    "date_of_birth",
+    "appearances",
+    "goals",
+    "assists",
+    "detail_url",
+    "headshot_url",
+    "local_image_path",
+    "competition_id",
+]
+OUTPUT_FORMATS = ("json", "csv")
+
+
+def open_outputs(
+    season: int,
+    out_dir: str = "data",
+    formats: t.Iterable[str] = OUTPUT_FORMATS,
+    compress: bool = False,
+) -> MultiSink:
+    """Streaming sinks for data/epl_players_{season}.{json,ndjson,csv}[.gz]."""
+    return open_sinks(os.path.join(out_dir, f"epl_players_{season}"), formats, CSV_FIELDS, compress=compress)
+
+
+def save_outputs(
+    players: t.Iterable[dict[str, t.Any]],
+    season: int,
+    out_dir: str = "data",
+    formats: t.Iterable[str] = OUTPUT_FORMATS,
+    compress: bool = False,
+) -> int:
+    """
+    Stream players (a list or a live iter_players() generator) to JSON/CSV. Files
+    appear atomically when the iterable is exhausted; returns the record count.
+    """
+    with open_outputs(season, out_dir, formats, compress) as sink:
+        for record in players:
+            sink.write(record)
+    for path in sink.paths:
+        print(f"[INFO] Saved {path}")
+    return sink.count
+
+
+# ---------------------------------------------------------------------------
+# Sharded crawl: the coordinator splits the directory into page-range work units in
+# a SQLite queue; worker processes claim units under a lease, crawl them with
+# iter_players and write one NDJSON shard per unit, merged in directory order.
+
+LEASE_SECONDS = 120.0
+PAGES_PER_UNIT = 2
+
+
+def plan_units(
+    competitions: list[tuple[int, str | None]],
+    season: int,
+    page_size: int,
+    pages_per_unit: int = PAGES_PER_UNIT,
+    telemetry: CrawlTelemetry | None = None,
+) -> list[dict[str, t.Any]]:
+    """One work unit per `pages_per_unit` directory pages of each competition."""
+    session = make_session(DEFAULT_HEADERS, telemetry=telemetry)
+    units = []
+    for competition_id, comps_code in competitions:
+        _, num_pages = fetch_player_list_page(session, competition_id, season, 0, page_size, comps_code)
+        for start in range(0, num_pages, pages_per_unit):
+            units.append(
+                {
+                    "competition": competition_id,
+                    "comps_code": comps_code,
+                    "season": season,
+                    "start_page": start,
+                    "end_page": min(start + pages_per_unit, num_pages),
+                }
             )
-            if require_club and not record.get("club"):
-                # Skip free agents / retired entries when a club is required.
+    return units
+
+
+def run_shard_worker(queue_path: str, worker: str, options: dict[str, t.Any]) -> None:
+    """Worker process: claim units until none are left, renewing the lease while crawling."""
+    if options.get("api_base"):
+        set_api_base(options["api_base"])
+    previous = load_previous_players(options["season"], options["out_dir"]) if options["incremental"] else None
+    telemetry = None
+    if options.get("telemetry"):
+        telemetry = CrawlTelemetry(worker)
+        telemetry_path = os.path.join(os.path.dirname(queue_path), f"telemetry-{worker}.json")
+        # the coordinator reads these files for its progress lines and the final summary
+        telemetry.start_reporter(options["telemetry"], lambda: telemetry.write_json(telemetry_path))
+    queue = WorkQueue(queue_path)
+    try:
+        while True:
+            claimed = queue.claim(worker, LEASE_SECONDS)
+            if claimed is None:
+                return
+            unit_id, unit = claimed
+            stop = threading.Event()
+
+            def heartbeat() -> None:
+                lease = WorkQueue(queue_path)  # sqlite connections stay in their thread
+                try:
+                    while not stop.wait(LEASE_SECONDS / 3):
+                        lease.renew(unit_id, worker, LEASE_SECONDS)
+                finally:
+                    lease.close()
+
+            renewer = threading.Thread(target=heartbeat, daemon=True)
+            renewer.start()
+            output = os.path.join(os.path.dirname(queue_path), f"unit-{unit_id:05d}-{worker}.ndjson")
+            try:
+                with NDJSONSink(output) as sink:
+                    for record in iter_players(
+                        unit["competition"],
+                        unit["season"],
+                        comps_code=unit["comps_code"],
+                        start_page=unit["start_page"],
+                        end_page=unit["end_page"],
+                        previous=previous,
+                        telemetry=telemetry,
+                        **options["crawl"],
+                    ):
+                        sink.write(record)
+            except Exception as exc:  # noqa: BLE001
+                queue.fail(unit_id, worker, f"{type(exc).__name__}: {exc}")
                 continue
-            results.append(record)
-            if verbose:
-                print(
-                    f"[PLAYER] #{len(results):03d} {record.get('name','')} "
-                    f"({record.get('club','-')})",
-                    flush=True,
-                )
-            if limit and len(results) >= limit:
-                return results
-            time.sleep(sleep)
-
-        page += 1
-        time.sleep(sleep)
-
-    return results
-
-
-def save_outputs(players: list[dict[str, t.Any]], season: int, out_dir: str = "data") -> None:
-    """Persist players to JSON and CSV."""
-    os.makedirs(out_dir, exist_ok=True)
-    json_path = os.path.join(out_dir, f"epl_players_{season}.json")
-    csv_path = os.path.join(out_dir, f"epl_players_{season}.csv")
-
-    with open(json_path, "w", encoding="utf-8") as f:
-        json.dump(players, f, ensure_ascii=False, indent=2)
-
-    fieldnames: list[str] = []
-    if players:
-        # Preserve a stable column order.
-        preferred_order = [
-            "player_id",
-            "name",
-            "first_name",
-            "last_name",
-            "club",
-            "position",
-            "shirt_number",
-            "nationality",
-            "country_code",
-            "preferred_foot",
-            "date_of_birth",
-            "appearances",
-            "goals",
-            "assists",
-            "detail_url",
-            "headshot_url",
-            "local_image_path",
-            "competition_id",
-        ]
-        fieldnames = preferred_order
-    else:
-        fieldnames = ["player_id", "name", "club"]
+            finally:
+                stop.set()
+                renewer.join()
+                if telemetry is not None:
+                    telemetry.write_json(telemetry_path)
+            queue.complete(unit_id, worker, output)
+    finally:
+        if telemetry is not None:
+            telemetry.stop()
+        queue.close()
+
+
+def merge_shards(
+    queue: WorkQueue,
+    season: int,
+    *,
+    out_dir: str = "data",
+    formats: t.Iterable[str] = OUTPUT_FORMATS,
+    compress: bool = False,
+    download_images: bool = False,
+    image_workers: int = 4,
+    telemetry: CrawlTelemetry | None = None,
+) -> int:
+    """Stream finished shards, in unit order and without duplicate players, into the final outputs."""
+
+    def records() -> t.Iterator[dict[str, t.Any]]:
+        seen: set[int] = set()
+        for unit in queue.units("done"):
+            with open(unit["output"], encoding="utf-8") as f:
+                for line in f:
+                    record = json.loads(line)
+                    if record["player_id"] in seen:
+                        continue  # directory shifted between pages
+                    seen.add(record["player_id"])
+                    yield record
+
+    if not download_images:
+        return save_outputs(records(), season, out_dir, formats, compress)
+    session = make_session(DEFAULT_HEADERS, pool_size=max(10, image_workers), telemetry=telemetry)
+    with ImageDownloader(session, PHOTO_DIR, workers=image_workers) as images:
+        count = save_outputs(attach_images(records(), images, image_filename), season, out_dir, formats, compress)
+    print(f"[IMAGES] {images.summary()}")
+    return count
+
+
+def worker_telemetry(work_dir: str) -> list[dict[str, t.Any]]:
+    """The telemetry summaries shard workers have written so far."""
+    summaries = []
+    for name in sorted(os.listdir(work_dir)):
+        if name.startswith("telemetry-") and name.endswith(".json"):
+            with open(os.path.join(work_dir, name), encoding="utf-8") as f:
+                summaries.append(json.load(f))
+    return summaries
+
+
+def crawl_sharded(
+    competitions: list[tuple[int, str | None]],
+    season: int,
+    *,
+    workers: int,
+    work_dir: str,
+    page_size: int = 30,
+    pages_per_unit: int = PAGES_PER_UNIT,
+    rate: float | None = None,
+    resume: bool = False,
+    incremental: bool = False,
+    out_dir: str = "data",
+    formats: t.Iterable[str] = OUTPUT_FORMATS,
+    compress: bool = False,
+    download_images: bool = False,
+    image_workers: int = 4,
+    telemetry: CrawlTelemetry | None = None,
+    progress_every: float = 0,
+    **crawl_options: t.Any,
+) -> int:
+    """
+    Crawl with `workers` processes sharing one work queue in `work_dir`. The global
+    `rate` budget (requests/second, default 5) is split evenly between workers. A
+    worker that dies has its units handed to a replacement; with `resume` an earlier
+    queue (and its finished shards) is picked up again. Returns the merged record count.
+
+    With `telemetry`, each worker keeps its own counters in the work dir; they are
+    added to `telemetry` once the crawl is done, and combined into a progress line
+    every `progress_every` seconds while it runs.
+    """
+    queue_path = os.path.join(work_dir, "queue.sqlite3")
+    if not resume and os.path.isdir(work_dir):
+        shutil.rmtree(work_dir)
+    os.makedirs(work_dir, exist_ok=True)
+    queue = WorkQueue(queue_path)
+    procs: list[multiprocessing.process.BaseProcess] = []
+    try:
+        if resume:
+            queue.retry_failed()
+        if not any(queue.counts().values()):
+            queue.add(plan_units(competitions, season, page_size, pages_per_unit, telemetry))
+        options = {
+            "season": season,
+            "out_dir": out_dir,
+            "incremental": incremental,
+            "api_base": BASE_API,
+            # seconds between worker telemetry snapshots; None: no telemetry
+            "telemetry": (progress_every or 5.0) if telemetry is not None else None,
+            "crawl": dict(
+                crawl_options,
+                page_size=page_size,
+                rate=(rate or 5.0) / workers,
+                download_images=False,  # done once, after the merge
+            ),
+        }
+        ctx = multiprocessing.get_context("spawn")
+        spawned = 0
+        reported = time.monotonic()
+        while True:
+            for proc in [p for p in procs if not p.is_alive()]:
+                procs.remove(proc)
+                queue.release(proc.name)  # a crash hands its unit straight back
+            counts = queue.counts()
+            if not counts["pending"] and not counts["leased"]:
+                break
+            if len(procs) < workers and queue.has_claimable():
+                if spawned >= workers * 3:
+                    if not procs:
+                        raise RuntimeError(f"Shard workers keep dying; queue state {counts}")
+                else:
+                    name = f"shard-{spawned}"
+                    proc = ctx.Process(target=run_shard_worker, args=(queue_path, name, options), name=name)
+                    proc.start()
+                    procs.append(proc)
+                    spawned += 1
+            if telemetry is not None and progress_every > 0 and time.monotonic() - reported >= progress_every:
+                reported = time.monotonic()
+                summaries = worker_telemetry(work_dir)
+                records = sum(summary["records"] for summary in summaries)
+                summary = merge_summaries("shards", summaries, telemetry.elapsed, records)
+                print(f"{progress_line(summary)} · units {counts['done']}/{sum(counts.values())} done", flush=True)
+            time.sleep(0.2)
+
+        failed = queue.units("failed")
+        if failed:
+            for unit in failed:
+                print(f"[ERROR] unit {unit['id']} {unit['payload']}: {unit['error']}")
+            raise RuntimeError(f"{len(failed)} work units failed; re-run with --resume to retry them.")
+        count = merge_shards(
+            queue,
+            season,
+            out_dir=out_dir,
+            formats=formats,
+            compress=compress,
+            download_images=download_images,
+            image_workers=image_workers,
+            telemetry=telemetry,
+        )
+        if telemetry is not None:
+            for summary in worker_telemetry(work_dir):
+                telemetry.absorb(summary)
+            telemetry.record_records(count)
+    except BaseException:
+        for proc in procs:
+            proc.terminate()
+        raise
+    finally:
+        queue.close()
+    shutil.rmtree(work_dir, ignore_errors=True)
+    return count
 
-    with open(csv_path, "w", encoding="utf-8", newline="") as f:
-        writer = csv.DictWriter(f, fieldnames=fieldnames)
-        writer.writeheader()
-        for row in players:
-            writer.writerow(row)
 
-    print(f"[INFO] Saved JSON to {json_path}")
-    print(f"[INFO] Saved CSV  to {csv_path}")
+@contextlib.contextmanager
+def report_telemetry(telemetry: CrawlTelemetry, path: str, *, verbose: bool = False) -> t.Iterator[CrawlTelemetry]:
+    """Stop the progress reporter and write the JSON summary when the crawl ends, even if it failed."""
+    try:
+        yield telemetry
+    finally:
+        telemetry.stop()
+        summary = telemetry.write_json(path)
+        table = format_summary(summary)
+        print(table if verbose else table.splitlines()[0])
+        print(f"[TELEMETRY] Summary written to {path}")
 
 
 def main() -> None:
@@ -545,28 +1073,198 @@ def main() -> None:
         action="store_true",
         help="Download headshot PNGs into data/player_photos.",
     )
+    parser.add_argument(
+        "--image-workers",
+        type=int,
+        default=4,
+        help="Parallel headshot downloads (with --download-images).",
+    )
     parser.add_argument(
         "--sleep",
         type=float,
         default=0.4,
         help="Delay between requests in seconds to be polite to the API.",
     )
+    parser.add_argument(
+        "--concurrency",
+        type=int,
+        default=1,
+        help="Players fetched at once; >1 enables concurrent mode (ignores --sleep).",
+    )
+    parser.add_argument(
+        "--rate",
+        type=float,
+        default=None,
+        help="Concurrent mode: max requests/second per host (token bucket, default 5).",
+    )
+    parser.add_argument(
+        "--burst",
+        type=float,
+        default=None,
+        help="Concurrent mode: token bucket size (defaults to --rate).",
+    )
+    parser.add_argument(
+        "--api-base",
+        type=str,
+        default=None,
+        help="Override the API base URL (e.g. a local stub server).",
+    )
+    parser.add_argument(
+        "--cache-dir",
+        type=str,
+        default=CACHE_DIR,
+        help="Directory for cached API responses.",
+    )
+    parser.add_argument(
+        "--cache-max-mb",
+        type=float,
+        default=CACHE_MAX_MB,
+        help="Size limit of the response cache; oldest entries are evicted.",
+    )
+    parser.add_argument(
+        "--no-cache",
+        action="store_true",
+        help="Always hit the API (do not read or write the response cache).",
+    )
+    parser.add_argument(
+        "--format",
+        type=str,
+        default=",".join(OUTPUT_FORMATS),
+        help="Comma-separated output formats: json, ndjson, csv.",
+    )
+    parser.add_argument(
+        "--gzip",
+        action="store_true",
+        help="Gzip the output files (.json.gz, .csv.gz, ...).",
+    )
+    parser.add_argument(
+        "--incremental",
+        action="store_true",
+        help="Only fetch players that are new or whose directory entry changed since the last output.",
+    )
+    parser.add_argument(
+        "--workers",
+        type=int,
+        default=1,
+        help="Sharded mode: crawl with N worker processes sharing a SQLite work queue.",
+    )
+    parser.add_argument(
+        "--pages-per-unit",
+        type=int,
+        default=PAGES_PER_UNIT,
+        help="Sharded mode: directory pages per work unit.",
+    )
+    parser.add_argument(
+        "--work-dir",
+        type=str,
+        default=None,
+        help="Sharded mode: queue + shard directory (default data/crawl_work_{season}).",
+    )
+    parser.add_argument(
+        "--resume",
+        action="store_true",
+        help="Continue an interrupted crawl from its journal instead of starting over.",
+    )
+    parser.add_argument(
+        "--journal",
+        type=str,
+        default=None,
+        help="Crawl journal path (default data/crawl_journal_{season}.ndjson).",
+    )
+    parser.add_argument(
+        "--telemetry",
+        type=str,
+        default=None,
+        help="Where to write the JSON telemetry summary (default data/crawl_telemetry_{season}.json).",
+    )
+    parser.add_argument(
+        "--progress-every",
+        type=float,
+        default=PROGRESS_EVERY,
+        help="Print a progress line every N seconds (0 disables).",
+    )
     args = parser.parse_args()
+    unknown = set(args.format.split(",")) - set(SINK_EXTENSIONS)
+    if unknown:
+        parser.error(f"unknown --format: {', '.join(sorted(unknown))}")
+    if args.api_base:
+        set_api_base(args.api_base)
+    telemetry = CrawlTelemetry(f"players-{args.season}")
+    telemetry_path = args.telemetry or os.path.join("data", f"crawl_telemetry_{args.season}.json")
+
+    if args.workers > 1:
+        with report_telemetry(telemetry, telemetry_path, verbose=args.verbose):
+            count = crawl_sharded(
+                [(args.competition, args.comps_code)],
+                args.season,
+                workers=args.workers,
+                work_dir=args.work_dir or os.path.join("data", f"crawl_work_{args.season}"),
+                page_size=args.page_size,
+                pages_per_unit=args.pages_per_unit,
+                rate=args.rate,
+                resume=args.resume,
+                incremental=args.incremental,
+                formats=args.format.split(","),
+                compress=args.gzip,
+                download_images=args.download_images,
+                image_workers=args.image_workers,
+                sleep=args.sleep,
+                verbose=args.verbose,
+                require_club=not args.no_require_club,
+                concurrency=args.concurrency,
+                burst=args.burst,
+                cache_dir=None if args.no_cache else args.cache_dir,
+                cache_max_mb=args.cache_max_mb,
+                telemetry=telemetry,
+                progress_every=args.progress_every,
+            )
+        print(f"[DONE] Crawled {count} players with {args.workers} workers.")
+        return
 
-    players = crawl_players(
-        competition_id=args.competition,
-        season=args.season,
-        page_size=args.page_size,
-        sleep=args.sleep,
-        download_images=args.download_images,
-        limit=args.limit,
-        verbose=args.verbose,
-        max_pages=args.max_pages,
-        comps_code=args.comps_code,
-        require_club=not args.no_require_club,
-    )
-    save_outputs(players, args.season)
-    print(f"[DONE] Crawled {len(players)} players.")
+    journal = CrawlJournal(
+        args.journal or os.path.join("data", f"crawl_journal_{args.season}.ndjson"),
+        {
+            "competition": args.competition,
+            "comps_code": args.comps_code,
+            "season": args.season,
+            "page_size": args.page_size,
+        },
+        resume=args.resume,
+    )
+    telemetry.start_reporter(args.progress_every)
+    try:
+        with report_telemetry(telemetry, telemetry_path, verbose=args.verbose):
+            players = iter_players(
+                competition_id=args.competition,
+                season=args.season,
+                page_size=args.page_size,
+                sleep=args.sleep,
+                download_images=args.download_images,
+                image_workers=args.image_workers,
+                limit=args.limit,
+                verbose=args.verbose,
+                max_pages=args.max_pages,
+                comps_code=args.comps_code,
+                require_club=not args.no_require_club,
+                concurrency=args.concurrency,
+                rate=args.rate,
+                burst=args.burst,
+                cache_dir=None if args.no_cache else args.cache_dir,
+                cache_max_mb=args.cache_max_mb,
+                journal=journal,
+                previous=load_previous_players(args.season) if args.incremental else None,
+                telemetry=telemetry,
+            )
+            count = save_outputs(players, args.season, formats=args.format.split(","), compress=args.gzip)
+    except KeyboardInterrupt:
+        journal.close()
+        raise SystemExit(f"[STOP] Interrupted; progress kept in {journal.path}, re-run with --resume.")
+    except Exception:
+        journal.close()
+        print(f"[ERROR] Crawl failed; progress kept in {journal.path}, re-run with --resume.")
+        raise
+    journal.discard()
+    print(f"[DONE] Crawled {count} players.")
 
 
 if __name__ == "__main__":
@@ -1,19 +1,57 @@
 # sina_epl_crawler.py
+import argparse
+import csv
 import os
 import json
-import csv
-import requests
+import time
+from concurrent.futures import ThreadPoolExecutor, as_completed
+
+from crawler import (
+    CrawlTelemetry,
+    CSVSink,
+    ResponseCache,
+    TTLPolicy,
+    format_summary,
+    get_with_retry,
+    make_session,
+    open_sinks,
+)
 
 API_URL = "https://api.sports.sina.com.cn/"
 
+# 积分榜比赛日里几分钟就变，缓存只用来挡住短时间内的重复请求（如 --interval 很小时）；
+# 过期后带 ETag / Last-Modified 重新验证
+CACHE_DIR = os.path.join("data", "http_cache")
+CACHE_TTL = 60
+
+HEADERS = {
+    "User-Agent": "Mozilla/5.0 (Windows NT 10.0; Win64; x64)",
+    "Referer": "https://sports.sina.com.cn/g/pl/table.html",
+}
+
 
-def fetch_epl_standings(season=2025, debug_print=False):
+def make_sina_session(cache_dir=CACHE_DIR, ttl=CACHE_TTL, pool_size=10, rate=None, telemetry=None):
+    """
+    带磁盘响应缓存的 Session（多线程共用一个连接池）；cache_dir=None 时不缓存，rate 为每秒请求上限，
+    telemetry（CrawlTelemetry）记录每个请求的耗时、字节数、重试和 429，以及本次抓到的积分榜行数。
+    """
+    cache = ResponseCache(cache_dir, TTLPolicy(default=ttl)) if cache_dir else None
+    return make_session(HEADERS, cache=cache, pool_size=pool_size, rate=rate, telemetry=telemetry)
+
+
+def season_end_year(season):
+    """新浪 season=2025 表示 2025/26 赛季，对应 seasons.end_year / season_end_year=2026。"""
+    return season + 1
+
+
+def fetch_epl_standings(season=2025, debug_print=False, session=None):
     """
     从新浪体育接口获取英超积分榜数据（对应页面：https://sports.sina.com.cn/g/pl/table.html）
 
     参数:
         season: int, 赛季年份，例如 2025 表示 2025/26 赛季
         debug_print: 是否打印原始 JSON 结构，方便调字段名（调试用）
+        session: 复用的 requests.Session，默认用 make_sina_session()（带缓存）
 
     返回:
         standings: list[dict]，每个元素是一支球队的数据
@@ -30,15 +68,10 @@ def fetch_epl_standings(season=2025, debug_print=False):
         "season": season,
     }
 
-    headers = {
-        "User-Agent": "Mozilla/5.0 (Windows NT 10.0; Win64; x64)",
-        "Referer": "https://sports.sina.com.cn/g/pl/table.html",
-    }
-
-    resp = requests.get(API_URL, params=params, headers=headers, timeout=10)
-    resp.raise_for_status()
-
-    data = resp.json()
+    if session is None:
+        session = make_sina_session()
+    # 5xx / 429 / 超时按指数退避重试（遵守 Retry-After），404 等直接失败
+    data = get_with_retry(session, API_URL, params, timeout=10, parse=lambda resp: resp.json())
 
     result = data.get("result") or {}
     status = result.get("status") or {}
@@ -123,7 +156,9 @@ def fetch_epl_standings(season=2025, debug_print=False):
         standings.append(
             {
                 "rank": rank,
+                "team_id": item.get("team_id") or item.get("tid"),
                 "team_name": team_name,
+                "team_en": item.get("team_en") or "",
                 "played": played,
                 "win": win,
                 "draw": draw,
@@ -150,59 +185,208 @@ def fetch_epl_standings(season=2025, debug_print=False):
     for i, row in enumerate(standings, start=1):
         row["rank"] = i
 
+    # 只统计本次真正抓到的行（回填时磁盘上已有的赛季不算）
+    telemetry = getattr(session, "telemetry", None)
+    if telemetry is not None:
+        telemetry.record_records(len(standings))
+
     return standings
 
 
-def save_standings_to_files(standings, season, out_dir="data"):
+STANDINGS_FIELDS = [
+    "rank",
+    "team_id",
+    "team_name",
+    "team_en",
+    "played",
+    "win",
+    "draw",
+    "lose",
+    "goals_for",
+    "goals_against",
+    "goal_diff",
+    "points",
+]
+
+
+def save_standings_to_files(standings, season, out_dir="data", compress=False):
     """
-    把积分榜数据保存到 JSON 和 CSV 文件。
+    把积分榜数据保存到 JSON 和 CSV 文件（逐条流式写入 .part 临时文件，完成后原子改名）。
 
     文件名示例：
         data/epl_standings_2025.json
         data/epl_standings_2025.csv
+    compress=True 时输出 .json.gz / .csv.gz
+    """
+    base = os.path.join(out_dir, f"epl_standings_{season}")
+    with open_sinks(base, ("json", "csv"), STANDINGS_FIELDS, compress=compress) as sink:
+        for row in standings:
+            sink.write(row)
+
+    for path in sink.paths:
+        print(f"[INFO] 已保存：{path}")
+
+
+# data/pl-tables-1993-2025.csv 的列
+TABLE_FIELDS = [
+    "season_end_year",
+    "team",
+    "position",
+    "played",
+    "won",
+    "drawn",
+    "lost",
+    "gf",
+    "ga",
+    "gd",
+    "points",
+]
+BACKFILL_WORKERS = 8
+
+
+def table_namer(known_names=()):
+    """
+    返回 row -> 队名 的函数，队名尽量与历史 CSV / teams 表一致（"Wolves"、"Sheffield Utd"）：
+    先查 SINA_TEAM_NAMES（中文名），再按英文名在已知队名里做别名/模糊匹配，都不中就用英文名或中文名。
     """
-    os.makedirs(out_dir, exist_ok=True)
+    try:
+        from backend.core.db.team_names import SINA_TEAM_NAMES, TeamNameResolver
+    except ImportError:  # 单独拷走爬虫时没有 backend 包
+        return lambda row: row.get("team_en") or row.get("team_name") or ""
+
+    names = list(dict.fromkeys(list(known_names) + list(SINA_TEAM_NAMES.values())))
+    resolver = TeamNameResolver(enumerate(names))
+
+    def name_for(row):
+        cn = row.get("team_name") or ""
+        en = row.get("team_en") or ""
+        index = resolver.resolve(SINA_TEAM_NAMES.get(cn, "")) if cn in SINA_TEAM_NAMES else None
+        if index is None and en:
+            index = resolver.resolve(en)
+        return names[index] if index is not None else (en or cn)
+
+    return name_for
+
+
+def to_table_row(row, end_year, name_for):
+    """fetch_epl_standings 的一行 -> TABLE_FIELDS 一行。"""
+    return {
+        "season_end_year": end_year,
+        "team": name_for(row),
+        "position": row.get("rank"),
+        "played": row.get("played"),
+        "won": row.get("win"),
+        "drawn": row.get("draw"),
+        "lost": row.get("lose"),
+        "gf": row.get("goals_for"),
+        "ga": row.get("goals_against"),
+        "gd": row.get("goal_diff"),
+        "points": row.get("points"),
+    }
 
-    json_path = os.path.join(out_dir, f"epl_standings_{season}.json")
-    csv_path = os.path.join(out_dir, f"epl_standings_{season}.csv")
 
-    # ---- 保存 JSON ----
-    with open(json_path, "w", encoding="utf-8") as f:
-        json.dump(standings, f, ensure_ascii=False, indent=2)
-    print(f"[INFO] 已保存 JSON：{json_path}")
+def fetch_seasons(seasons, workers=BACKFILL_WORKERS, session=None):
+    """
+    并发抓取多个赛季（有界线程池 + 共用一个连接池 Session）。
+    返回 ({season: standings}, {season: 错误信息})，单个赛季失败不影响其他赛季。
+    """
+    seasons = list(seasons)
+    if session is None:
+        session = make_sina_session(pool_size=max(10, workers))
+    results, errors = {}, {}
+    with ThreadPoolExecutor(max_workers=workers, thread_name_prefix="sina") as pool:
+        futures = {pool.submit(fetch_epl_standings, season, False, session): season for season in seasons}
+        for future in as_completed(futures):
+            season = futures[future]
+            try:
+                results[season] = future.result()
+            except Exception as e:
+                errors[season] = str(e)
+    return results, errors
 
-    # ---- 保存 CSV ----
-    if standings:
-        fieldnames = list(standings[0].keys())
-    else:
-        fieldnames = [
-            "rank",
-            "team_name",
-            "played",
-            "win",
-            "draw",
-            "lose",
-            "goals_for",
-            "goals_against",
-            "goal_diff",
-            "points",
-        ]
-
-    with open(csv_path, "w", encoding="utf-8", newline="") as f:
-        writer = csv.DictWriter(f, fieldnames=fieldnames)
-        writer.writeheader()
-        for row in standings:
-            writer.writerow(row)
 
-    print(f"[INFO] 已保存 CSV：{csv_path}")
+def backfill_standings(first, last, out_path, workers=BACKFILL_WORKERS, session=None):
+    """
+    抓取新浪 season=first..last（含）并写成 pl-tables CSV。out_path 已存在时在其基础上扩展：
+    抓到的赛季整季替换旧行，没抓到的赛季保留原样；按 (season_end_year, position) 排序，原子替换文件。
+    """
+    started = time.perf_counter()
+    existing = []
+    if os.path.exists(out_path):
+        with open(out_path, newline="", encoding="utf-8-sig") as f:
+            existing = list(csv.DictReader(f))
+
+    standings, errors = fetch_seasons(range(first, last + 1), workers=workers, session=session)
+    name_for = table_namer(row["team"] for row in existing)
+
+    rows = {}
+    for row in existing:
+        rows[(int(row["season_end_year"]), row["team"])] = row
+    fetched_years = {season_end_year(season) for season, table in standings.items() if table}
+    rows = {key: row for key, row in rows.items() if key[0] not in fetched_years}
+    for season, table in standings.items():
+        end_year = season_end_year(season)
+        for row in table:
+            table_row = to_table_row(row, end_year, name_for)
+            rows[(end_year, table_row["team"])] = table_row  # 同一季同名只留一行
+
+    def sort_key(row):
+        try:
+            return int(row["season_end_year"]), int(row["position"])
+        except (TypeError, ValueError):
+            return int(row["season_end_year"]), 999
+
+    with CSVSink(out_path, TABLE_FIELDS) as sink:
+        for row in sorted(rows.values(), key=sort_key):
+            sink.write(row)
+
+    print(
+        f"[INFO] 回填 {len(standings)} 个赛季"
+        f"（{sum(len(table) for table in standings.values())} 行），共写入 {sink.count} 行 -> {out_path}"
+        f"，用时 {time.perf_counter() - started:.2f}s"
+    )
+    for season, error in sorted(errors.items()):
+        print(f"[WARN] season={season} 抓取失败，保留原有数据：{error}")
+    return sink.count, errors
 
 
 if __name__ == "__main__":
-    # 你可以改成 2024 / 2023 等对应不同赛季
-    season = 2025
+    parser = argparse.ArgumentParser(description="新浪英超积分榜爬虫")
+    parser.add_argument("--season", type=int, default=2025, help="赛季参数，2025 表示 2025/26 赛季")
+    parser.add_argument("--debug", action="store_true", help="打印原始 JSON 结构，方便调字段名")
+    parser.add_argument("--backfill", type=int, nargs=2, metavar=("FIRST", "LAST"),
+                        help="并发抓取 season=FIRST..LAST，写成 pl-tables CSV")
+    parser.add_argument("--out", default=os.path.join("data", "pl-tables-1993-2025.csv"),
+                        help="--backfill 的输出文件（已存在则在其基础上扩展）")
+    parser.add_argument("--workers", type=int, default=BACKFILL_WORKERS, help="--backfill 并发数")
+    parser.add_argument("--rate", type=float, default=None, help="每秒最多请求数（默认不限）")
+    parser.add_argument("--no-cache", action="store_true", help="不使用磁盘响应缓存")
+    parser.add_argument("--telemetry", default=None, metavar="PATH",
+                        help="把请求统计（各接口请求数、延迟分布、字节数、重试、429）写成 JSON")
+    args = parser.parse_args()
+
+    telemetry = CrawlTelemetry("sina") if args.telemetry else None
+
+    def write_telemetry():
+        if telemetry is None:
+            return
+        summary = telemetry.write_json(args.telemetry)
+        print(format_summary(summary).splitlines()[0])
+        print(f"[TELEMETRY] 已保存：{args.telemetry}")
+
+    session = make_sina_session(
+        cache_dir=None if args.no_cache else CACHE_DIR,
+        pool_size=max(10, args.workers),
+        rate=args.rate,
+        telemetry=telemetry,
+    )
+    if args.backfill:
+        backfill_standings(args.backfill[0], args.backfill[1], args.out, workers=args.workers, session=session)
+        write_telemetry()
+        raise SystemExit(0)
 
-    # 第一次调试可以把 debug_print=True 看一下字段结构
-    standings = fetch_epl_standings(season=season, debug_print=False)
+    # 第一次调试可以加 --debug 看一下字段结构
+    standings = fetch_epl_standings(season=args.season, debug_print=args.debug, session=session)
 
     # 控制台简单打印前几条，确认一下
     for row in standings[:5]:
@@ -214,4 +398,5 @@ if __name__ == "__main__":
         )
 
     # 关键：落盘保存
-    save_standings_to_files(standings, season=season, out_dir="data")
+    save_standings_to_files(standings, season=args.season, out_dir="data")
+    write_telemetry()